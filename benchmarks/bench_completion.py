@@ -0,0 +1,74 @@
+# benchmarks/bench_completion.py
+"""Latency of 'vivaldi_workspace complete <prefix>' (what every Tab press costs).
+
+Builds a synthetic config and user data dir with many workspaces in a
+temporary HOME, then reports:
+  * in-process complete() with a current index, and with a forced rebuild;
+  * a cold process calling cli.main() the way the installed
+    'vivaldi_workspace' entry point does (not 'python -m', which adds runpy),
+    against a bare interpreter, i.e. what the command adds on top of
+    Python's own startup.
+Run from the repository root:
+
+    python benchmarks/bench_completion.py [--workspaces 500] [--profiles 4] [--runs 20]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from bench_profiles import write_user_data_dir
+
+
+def write_config(path, names):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({"workspace_shortcuts": {name: f"ctrl+alt+{i % 9 + 1}" for i, name in enumerate(names)}}, f)
+
+
+def median_ms(func, runs):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark shell completion latency.")
+    parser.add_argument("--workspaces", type=int, default=500, help="Workspace names in the config (default: 500)")
+    parser.add_argument("--profiles", type=int, default=4, help="Profiles in the synthetic user data dir (default: 4)")
+    parser.add_argument("--runs", type=int, default=20, help="Runs per case (median is reported).")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as home:
+        os.environ["HOME"] = home
+        os.environ.pop("XDG_CONFIG_HOME", None)
+        from vv_wkspace import completion
+        from vv_wkspace import config
+        from vv_wkspace import vivaldi_utils
+        write_user_data_dir(vivaldi_utils.get_profile_base(), args.profiles, 256 * 1024)
+        write_config(config.get_config_path(), [f"Project {i:04d} notes" for i in range(args.workspaces)])
+
+        names = completion.complete("Project 01")
+        print(f"{len(completion.complete(''))} names indexed; 'Project 01' -> {len(names)} matches")
+        print(f"{'in-process, current index':<34} {median_ms(lambda: completion.complete('Project 01'), args.runs):8.2f} ms")
+        print(f"{'in-process, rebuild':<34} {median_ms(completion.rebuild_index, args.runs):8.2f} ms")
+
+        bare = median_ms(lambda: subprocess.run([sys.executable, "-c", "pass"], cwd=REPO_ROOT), args.runs)
+        command = [sys.executable, "-c", "from vv_wkspace.cli import main; main()", "complete", "Project 01"]
+        cli = median_ms(lambda: subprocess.run(command, cwd=REPO_ROOT, stdout=subprocess.DEVNULL), args.runs)
+        print(f"{'bare interpreter':<34} {bare:8.2f} ms")
+        print(f"{'cli complete (cold process)':<34} {cli:8.2f} ms  (+{cli - bare:.2f} ms over bare)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+# benchmarks/bench_daemon.py
+"""Latency of `launch` via the resident daemon versus a cold CLI invocation.
+
+Uses a throwaway HOME, the recording input backend and an already-running
+benchmarks/fake_vivaldi.py, so every variant takes the 'attach' path and the
+numbers only differ by per-invocation overhead. Variants:
+
+  cold cli       python -m vv_wkspace.cli launch NAME
+  daemon client  python -m vv_wkspace.cli launch --daemon NAME
+  daemon socket  one request over the Unix socket from this process
+
+Run from the repository root:
+
+    python benchmarks/bench_daemon.py [--runs 20]
+"""
+import argparse
+import json
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FAKE_VIVALDI = os.path.join(REPO_ROOT, "benchmarks", "fake_vivaldi.py")
+
+sys.path.insert(0, REPO_ROOT)
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))]
+
+
+def wait_for(predicate, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark daemon round trip vs cold CLI.")
+    parser.add_argument("--runs", type=int, default=20, help="Launches per variant.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as home:
+        config_dir = os.path.join(home, ".config", "vivaldi-workspace-cli")
+        user_data_dir = os.path.join(home, ".config", "vivaldi")
+        os.makedirs(config_dir)
+        os.makedirs(os.path.join(user_data_dir, "Default"))
+        with open(os.path.join(config_dir, "config.json"), 'w', encoding='utf-8') as f:
+            json.dump({"workspace_shortcuts": {"Bench": "ctrl+alt+1"}}, f)
+
+        env = dict(os.environ, HOME=home, XDG_CONFIG_HOME=os.path.join(home, ".config"),
+                   VV_WKSPACE_BACKEND="recording", VV_WKSPACE_VIVALDI=FAKE_VIVALDI,
+                   FAKE_VIVALDI_DELAY="0", FAKE_VIVALDI_LIFETIME="600")
+        env.pop("XDG_RUNTIME_DIR", None) # Keep the socket inside the throwaway HOME
+        os.environ.update(env)
+        from vv_wkspace import daemon
+
+        quiet = dict(cwd=REPO_ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        browser = subprocess.Popen([sys.executable, FAKE_VIVALDI], **quiet)
+        server = subprocess.Popen([sys.executable, "-m", "vv_wkspace.cli", "serve"], **quiet)
+        try:
+            if not wait_for(lambda: os.path.lexists(os.path.join(user_data_dir, "SingletonLock"))) \
+                    or not wait_for(lambda: daemon.send_request({"action": "ping"}) is not None):
+                print("ERROR: fake Vivaldi or daemon did not start.", file=sys.stderr)
+                sys.exit(1)
+
+            def cold_cli():
+                subprocess.run([sys.executable, "-m", "vv_wkspace.cli", "launch", "Bench"], **quiet)
+
+            def daemon_client():
+                subprocess.run([sys.executable, "-m", "vv_wkspace.cli", "launch", "--daemon", "Bench"], **quiet)
+
+            def daemon_socket():
+                daemon.send_request({"action": "launch", "script": "switch Bench\nnext-tab\n"})
+
+            print(f"{'variant':<14} {'p50 ms':>8} {'p95 ms':>8} {'min ms':>8}")
+            for label, func in (("cold cli", cold_cli), ("daemon client", daemon_client),
+                                ("daemon socket", daemon_socket)):
+                samples = []
+                for _ in range(args.runs):
+                    start = time.perf_counter()
+                    func()
+                    samples.append((time.perf_counter() - start) * 1000)
+                print(f"{label:<14} {statistics.median(samples):8.1f} {percentile(samples, 95):8.1f} {min(samples):8.1f}")
+        finally:
+            daemon.send_request({"action": "shutdown"})
+            server.wait(timeout=5)
+            browser.send_signal(signal.SIGTERM)
+            browser.wait(timeout=5)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,147 @@
+# benchmarks/bench_delays.py
+"""Switch settle time with fixed vs measured (adaptive) delays, against a simulated browser.
+
+A recording-backend subclass plays a Vivaldi window whose title changes a
+random time after each workspace switch shortcut (log-normal, --median and
+--sigma). Each run is `launch A B ...` through automator.run_actions,
+attached to benchmarks/fake_vivaldi.py in a throwaway HOME. A key sent
+before the previous switch finished counts as lost. Modes:
+  fixed     "adaptive_delays": false, window title not observable (old behavior)
+  observed  adaptive, title observable: waits for the title to change
+  blind     adaptive, title not observable: waits the delay derived from the
+            samples the 'observed' runs recorded
+Run from the repository root:
+
+    python benchmarks/bench_delays.py [--runs 20] [--median 0.08] [--sigma 0.4]
+"""
+import argparse
+import contextlib
+import io
+import os
+import random
+import signal
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FAKE_VIVALDI = os.path.join(REPO_ROOT, "benchmarks", "fake_vivaldi.py")
+
+sys.path.insert(0, REPO_ROOT)
+
+from bench_e2e import percentile
+from vv_wkspace import actions
+from vv_wkspace import automator
+from vv_wkspace import config
+from vv_wkspace import delay_stats
+from vv_wkspace import input_backends
+
+WORKSPACES = {"Mail": ("ctrl", "alt", "1"), "Code": ("ctrl", "alt", "2"), "Docs": ("ctrl", "alt", "3")}
+
+
+class SimulatedWindow(input_backends.FakeWindow):
+    """A Vivaldi window whose title follows the active workspace once its switch completes."""
+
+    def __init__(self, backend):
+        super().__init__("Start Page - Vivaldi", backend=backend)
+        self._title = self._next_title = "Start Page - Vivaldi"
+        self.switch_done_at = 0.0
+
+    @property
+    def title(self):
+        if time.monotonic() >= self.switch_done_at:
+            self._title = self._next_title
+        return self._title
+
+    @title.setter
+    def title(self, value):
+        self._title = self._next_title = value
+
+
+class SimulatedBackend(input_backends.RecordingBackend):
+    name = "simulated"
+
+    def __init__(self, rng, median, sigma, observable):
+        super().__init__([])
+        self.window = SimulatedWindow(self)
+        self.windows = [self.window]
+        self.supports_focus_check = observable
+        self.active_window = self.window
+        self.rng, self.median, self.sigma = rng, median, sigma
+        self.workspace_by_keys = {keys: name for name, keys in WORKSPACES.items()}
+        self.lost = 0
+
+    def hotkey(self, *keys):
+        super().hotkey(*keys)
+        now = time.monotonic()
+        if now < self.window.switch_done_at:
+            self.lost += 1 # Vivaldi was still switching
+        workspace = self.workspace_by_keys.get(keys)
+        if workspace is not None:
+            self.window.switch_done_at = now + self.rng.lognormvariate(0, self.sigma) * self.median
+            self.window._next_title = f"{workspace} tab {self.rng.randrange(1000)} - Vivaldi"
+
+
+def run_mode(mode, args):
+    """Returns (settle seconds per switch, lost keys)."""
+    rng = random.Random(args.seed)
+    backend = SimulatedBackend(rng, args.median, args.sigma, observable=mode == "observed")
+    backend_name = f"simulated-{mode}"
+    input_backends.BACKENDS[backend_name] = lambda: backend
+    shortcut_map = config.CompiledConfig(WORKSPACES, {"adaptive_delays": mode != "fixed"})
+    settles = []
+    for _ in range(args.runs):
+        names = list(WORKSPACES)
+        rng.shuffle(names)
+        backend.events.clear()
+        with contextlib.redirect_stdout(io.StringIO()):
+            automator.run_actions(actions.actions_for_workspaces(names), shortcut_map, backend_name)
+        # Each switch shortcut is followed by 'Next Tab'
+        sent = [event["t"] for event in backend.events if event["action"] == "hotkey"]
+        settles += [after - before for before, after in zip(sent[::2], sent[1::2])]
+    return sorted(settles), backend.lost
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark fixed vs adaptive switch delays.")
+    parser.add_argument("--runs", type=int, default=20, help=f"Launches per mode ({len(WORKSPACES)} switches each).")
+    parser.add_argument("--median", type=float, default=0.08, help="Median simulated switch time in seconds (default: 0.08).")
+    parser.add_argument("--sigma", type=float, default=0.4, help="Log-normal sigma of the switch time (default: 0.4).")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as home:
+        # Config dir (and so the delay stats) and user data dir in the throwaway HOME
+        os.environ["HOME"] = home
+        os.environ["XDG_CONFIG_HOME"] = os.path.join(home, ".config")
+        os.environ[automator.VIVALDI_EXE_ENV_VAR] = FAKE_VIVALDI
+        user_data_dir = os.path.join(home, ".config", "vivaldi")
+        os.makedirs(os.path.join(user_data_dir, "Default"))
+        browser = subprocess.Popen([sys.executable, FAKE_VIVALDI],
+                                   env=dict(os.environ, FAKE_VIVALDI_DELAY="0", FAKE_VIVALDI_LIFETIME="600"))
+        try:
+            deadline = time.monotonic() + 10
+            while not os.path.lexists(os.path.join(user_data_dir, "SingletonLock")) and time.monotonic() < deadline:
+                time.sleep(0.01)
+            print(f"Simulated switch time: median {args.median * 1000:.0f}ms, sigma {args.sigma}; "
+                  f"{args.runs} launches x {len(WORKSPACES)} switches per mode")
+            print(f"{'mode':<9} {'mean ms':>8} {'p95 ms':>8} {'lost':>5}  wait")
+            for mode in ("fixed", "observed", "blind"): # 'blind' uses what 'observed' recorded
+                settles, lost = run_mode(mode, args)
+                if mode == "fixed":
+                    wait = f"{automator.SWITCH_DELAY:.3f}s"
+                elif mode == "observed":
+                    wait = "until the title changes"
+                else:
+                    wait = f"{delay_stats.get_stats().delay('switch', automator.SWITCH_DELAY):.3f}s (derived)"
+                print(f"{mode:<9} {statistics.mean(settles) * 1000:8.1f} {percentile(settles, 0.95) * 1000:8.1f} "
+                      f"{lost:5d}  {wait}")
+        finally:
+            browser.send_signal(signal.SIGTERM)
+            browser.wait()
+
+
+if __name__ == '__main__':
+    main()
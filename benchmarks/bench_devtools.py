@@ -0,0 +1,113 @@
+# benchmarks/bench_devtools.py
+"""Keyboard transport vs DevTools transport, against stand-ins.
+
+1. Per-action latency over DevTools against fake_devtools.py, in-process:
+   one pooled connection reused for every action vs a new WebSocket per action.
+2. End to end: 'launch' with several workspaces, attaching to a running
+   fake_vivaldi.py that serves fake DevTools, with the keyboard transport
+   (recording backend, so no real key presses) and with --transport devtools.
+   The keyboard path pays SWITCH_DELAY after each switch; a real PyAutoGUI
+   backend would add its per-call PAUSE (0.1s by default) on top.
+Run from the repository root:
+
+    python benchmarks/bench_devtools.py [--actions 200] [--workspaces 3] [--runs 5]
+"""
+import argparse
+import asyncio
+import json
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FAKE_VIVALDI = os.path.join(REPO_ROOT, "benchmarks", "fake_vivaldi.py")
+ENTRY_POINT = "from vv_wkspace.cli import main; main()"
+
+sys.path.insert(0, REPO_ROOT)
+
+from bench_profiles import write_user_data_dir
+from fake_devtools import FakeDevTools
+from vv_wkspace import devtools
+
+DEVTOOLS_PORT = 19333
+
+
+async def per_action(port, workspace_ids, actions, pooled):
+    """Returns (median ms per action, connections opened)."""
+    target = await devtools.find_ui_target(port)
+    pool = devtools.ConnectionPool()
+    times = []
+    try:
+        for i in range(actions):
+            start = time.perf_counter()
+            connection = await pool.get(target["webSocketDebuggerUrl"])
+            if i % 2 == 0:
+                ok = await devtools.switch_workspace(connection, workspace_ids[(i // 2) % len(workspace_ids)])
+            else:
+                ok = await devtools.next_tab(connection)
+            if not pooled:
+                await pool.close()
+            times.append(time.perf_counter() - start)
+            assert ok
+    finally:
+        await pool.close()
+    return statistics.median(times) * 1000, pool.opened
+
+
+def run_cli(argv, env):
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-c", ENTRY_POINT] + argv, env=env, cwd=REPO_ROOT,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    if result.returncode != 0:
+        sys.exit(f"'{' '.join(argv)}' failed:\n{result.stderr}")
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the DevTools transport against the keyboard one.")
+    parser.add_argument("--actions", type=int, default=200, help="Actions for the per-action comparison.")
+    parser.add_argument("--workspaces", type=int, default=3, help="Workspaces switched through per launch.")
+    parser.add_argument("--runs", type=int, default=5, help="End-to-end runs per transport (median is reported).")
+    args = parser.parse_args()
+
+    workspace_ids = list(range(1, 6))
+    fake = FakeDevTools(workspace_ids)
+    port = fake.start()
+    for pooled in (True, False):
+        ms, opened = asyncio.run(per_action(port, workspace_ids, args.actions, pooled))
+        label = "pooled connection" if pooled else "connection per action"
+        print(f"{label:<24} {ms:7.3f} ms/action  ({opened} connection(s) for {args.actions} actions)")
+
+    with tempfile.TemporaryDirectory() as home:
+        user_data_dir = os.path.join(home, ".config", "vivaldi")
+        write_user_data_dir(user_data_dir, 1, 64 * 1024, args.workspaces)
+        names = [f"Workspace {i} é" for i in range(args.workspaces)]
+        config_dir = os.path.join(home, ".config", "vivaldi-workspace-cli")
+        os.makedirs(config_dir)
+        with open(os.path.join(config_dir, "config.json"), 'w', encoding='utf-8') as f:
+            json.dump({"devtools_port": DEVTOOLS_PORT,
+                       "workspace_shortcuts": {name: f"ctrl+alt+{i + 1}" for i, name in enumerate(names)}}, f)
+        env = dict(os.environ, HOME=home, PYTHONPATH=REPO_ROOT, VV_WKSPACE_BACKEND="recording",
+                   VV_WKSPACE_VIVALDI=FAKE_VIVALDI, FAKE_VIVALDI_DELAY="0", FAKE_VIVALDI_LIFETIME="600")
+        env.pop("XDG_CONFIG_HOME", None)
+        browser = subprocess.Popen([sys.executable, FAKE_VIVALDI, f"--remote-debugging-port={DEVTOOLS_PORT}"], env=env)
+        try:
+            deadline = time.monotonic() + 10
+            while not os.path.lexists(os.path.join(user_data_dir, "SingletonLock")) and time.monotonic() < deadline:
+                time.sleep(0.01)
+            for transport in ("keyboard", "devtools"):
+                argv = ["launch", "--transport", transport] + names
+                run_cli(argv, env) # Warm the caches
+                seconds = statistics.median(run_cli(argv, env) for _ in range(args.runs))
+                print(f"launch {len(names)} workspaces, {transport:<9} {seconds * 1000:8.1f} ms")
+        finally:
+            browser.send_signal(signal.SIGTERM)
+            browser.wait()
+
+
+if __name__ == '__main__':
+    main()
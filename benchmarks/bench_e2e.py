@@ -0,0 +1,274 @@
+# benchmarks/bench_e2e.py
+"""End-to-end benchmark of the real CLI entry point, with regression check.
+
+Every run is a fresh process calling vv_wkspace.cli.main() (as the installed
+'vivaldi_workspace' command does) in a throwaway HOME with:
+  * generated Preferences/Local State fixtures and a matching config,
+  * the recording input backend instead of PyAutoGUI,
+  * benchmarks/fake_vivaldi.py instead of Vivaldi.
+For each fixture and case it reports p50/p90/p99 wall time and the peak RSS
+of the CLI process, and compares them with a baseline file. The child reports
+its own peak (VmHWM from /proc/self/status, which exec resets), because
+wait4()'s ru_maxrss carries this driver's high-water mark over fork and exec.
+Baselines are machine-specific: record one on the machine you compare on.
+Run from the repository root:
+
+    python benchmarks/bench_e2e.py --update-baseline      # record
+    python benchmarks/bench_e2e.py                        # compare; exit 1 on regression
+
+Options: --fixtures small,medium,large  --cases list,launch-attach,...
+         --runs 10  --tolerance 0.2  --slack-ms 5  --rss-tolerance 0.1
+"""
+import argparse
+import json
+import os
+import shutil
+import signal
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FAKE_VIVALDI = os.path.join(REPO_ROOT, "benchmarks", "fake_vivaldi.py")
+DEFAULT_BASELINE = os.path.join(REPO_ROOT, "benchmarks", "e2e_baseline.json")
+ENTRY_POINT = "from vv_wkspace.cli import main; main()"
+# File descriptor the child writes its peak RSS (KB) to at exit
+RSS_FD = 3
+# Runs ENTRY_POINT, reporting the peak RSS at exit (last atexit handler to run)
+CHILD_CODE = f"""
+import atexit, os, sys
+def _report_peak_rss():
+    try:
+        with open("/proc/self/status") as f:
+            kb = next(int(line.split()[1]) for line in f if line.startswith("VmHWM:"))
+    except (OSError, StopIteration):
+        import resource # No /proc: ru_maxrss of this process (bytes on macOS)
+        kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        kb = kb // 1024 if sys.platform == "darwin" else kb
+    os.write({RSS_FD}, str(kb).encode())
+atexit.register(_report_peak_rss)
+{ENTRY_POINT}
+"""
+
+sys.path.insert(0, REPO_ROOT)
+
+from bench_profiles import write_user_data_dir
+
+# name: (profiles, Preferences bytes per profile, workspaces per profile)
+FIXTURES = {
+    "small": (1, 64 * 1024, 5),
+    "medium": (3, 1024 * 1024, 50),
+    "large": (6, 8 * 1024 * 1024, 200),
+}
+# Keys for generated shortcuts; all in the default backend's vocabulary
+SHORTCUT_KEYS = [chr(c) for c in range(ord('a'), ord('z') + 1)] + [str(d) for d in range(10)]
+CASES = ("list", "list-cold", "complete", "config-init", "launch-attach", "launch-spawn")
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    index = max(0, min(len(sorted_values) - 1, int(round(fraction * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+class Fixture:
+    """A HOME with a Vivaldi user data dir and config generated for one fixture size."""
+
+    def __init__(self, name, root):
+        profiles, prefs_size, workspaces = FIXTURES[name]
+        self.name = name
+        self.home = os.path.join(root, name)
+        self.user_data_dir = os.path.join(self.home, ".config", "vivaldi")
+        self.config_dir = os.path.join(self.home, ".config", "vivaldi-workspace-cli")
+        write_user_data_dir(self.user_data_dir, profiles, prefs_size, workspaces)
+        # Same names write_synthetic_prefs puts in every profile
+        self.workspaces = [f"Workspace {i} é" for i in range(workspaces)]
+        os.makedirs(self.config_dir, exist_ok=True)
+        with open(os.path.join(self.config_dir, "config.json"), 'w', encoding='utf-8') as f:
+            json.dump({"workspace_shortcuts": {
+                name: f"ctrl+alt+{SHORTCUT_KEYS[i % len(SHORTCUT_KEYS)]}" for i, name in enumerate(self.workspaces)}}, f)
+        self.env = dict(os.environ, HOME=self.home, PYTHONPATH=REPO_ROOT,
+                        VV_WKSPACE_BACKEND="recording", VV_WKSPACE_VIVALDI=FAKE_VIVALDI,
+                        FAKE_VIVALDI_DELAY="0.05", FAKE_VIVALDI_LIFETIME="600")
+        for var in ("XDG_CONFIG_HOME", "XDG_RUNTIME_DIR", "FAKE_VIVALDI_USER_DATA_DIR", "VV_WKSPACE_RECORD_FILE"):
+            self.env.pop(var, None)
+
+    def remove_caches(self):
+        for filename in ("prefs_cache.json", "completion_index"):
+            try:
+                os.remove(os.path.join(self.config_dir, filename))
+            except OSError:
+                pass
+
+    def stop_vivaldi(self):
+        """Stops the fake browser holding this fixture's profile lock, if any."""
+        try:
+            pid = int(os.readlink(os.path.join(self.user_data_dir, "SingletonLock")).rsplit("-", 1)[1])
+            os.kill(pid, signal.SIGTERM)
+        except (OSError, ValueError, IndexError):
+            return
+        deadline = time.monotonic() + 5
+        while os.path.lexists(os.path.join(self.user_data_dir, "SingletonLock")) and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def case(self, case):
+        """Returns (argv, setup callable or None) for a case."""
+        target = self.workspaces[len(self.workspaces) // 2]
+        if case == "list":
+            return ["list"], None
+        if case == "list-cold":
+            return ["list"], self.remove_caches
+        if case == "complete":
+            return ["complete", "Workspace 1"], None
+        if case == "config-init":
+            init_home = os.path.join(self.home, "init")
+            def setup():
+                shutil.rmtree(init_home, ignore_errors=True)
+                self.env["XDG_CONFIG_HOME"] = init_home
+            return ["config", "init"], setup
+        if case == "launch-attach":
+            def setup():
+                if not os.path.lexists(os.path.join(self.user_data_dir, "SingletonLock")):
+                    run_cli(["launch", target], self.env) # Leaves the fake browser running
+            return ["launch", target], setup
+        # launch-spawn
+        return ["launch", target], self.stop_vivaldi
+
+
+def run_cli(argv, env):
+    """Runs the CLI once; returns (wall seconds, peak RSS in KB or None if not reported, exit status)."""
+    devnull = os.open(os.devnull, os.O_RDWR)
+    rss_read, rss_write = os.pipe()
+    try:
+        start = time.perf_counter()
+        pid = os.posix_spawn(sys.executable, [sys.executable, "-c", CHILD_CODE] + argv, env,
+                             file_actions=[(os.POSIX_SPAWN_DUP2, devnull, 0),
+                                           (os.POSIX_SPAWN_DUP2, devnull, 1),
+                                           (os.POSIX_SPAWN_DUP2, devnull, 2),
+                                           (os.POSIX_SPAWN_DUP2, rss_write, RSS_FD)])
+        os.close(rss_write)
+        rss_write = None
+        _, status = os.waitpid(pid, 0)
+        elapsed = time.perf_counter() - start
+        os.set_blocking(rss_read, False) # Nothing written (crash): don't wait on a spawned Vivaldi holding the pipe
+        try:
+            report = os.read(rss_read, 64)
+        except BlockingIOError:
+            report = b""
+    finally:
+        os.close(devnull)
+        os.close(rss_read)
+        if rss_write is not None:
+            os.close(rss_write)
+    max_rss_kb = int(report) if report.strip().isdigit() else None
+    return elapsed, max_rss_kb, os.waitstatus_to_exitcode(status)
+
+
+def measure(fixture, case, runs):
+    argv, setup = fixture.case(case)
+    env_before = dict(fixture.env)
+    times, rss = [], []
+    try:
+        for run in range(runs + 1): # The first run only warms the caches and is discarded
+            if setup:
+                setup()
+            elapsed, max_rss_kb, status = run_cli(argv, fixture.env)
+            if status != 0:
+                raise RuntimeError(f"{fixture.name}/{case}: 'vivaldi_workspace {' '.join(argv)}' exited with {status}")
+            if max_rss_kb is None:
+                raise RuntimeError(f"{fixture.name}/{case}: 'vivaldi_workspace {' '.join(argv)}' didn't report its RSS")
+            if run:
+                times.append(elapsed * 1000)
+                rss.append(max_rss_kb)
+    finally:
+        fixture.env = env_before
+    times.sort()
+    return {"runs": runs, "p50_ms": round(percentile(times, 0.50), 2), "p90_ms": round(percentile(times, 0.90), 2),
+            "p99_ms": round(percentile(times, 0.99), 2), "max_rss_kb": max(rss)}
+
+
+def compare(results, baseline, tolerance, slack_ms, rss_tolerance):
+    """Returns {key: [regression messages]} against the baseline results."""
+    regressions = {}
+    for key, result in results.items():
+        base = baseline.get(key)
+        if not base:
+            continue
+        problems = []
+        for metric in ("p50_ms", "p90_ms"):
+            limit = base[metric] * (1 + tolerance) + slack_ms
+            if result[metric] > limit:
+                problems.append(f"{metric} {result[metric]:.1f} > {limit:.1f} (baseline {base[metric]:.1f})")
+        rss_limit = base["max_rss_kb"] * (1 + rss_tolerance)
+        if result["max_rss_kb"] > rss_limit:
+            problems.append(f"max RSS {result['max_rss_kb']}KB > {rss_limit:.0f}KB (baseline {base['max_rss_kb']}KB)")
+        if problems:
+            regressions[key] = problems
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end CLI benchmark with baseline comparison.")
+    parser.add_argument("--fixtures", default=",".join(FIXTURES), help=f"Comma-separated fixtures (default: all of {', '.join(FIXTURES)})")
+    parser.add_argument("--cases", default=",".join(CASES), help=f"Comma-separated cases (default: all of {', '.join(CASES)})")
+    parser.add_argument("--runs", type=int, default=10, help="Measured runs per case, after one warm-up run.")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON file (default: benchmarks/e2e_baseline.json)")
+    parser.add_argument("--update-baseline", action="store_true", help="Write these results as the new baseline instead of comparing.")
+    parser.add_argument("--tolerance", type=float, default=0.20, help="Allowed relative slowdown of p50/p90 (default: 0.20).")
+    parser.add_argument("--slack-ms", type=float, default=5.0, help="Allowed absolute slowdown on top, for noise (default: 5).")
+    parser.add_argument("--rss-tolerance", type=float, default=0.10, help="Allowed relative growth of peak RSS (default: 0.10).")
+    parser.add_argument("--output", help="Also write the results as JSON to this file.")
+    args = parser.parse_args()
+
+    fixtures = args.fixtures.split(",")
+    cases = args.cases.split(",")
+    for name in fixtures:
+        if name not in FIXTURES:
+            parser.error(f"unknown fixture '{name}'")
+    for case in cases:
+        if case not in CASES:
+            parser.error(f"unknown case '{case}'")
+
+    baseline = {}
+    if not args.update_baseline:
+        try:
+            with open(args.baseline, 'r', encoding='utf-8') as f:
+                baseline = json.load(f).get("results", {})
+        except (OSError, ValueError):
+            print(f"No baseline at '{args.baseline}'; run with --update-baseline to record one.", file=sys.stderr)
+
+    results = {}
+    print(f"{'fixture/case':<24} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'RSS MB':>7}  vs baseline p50")
+    with tempfile.TemporaryDirectory() as root:
+        for name in fixtures:
+            fixture = Fixture(name, root)
+            try:
+                for case in cases:
+                    key = f"{name}/{case}"
+                    result = results[key] = measure(fixture, case, args.runs)
+                    base = baseline.get(key)
+                    change = f"{(result['p50_ms'] / base['p50_ms'] - 1) * 100:+.0f}%" if base else "-"
+                    print(f"{key:<24} {result['p50_ms']:8.1f} {result['p90_ms']:8.1f} {result['p99_ms']:8.1f} "
+                          f"{result['max_rss_kb'] / 1024:7.1f}  {change}")
+            finally:
+                fixture.stop_vivaldi()
+
+    report = {"version": 1, "python": sys.version.split()[0], "platform": sys.platform, "results": results}
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=1)
+    if args.update_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=1)
+        print(f"Baseline written to '{args.baseline}'.")
+        return
+
+    regressions = compare(results, baseline, args.tolerance, args.slack_ms, args.rss_tolerance)
+    for key, problems in regressions.items():
+        for problem in problems:
+            print(f"REGRESSION {key}: {problem}", file=sys.stderr)
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+# benchmarks/bench_input.py
+"""Per-shortcut latency of the input backends: PyAutoGUI hotkey() vs batched XTEST.
+
+Sends the same chord --count times through each backend that loads here and
+reports how long one shortcut takes until the backend returns; for 'xtest'
+also until the X server has processed it (XSync), since it returns after
+queueing. PyAutoGUI runs with its default PAUSE and with PAUSE = 0. Needs an
+X display; a throwaway one keeps the keys away from your desktop:
+
+    xvfb-run -a python benchmarks/bench_input.py [--count 50] [--keys ctrl+alt+1]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_e2e import percentile
+from vv_wkspace import config
+from vv_wkspace import input_backends
+
+
+def time_sends(send, keys, count):
+    """Returns sorted per-call seconds of send(*keys)."""
+    times = []
+    for _ in range(count):
+        start = time.perf_counter()
+        send(*keys)
+        times.append(time.perf_counter() - start)
+    return sorted(times)
+
+
+def report(label, times):
+    print(f"{label:<28} {statistics.mean(times) * 1000:8.2f} {percentile(times, 0.95) * 1000:8.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-shortcut latency of the input backends.")
+    parser.add_argument("--count", type=int, default=50, help="Shortcuts sent per backend (default: 50).")
+    parser.add_argument("--keys", default="ctrl+alt+1", help="Chord to send (default: ctrl+alt+1).")
+    parser.add_argument("--spacing", type=int, default=0, help="XTEST inter-event spacing in ms (default: 0).")
+    args = parser.parse_args()
+    keys = config.parse_shortcut(args.keys, input_backends.XTestBackend.key_names)
+
+    print(f"{args.count} x {'+'.join(keys)} on DISPLAY={os.getenv('DISPLAY', '(unset)')}")
+    print(f"{'backend':<28} {'mean ms':>8} {'p95 ms':>8}")
+    xtest = input_backends.get_backend("xtest", {input_backends.EVENT_SPACING_SETTING: args.spacing})
+    if xtest is not None:
+        report(f"xtest, spacing {args.spacing}ms", time_sends(xtest.hotkey, keys, args.count))
+
+        def send_and_sync(*chord):
+            xtest.hotkey(*chord)
+            xtest._x11.XSync(xtest._display, 0)
+        report("xtest + XSync", time_sends(send_and_sync, keys, args.count))
+
+    pyautogui_backend = input_backends.get_backend("pyautogui")
+    if pyautogui_backend is not None:
+        pyautogui = pyautogui_backend._pyautogui
+        report(f"pyautogui, PAUSE {pyautogui.PAUSE}s", time_sends(pyautogui_backend.hotkey, keys, args.count))
+        default_pause, pyautogui.PAUSE = pyautogui.PAUSE, 0
+        try:
+            report("pyautogui, PAUSE 0", time_sends(pyautogui_backend.hotkey, keys, args.count))
+        finally:
+            pyautogui.PAUSE = default_pause
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+# benchmarks/bench_launch_many.py
+"""Opening N profiles: one launch after another vs 'launch-many'.
+
+Each profile gets its own user data dir, served by benchmarks/fake_vivaldi.py
+with a start-up time of --delay seconds; keys go to the recording backend.
+'sequential' calls automator.launch_many() once per profile (each waits for
+its own Vivaldi before the next starts, like N 'launch -p' runs), 'parallel'
+once with all of them. Parallel should take about one start-up plus N
+switch steps. Run from the repository root:
+
+    python benchmarks/bench_launch_many.py [--profiles 4] [--delay 1.5]
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FAKE_VIVALDI = os.path.join(REPO_ROOT, "benchmarks", "fake_vivaldi.py")
+
+sys.path.insert(0, REPO_ROOT)
+
+from bench_profiles import write_user_data_dir
+from vv_wkspace import automator
+from vv_wkspace import config
+from vv_wkspace import vivaldi_utils
+
+WORKSPACES = {"Mail": ("ctrl", "alt", "1"), "Code": ("ctrl", "alt", "2")}
+
+
+def make_entries(base, count):
+    """One user data dir (with a Default profile) per entry, under `base`."""
+    entries = []
+    for i in range(count):
+        user_data_dir = os.path.join(base, f"user-data-{i}")
+        write_user_data_dir(user_data_dir, 1, 4096, workspace_count=2)
+        profile = vivaldi_utils.list_profiles(user_data_dir)[0]
+        entries.append(automator.LaunchEntry(user_data_dir, profile, [list(WORKSPACES)[i % len(WORKSPACES)]]))
+    return entries
+
+
+def run(entries, shortcut_map, together):
+    """Returns (wall seconds, all succeeded)."""
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        if together:
+            ok = automator.launch_many(entries, shortcut_map, "recording")
+        else:
+            ok = all([automator.launch_many([entry], shortcut_map, "recording") for entry in entries])
+    return time.perf_counter() - start, ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark sequential launches vs launch-many.")
+    parser.add_argument("--profiles", type=int, default=4, help="Profiles (user data dirs) to open (default: 4).")
+    parser.add_argument("--delay", type=float, default=1.5, help="Fake Vivaldi start-up time in seconds (default: 1.5).")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as home:
+        os.environ["HOME"] = home
+        os.environ["XDG_CONFIG_HOME"] = os.path.join(home, ".config")
+        os.environ[automator.VIVALDI_EXE_ENV_VAR] = FAKE_VIVALDI
+        os.environ["FAKE_VIVALDI_DELAY"] = str(args.delay)
+        os.environ["FAKE_VIVALDI_LIFETIME"] = "30"
+        # Fixed waits, so both modes do the same work after start-up
+        shortcut_map = config.CompiledConfig(WORKSPACES, {"adaptive_delays": False})
+        print(f"{args.profiles} profiles, Vivaldi start-up {args.delay:.1f}s each")
+        print(f"{'mode':<11} {'seconds':>8}")
+        for mode in ("sequential", "parallel"):
+            # Fresh user data dirs, so no mode attaches to the other's browsers
+            entries = make_entries(os.path.join(home, mode), args.profiles)
+            elapsed, ok = run(entries, shortcut_map, mode == "parallel")
+            print(f"{mode:<11} {elapsed:8.2f}{'' if ok else '  (FAILED)'}")
+
+
+if __name__ == '__main__':
+    main()
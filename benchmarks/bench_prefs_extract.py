@@ -0,0 +1,125 @@
+# benchmarks/bench_prefs_extract.py
+"""Compares the streaming Preferences extractor against the old full-file decode.
+
+Generates synthetic Preferences files (10 KB .. 50 MB) with junk control
+characters and trailing commas, then reports wall time and peak Python heap
+for both paths. Run from the repository root:
+
+    python benchmarks/bench_prefs_extract.py [--sizes 10K,1M,50M] [--repeat 3]
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vv_wkspace import vivaldi_utils
+
+DEFAULT_SIZES = "10K,100K,1M,10M,50M"
+
+
+def legacy_get_workspaces_from_prefs(profile_path):
+    """The original implementation: decode the whole file, then navigate."""
+    prefs_file = os.path.join(profile_path, 'Preferences')
+    with open(prefs_file, 'r', encoding='utf-8') as f:
+        content = f.read()
+        content = ''.join(c for c in content if c.isprintable() or c.isspace())
+        content = re.sub(r',\s*([\}\]])', r'\1', content)
+        prefs_data = json.loads(content)
+    workspaces = prefs_data.get("vivaldi", {}).get("workspaces", {}).get("list", [])
+    return [ws.get("name") for ws in workspaces if ws.get("name")]
+
+
+def stream_get_workspaces_from_prefs(profile_path):
+    """The streaming extractor, bypassing the on-disk Preferences cache."""
+    records = vivaldi_utils._read_workspace_records(os.path.join(profile_path, 'Preferences'))
+    return [record["name"] for record in records]
+
+
+def parse_size(text):
+    """Parses '10K', '5M' or a plain byte count."""
+    text = text.strip().upper()
+    units = {"K": 1024, "M": 1024 * 1024}
+    if text[-1] in units:
+        return int(float(text[:-1]) * units[text[-1]])
+    return int(text)
+
+
+def write_synthetic_prefs(path, target_size, workspace_count=12):
+    """Writes a Preferences-like file of roughly `target_size` bytes.
+
+    Filler lives in keys sorted before "vivaldi" (as Chromium writes them), so
+    the extractor has to scan almost the whole file before finding workspaces.
+    """
+    workspaces = [{"id": 1700000000000 + i, "name": f"Workspace {i} \u00e9", "icon": "", "emoji": ""}
+                  for i in range(workspace_count)]
+    head = '{"browser": {"window_placement": {"bottom": 1000, "left": 10,}, "has_seen_welcome_page": true},\n "extensions": {"settings": {\n'
+    tail = ('}},\n "vivaldi": {"address_bar": {"inline_search": {"enabled": true}}, '
+            '"workspaces": ' + json.dumps({"list": workspaces, "version": 2}) + ', "zoom": 1.0}}\n')
+    entry_index = 0
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(head)
+        written = len(head) + len(tail)
+        while written < target_size:
+            # Stray control character and a trailing comma, like damaged real-world files
+            entry = (f'  "ext{entry_index:08d}": {{"path": "C:\\\\ext\\\\{entry_index}\\u0001", '
+                     f'"manifest": {{"name": "Extension \\"{entry_index}\\" {{x}}", "permissions": ["tabs", "storage",]}},'
+                     f' "state": 1,\x07 "was_installed_by_default": false}},\n')
+            f.write(entry)
+            written += len(entry)
+            entry_index += 1
+        f.write(f'  "ext{entry_index:08d}": {{}}\n')
+        f.write(tail)
+
+
+def time_call(func, profile_path, repeat):
+    """Returns (best wall time in seconds, result) over `repeat` runs."""
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(profile_path)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def peak_memory(func, profile_path):
+    """Returns the peak traced Python allocation for one call, in bytes."""
+    tracemalloc.start()
+    try:
+        func(profile_path)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Preferences workspace extraction.")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help=f"Comma-separated file sizes (default: {DEFAULT_SIZES})")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing runs per size (best is reported).")
+    args = parser.parse_args()
+
+    print(f"{'size':>8} | {'legacy s':>9} {'legacy peak':>12} | {'stream s':>9} {'stream peak':>12} | speedup")
+    with tempfile.TemporaryDirectory() as profile_path:
+        prefs_file = os.path.join(profile_path, 'Preferences')
+        for size_text in args.sizes.split(","):
+            write_synthetic_prefs(prefs_file, parse_size(size_text))
+            legacy_time, legacy_names = time_call(legacy_get_workspaces_from_prefs, profile_path, args.repeat)
+            stream_time, stream_names = time_call(stream_get_workspaces_from_prefs, profile_path, args.repeat)
+            if legacy_names != stream_names:
+                print(f"MISMATCH at {size_text}: {legacy_names!r} != {stream_names!r}", file=sys.stderr)
+                sys.exit(1)
+            legacy_peak = peak_memory(legacy_get_workspaces_from_prefs, profile_path)
+            stream_peak = peak_memory(stream_get_workspaces_from_prefs, profile_path)
+            print(f"{size_text:>8} | {legacy_time:9.4f} {legacy_peak / 1024:10.0f}KB | "
+                  f"{stream_time:9.4f} {stream_peak / 1024:10.0f}KB | {legacy_time / stream_time:6.1f}x")
+
+
+if __name__ == '__main__':
+    main()
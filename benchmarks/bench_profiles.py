@@ -0,0 +1,87 @@
+# benchmarks/bench_profiles.py
+"""Multi-profile workspace discovery: one worker thread vs a thread pool.
+
+Builds a synthetic user data dir with a 'Local State' listing N profiles, each
+with a Preferences file of the given size, then times build_workspace_index
+with the parsed-Preferences cache empty (cold) and filled (warm). The cache
+lives in a temporary XDG_CONFIG_HOME so your real one is left alone.
+Run from the repository root:
+
+    python benchmarks/bench_profiles.py [--profiles 2,8,32] [--size 1M] [--repeat 3]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_prefs_extract import parse_size, write_synthetic_prefs
+from vv_wkspace import prefs_cache
+from vv_wkspace import vivaldi_utils
+
+
+def write_user_data_dir(base, profile_count, prefs_size, workspace_count=12):
+    """Creates 'Default', 'Profile 1'.. with Preferences, plus a 'Local State' naming them."""
+    info_cache = {}
+    for i in range(profile_count):
+        directory = "Default" if i == 0 else f"Profile {i}"
+        os.makedirs(os.path.join(base, directory), exist_ok=True)
+        write_synthetic_prefs(os.path.join(base, directory, 'Preferences'), prefs_size, workspace_count)
+        info_cache[directory] = {"name": f"Person {i}", "active_time": 1700000000.0 + i}
+    with open(os.path.join(base, "Local State"), 'w', encoding='utf-8') as f:
+        json.dump({"browser": {"enabled_labs_experiments": []},
+                   "profile": {"info_cache": info_cache, "last_used": "Default"}}, f)
+
+
+def clear_cache():
+    try:
+        os.remove(prefs_cache.get_cache_path())
+    except OSError:
+        pass
+
+
+def time_index(base, max_workers, repeat, cold):
+    """Returns (best wall time in seconds, entry count)."""
+    best = None
+    count = 0
+    for _ in range(repeat):
+        if cold:
+            clear_cache()
+        start = time.perf_counter()
+        profiles = vivaldi_utils.list_profiles(base)
+        count = len(vivaldi_utils.build_workspace_index(profiles, max_workers))
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark parallel multi-profile workspace discovery.")
+    parser.add_argument("--profiles", default="2,8,32", help="Comma-separated profile counts (default: 2,8,32)")
+    parser.add_argument("--size", default="1M", help="Size of each Preferences file (default: 1M)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing runs per case (best is reported).")
+    args = parser.parse_args()
+
+    prefs_size = parse_size(args.size)
+    print(f"{'profiles':>8} | {'cold 1 thr':>10} {'cold pool':>10} {'speedup':>7} | {'warm 1 thr':>10} {'warm pool':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["XDG_CONFIG_HOME"] = os.path.join(tmp, "config")
+        for count_text in args.profiles.split(","):
+            base = os.path.join(tmp, f"user-data-{count_text}")
+            write_user_data_dir(base, int(count_text), prefs_size)
+            cold_serial, serial_entries = time_index(base, 1, args.repeat, cold=True)
+            cold_pool, pool_entries = time_index(base, None, args.repeat, cold=True)
+            if serial_entries != pool_entries:
+                print(f"MISMATCH at {count_text} profiles: {serial_entries} != {pool_entries}", file=sys.stderr)
+                sys.exit(1)
+            warm_serial, _ = time_index(base, 1, args.repeat, cold=False)
+            warm_pool, _ = time_index(base, None, args.repeat, cold=False)
+            print(f"{count_text:>8} | {cold_serial:10.4f} {cold_pool:10.4f} {cold_serial / cold_pool:6.1f}x | "
+                  f"{warm_serial:10.4f} {warm_pool:10.4f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+# benchmarks/bench_readiness.py
+"""Time-to-first-shortcut of `launch` against a fake Vivaldi with varying boot times.
+
+Each run uses a throwaway HOME, the recording input backend and
+benchmarks/fake_vivaldi.py, which creates the profile lock files after
+--delays seconds. Reports when the first shortcut went out relative to the
+fake browser becoming ready, next to what the old fixed LAUNCH_DELAY would do.
+Run from the repository root:
+
+    python benchmarks/bench_readiness.py [--delays 0.2,1,4]
+"""
+import argparse
+import json
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FAKE_VIVALDI = os.path.join(REPO_ROOT, "benchmarks", "fake_vivaldi.py")
+
+sys.path.insert(0, REPO_ROOT)
+
+from vv_wkspace import automator
+
+
+def read_events(path):
+    if not os.path.exists(path):
+        return []
+    with open(path, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def make_home(home):
+    """Creates a config mapping one workspace and an empty Default profile."""
+    config_dir = os.path.join(home, ".config", "vivaldi-workspace-cli")
+    os.makedirs(config_dir)
+    with open(os.path.join(config_dir, "config.json"), 'w', encoding='utf-8') as f:
+        json.dump({"workspace_shortcuts": {"Bench": "ctrl+alt+1"}}, f)
+    os.makedirs(os.path.join(home, ".config", "vivaldi", "Default"))
+
+
+def run_launch(delay):
+    """Returns (seconds from launch to first shortcut, seconds from launch to fake ready)."""
+    with tempfile.TemporaryDirectory() as home:
+        make_home(home)
+        record_file = os.path.join(home, "input.ndjson")
+        fake_log = os.path.join(home, "fake_vivaldi.ndjson")
+        env = dict(os.environ, HOME=home, XDG_CONFIG_HOME=os.path.join(home, ".config"),
+                   VV_WKSPACE_BACKEND="recording", VV_WKSPACE_RECORD_FILE=record_file,
+                   VV_WKSPACE_VIVALDI=FAKE_VIVALDI, FAKE_VIVALDI_LOG=fake_log,
+                   FAKE_VIVALDI_DELAY=str(delay), FAKE_VIVALDI_LIFETIME="60")
+        start = time.monotonic()
+        # No pipes: the fake browser inherits them and would keep them open
+        subprocess.run([sys.executable, "-m", "vv_wkspace.cli", "launch", "Bench"],
+                       cwd=REPO_ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        fake_events = read_events(fake_log)
+        for event in fake_events:
+            if event["event"] == "start":
+                try:
+                    os.kill(event["pid"], signal.SIGTERM)
+                except OSError:
+                    pass
+        inputs = read_events(record_file)
+        ready = [e["t"] for e in fake_events if e["event"] == "ready"]
+        first_key = inputs[0]["t"] - start if inputs else float("nan")
+        ready_at = ready[0] - start if ready else float("nan")
+        return first_key, ready_at
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark launch readiness detection.")
+    parser.add_argument("--delays", default="0.2,1,4", help="Comma-separated fake boot times in seconds.")
+    args = parser.parse_args()
+
+    print(f"{'boot s':>7} | {'ready at':>8} {'1st key':>8} {'wasted':>7} {'ok':>4} | "
+          f"{'fixed ' + str(automator.LAUNCH_DELAY) + 's':>10} {'ok':>4}")
+    for delay in (float(d) for d in args.delays.split(",")):
+        first_key, ready_at = run_launch(delay)
+        ok = first_key >= ready_at
+        # The old code always slept LAUNCH_DELAY after Popen
+        fixed_ok = automator.LAUNCH_DELAY >= delay
+        print(f"{delay:7.2f} | {ready_at:8.2f} {first_key:8.2f} {first_key - ready_at:7.2f} {'yes' if ok else 'LOST':>4} | "
+              f"{automator.LAUNCH_DELAY:10.2f} {'yes' if fixed_ok else 'LOST':>4}")
+
+
+if __name__ == '__main__':
+    main()
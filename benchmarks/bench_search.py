@@ -0,0 +1,71 @@
+# benchmarks/bench_search.py
+"""'search' latency: first (full) index build vs queries against an up-to-date index.
+
+Builds a throwaway user data dir whose profiles each have a synthetic
+session file (bench_sessions.write_synthetic_session) and Preferences, then
+times search_index.update_index() + search() cold, warm (nothing changed:
+only stat() calls), and after one profile's session file was rewritten.
+Run from the repository root:
+
+    python benchmarks/bench_search.py [--profiles 3] [--tabs 2000] [--size 20M]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_prefs_extract import parse_size
+from bench_profiles import write_user_data_dir
+from bench_sessions import write_synthetic_session
+from vv_wkspace import search_index
+from vv_wkspace import vivaldi_utils
+
+
+def timed_search(db, profiles, query):
+    """Returns (seconds, files re-read, hit count) of one update + query."""
+    start = time.perf_counter()
+    files_read = search_index.update_index(db, profiles)
+    hits = search_index.search(db, query, profiles)
+    return time.perf_counter() - start, files_read, len(hits)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the tab search index.")
+    parser.add_argument("--profiles", type=int, default=3, help="Profiles, each with a session file (default: 3).")
+    parser.add_argument("--tabs", type=int, default=2000, help="Tabs per session (default: 2000).")
+    parser.add_argument("--size", default="20M", help="Approximate session file size (default: 20M).")
+    parser.add_argument("--queries", type=int, default=20, help="Warm queries to time (default: 20).")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as home:
+        os.environ["HOME"] = home
+        os.environ["XDG_CONFIG_HOME"] = os.path.join(home, ".config")
+        user_data_dir = os.path.join(home, "user-data")
+        write_user_data_dir(user_data_dir, args.profiles, 64 * 1024, workspace_count=8)
+        profiles = vivaldi_utils.list_profiles(user_data_dir)
+        for profile in profiles:
+            os.makedirs(os.path.join(profile.path, "Sessions"))
+            write_synthetic_session(os.path.join(profile.path, "Sessions", "Session_1"),
+                                    parse_size(args.size), args.tabs)
+
+        db = search_index.open_index(os.path.join(home, search_index.SEARCH_INDEX_FILENAME))
+        print(f"{len(profiles)} profiles x {args.tabs} tabs, session files ~{args.size}")
+        print(f"{'case':<26} {'ms':>9} {'files read':>11} {'hits':>5}")
+        cold, files_read, hits = timed_search(db, profiles, "page 123")
+        print(f"{'cold (full build)':<26} {cold * 1000:9.1f} {files_read:11d} {hits:5d}")
+        warm = [timed_search(db, profiles, f"page {i}") for i in range(1, args.queries + 1)]
+        print(f"{'warm (median)':<26} {statistics.median(t for t, _, _ in warm) * 1000:9.2f} "
+              f"{sum(f for _, f, _ in warm):11d} {warm[-1][2]:5d}")
+        session_path = os.path.join(profiles[0].path, "Sessions", "Session_1")
+        write_synthetic_session(session_path, parse_size(args.size), args.tabs)
+        changed, files_read, hits = timed_search(db, profiles, "page 123")
+        print(f"{'one session rewritten':<26} {changed * 1000:9.1f} {files_read:11d} {hits:5d}")
+        db.close()
+
+
+if __name__ == '__main__':
+    main()
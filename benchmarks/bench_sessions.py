@@ -0,0 +1,119 @@
+# benchmarks/bench_sessions.py
+"""Session (SNSS) tab inventory: memory-mapped lazy reader vs reading the whole file.
+
+Writes a synthetic Sessions/Session_* file of roughly --size bytes (tabs in a
+few workspaces, each with a navigation history whose page state pads the
+file like real ones do), then times sessions.read_tabs() against decoding
+the same commands from one f.read() of the file, and reports the peak
+Python heap of each (tracemalloc). Both must find the same tabs.
+Run from the repository root:
+
+    python benchmarks/bench_sessions.py [--size 300M] [--tabs 2000]
+"""
+import argparse
+import json
+import os
+import struct
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_prefs_extract import parse_size
+from vv_wkspace import sessions
+
+# Any id sessions.py doesn't decode itself works; it finds ext data by content
+EXT_DATA_COMMAND = 45
+WORKSPACE_IDS = [1700000000000 + i for i in range(8)]
+PAGE_STATE_BYTES = 8 * 1024 # Per navigation; the largest part of real session files
+
+
+def pickle(*fields):
+    """Builds a base::Pickle from ints, bytes (string) and str (string16) fields."""
+    body = b""
+    for field in fields:
+        if isinstance(field, int):
+            body += struct.pack("<i", field)
+        else:
+            data = field if isinstance(field, bytes) else field.encode("utf-16-le")
+            body += struct.pack("<i", len(field)) + data + b"\0" * (-len(data) % 4)
+    return struct.pack("<I", len(body)) + body
+
+
+def command(command_id, payload):
+    return struct.pack("<HB", len(payload) + 1, command_id) + payload
+
+
+def write_synthetic_session(path, size, tab_count):
+    """Writes an SNSS session log; returns {tab id: (url, workspace id)} of the tabs left open."""
+    expected = {}
+    page_state = b"p" * PAGE_STATE_BYTES
+    with open(path, 'wb') as f:
+        f.write(b"SNSS" + struct.pack("<i", 1))
+        for tab_id in range(1, tab_count + 1):
+            workspace_id = WORKSPACE_IDS[tab_id % len(WORKSPACE_IDS)]
+            f.write(command(sessions.CMD_SET_TAB_WINDOW, struct.pack("<ii", 1, tab_id)))
+            f.write(command(sessions.CMD_SET_TAB_INDEX_IN_WINDOW, struct.pack("<ii", tab_id, tab_id)))
+            ext_data = json.dumps({"ext_id": "", "workspaceId": float(workspace_id)}).encode()
+            f.write(command(EXT_DATA_COMMAND, pickle(tab_id, ext_data)))
+        navigations = max(1, (size // tab_count) // (PAGE_STATE_BYTES + 100))
+        for index in range(navigations):
+            for tab_id in range(1, tab_count + 1):
+                url = f"https://example.com/{tab_id}/{index}".encode()
+                f.write(command(sessions.CMD_UPDATE_TAB_NAVIGATION,
+                                pickle(tab_id, index, url, f"Page {tab_id}.{index}", page_state, 0)))
+        for tab_id in range(1, tab_count + 1):
+            f.write(command(sessions.CMD_SET_SELECTED_NAVIGATION_INDEX, struct.pack("<ii", tab_id, navigations - 1)))
+            if tab_id % 10 == 0:
+                f.write(command(sessions.CMD_TAB_CLOSED, struct.pack("<i4xq", tab_id, 0)))
+            else:
+                expected[tab_id] = (f"https://example.com/{tab_id}/{navigations - 1}",
+                                    WORKSPACE_IDS[tab_id % len(WORKSPACE_IDS)])
+    return expected
+
+
+def read_whole_file(path):
+    """Baseline: the same replay over a bytes copy of the whole file."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    return sessions._replay(data, False)
+
+
+def measure(function, path):
+    """Returns (result, seconds, peak heap bytes); timed without tracemalloc, which slows allocation."""
+    start = time.perf_counter()
+    result = function(path)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    function(path)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the SNSS session reader.")
+    parser.add_argument("--size", default="300M", help="Approximate session file size (default: 300M)")
+    parser.add_argument("--tabs", type=int, default=2000, help="Tabs in the session (default: 2000)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "Session_13370000000000000")
+        expected = write_synthetic_session(path, parse_size(args.size), args.tabs)
+        print(f"Session file: {os.path.getsize(path) / 2**20:.0f} MB, {args.tabs} tabs, {len(expected)} open")
+
+        mapped, mapped_time, mapped_peak = measure(lambda p: list(sessions.read_tabs(p)), path)
+        whole, whole_time, whole_peak = measure(read_whole_file, path)
+        found = {tab.tab_id: (tab.url, tab.workspace_id) for tab in mapped}
+        if found != expected or set(whole) != set(expected):
+            print("MISMATCH between the readers and the generated session", file=sys.stderr)
+            sys.exit(1)
+        print(f"{'reader':<22} {'seconds':>8} {'peak heap MB':>13}")
+        print(f"{'mmap, lazy decode':<22} {mapped_time:8.3f} {mapped_peak / 2**20:13.1f}")
+        print(f"{'read whole file':<22} {whole_time:8.3f} {whole_peak / 2**20:13.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+# benchmarks/bench_startup.py
+"""Cold-start benchmark for each subcommand, in the style of `python -X importtime`.
+
+Runs every subcommand in a fresh interpreter with -X importtime, then reports
+the median wall time, the total import time and the heaviest top-level imports.
+Run from the repository root:
+
+    python benchmarks/bench_startup.py [--runs 5] [--top 3]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SUBCOMMANDS = [
+    ["config", "path"],
+    ["setup-info"],
+    ["list"],
+]
+# What 'launch' pays on top of the CLI itself: the automator and the GUI backend
+BACKEND_IMPORT = ("launch (backend import)",
+                  "from vv_wkspace import automator, input_backends; "
+                  "import sys; sys.exit(input_backends.get_backend('pyautogui') is None)")
+
+
+def parse_importtime(stderr):
+    """Returns [(module, cumulative_us)] for top-level imports from -X importtime output."""
+    top_level = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not name.startswith("  "): # Nested imports are indented further
+            top_level.append((name.strip(), int(cumulative)))
+    return top_level
+
+
+def run_once(argv):
+    """Runs one cold interpreter; returns (wall seconds, top-level imports, exit code)."""
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-X", "importtime"] + argv,
+                            cwd=REPO_ROOT, capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+    return elapsed, parse_importtime(result.stderr), result.returncode
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark cold start per subcommand.")
+    parser.add_argument("--runs", type=int, default=5, help="Cold runs per subcommand (median is reported).")
+    parser.add_argument("--top", type=int, default=3, help="Heaviest top-level imports to show.")
+    args = parser.parse_args()
+
+    cases = [(" ".join(sub), ["-m", "vv_wkspace.cli"] + sub) for sub in SUBCOMMANDS]
+    cases.append((BACKEND_IMPORT[0], ["-c", BACKEND_IMPORT[1]]))
+
+    print(f"{'subcommand':<26} {'wall ms':>8} {'imports ms':>11}  heaviest imports")
+    for label, argv in cases:
+        walls, import_totals = [], []
+        top_level = []
+        exit_code = 0
+        for _ in range(args.runs):
+            wall, top_level, exit_code = run_once(argv)
+            walls.append(wall)
+            import_totals.append(sum(us for _, us in top_level))
+        heaviest = sorted(top_level, key=lambda item: item[1], reverse=True)[:args.top]
+        heaviest_text = ", ".join(f"{name} {us / 1000:.1f}ms" for name, us in heaviest)
+        note = f" (exit {exit_code})" if exit_code else ""
+        print(f"{label:<26} {statistics.median(walls) * 1000:8.1f} "
+              f"{statistics.median(import_totals) / 1000:11.1f}  {heaviest_text}{note}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+# benchmarks/bench_window_locator.py
+"""Window lookup cost on a desktop with thousands of windows, using fake windows.
+
+Compares the old approach (enumerate every window and scan titles on each
+activation) with WindowLocator (remembered window revalidated by one title
+read, PID-filtered rescans only when stale). Each window title read and each
+enumeration sleeps a little to mimic the OS calls PyGetWindow makes.
+Run from the repository root:
+
+    python benchmarks/bench_window_locator.py [--windows 5000] [--lookups 50]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vv_wkspace import input_backends
+from vv_wkspace import windows
+
+# Simulated cost of one GetWindowText-style call and one EnumWindows pass per window
+TITLE_READ_COST = 2e-6
+ENUM_COST_PER_WINDOW = 1e-6
+
+
+class SlowFakeWindow(input_backends.FakeWindow):
+    """FakeWindow whose title reads cost time and are counted."""
+    reads = 0
+
+    @property
+    def title(self):
+        SlowFakeWindow.reads += 1
+        end = time.perf_counter() + TITLE_READ_COST
+        while time.perf_counter() < end:
+            pass
+        return self._title
+
+    @title.setter
+    def title(self, value):
+        self._title = value
+
+
+class SlowRecordingBackend(input_backends.RecordingBackend):
+    def get_all_windows(self):
+        time.sleep(ENUM_COST_PER_WINDOW * len(self.windows))
+        return super().get_all_windows()
+
+
+def make_windows(count, vivaldi_pid):
+    """Mostly unrelated windows; another Vivaldi instance and a page mentioning Vivaldi sort first."""
+    result = [SlowFakeWindow("Vivaldi - other profile", pid=vivaldi_pid + 1),
+              SlowFakeWindow("Why I switched to Vivaldi - Firefox", pid=4242)]
+    result += [SlowFakeWindow(f"Terminal {i}", pid=10000 + i) for i in range(count - 3)]
+    result.append(SlowFakeWindow("Inbox - Vivaldi", pid=vivaldi_pid))
+    return result
+
+
+def legacy_find(backend):
+    """The original title-only scan over a fresh enumeration."""
+    target = None
+    for window in backend.get_all_windows():
+        if window.title and "vivaldi" in window.title.lower():
+            if not window.isMinimized:
+                return window
+            elif target is None:
+                target = window
+    return target
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark cached Vivaldi window lookup.")
+    parser.add_argument("--windows", type=int, default=5000, help="Number of fake windows.")
+    parser.add_argument("--lookups", type=int, default=50, help="Activations to simulate.")
+    args = parser.parse_args()
+
+    vivaldi_pid = 777
+    backend = SlowRecordingBackend(make_windows(args.windows, vivaldi_pid))
+
+    SlowFakeWindow.reads = 0
+    start = time.perf_counter()
+    legacy_hits = [legacy_find(backend) for _ in range(args.lookups)]
+    legacy_time = time.perf_counter() - start
+    legacy_reads = SlowFakeWindow.reads
+
+    locator = windows.WindowLocator(backend)
+    SlowFakeWindow.reads = 0
+    start = time.perf_counter()
+    locator_hits = [locator.find({vivaldi_pid}) for _ in range(args.lookups)]
+    locator_time = time.perf_counter() - start
+
+    print(f"{args.windows} windows, {args.lookups} lookups")
+    print(f"  legacy:  {legacy_time / args.lookups * 1000:8.3f} ms/lookup, {legacy_reads} title reads, "
+          f"picked {legacy_hits[0].title!r} (pid {legacy_hits[0].pid})")
+    print(f"  locator: {locator_time / args.lookups * 1000:8.3f} ms/lookup, {SlowFakeWindow.reads} title reads, "
+          f"{locator.full_scans} full scan(s), picked {locator_hits[0].title!r} (pid {locator_hits[0].pid})")
+
+    # The remembered window closes: the locator must notice and rescan once
+    backend.windows.remove(locator.cached_window)
+    backend.windows.append(SlowFakeWindow("New tab - Vivaldi", pid=vivaldi_pid))
+    locator.cached_window.title = "" # Closed handles stop reporting a title
+    window = locator.find({vivaldi_pid})
+    print(f"  after the window closed: picked {window.title!r}, {locator.full_scans} full scan(s) total")
+
+
+if __name__ == '__main__':
+    main()
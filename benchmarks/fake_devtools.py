@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+# benchmarks/fake_devtools.py
+"""Stand-in for Vivaldi's DevTools endpoint, for benchmarks and manual testing.
+
+Serves what the "devtools" transport uses: GET /json/version and /json/list
+(one Vivaldi UI page target) and a WebSocket on that target answering
+Runtime.evaluate for the expressions vv_wkspace.devtools sends. It can't run
+JavaScript, so it recognizes those expressions and applies them to a model
+of the window's tabs (a few tabs per workspace, each with vivExtData naming
+its workspaceId). Used in-process by benchmarks, and started by
+fake_vivaldi.py when it gets --remote-debugging-port. Standalone:
+
+    python benchmarks/fake_devtools.py [--port 9222] [--workspaces 1,2,3]
+"""
+import argparse
+import asyncio
+import base64
+import hashlib
+import json
+import os
+import struct
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vv_wkspace import devtools
+
+UI_TARGET_ID = "FAKEVIVALDIUI"
+TABS_PER_WORKSPACE = 3
+
+
+class FakeDevTools:
+    """The tab model plus an asyncio server; run it in a thread with start()."""
+
+    def __init__(self, workspace_ids, latency=0.0):
+        self.latency = latency # Simulated per-call browser time
+        self.connections = 0
+        self.calls = 0
+        self.tabs = []
+        for workspace_id in workspace_ids:
+            for _ in range(TABS_PER_WORKSPACE):
+                self.tabs.append({"id": len(self.tabs) + 1, "index": len(self.tabs), "windowId": 1,
+                                  "active": False, "lastAccessed": 0,
+                                  "vivExtData": json.dumps({"workspaceId": workspace_id})})
+        if self.tabs:
+            self._activate(self.tabs[0])
+        self.port = None
+        self._loop = None
+
+    def active_tab(self):
+        return next(tab for tab in self.tabs if tab["active"])
+
+    @staticmethod
+    def workspace_of(tab):
+        return json.loads(tab["vivExtData"]).get("workspaceId")
+
+    def _activate(self, tab):
+        for other in self.tabs:
+            other["active"] = other is tab
+        tab["lastAccessed"] = time.time() * 1000
+
+    def _switch(self, workspace_id):
+        tabs = [tab for tab in self.tabs if self.workspace_of(tab) == workspace_id]
+        if not tabs:
+            return {"error": "workspace has no tabs in this window"}
+        target = max(tabs, key=lambda tab: tab["lastAccessed"])
+        self._activate(target)
+        return {"tabId": target["id"]}
+
+    def _next_tab(self):
+        active = self.active_tab()
+        tabs = [tab for tab in self.tabs if self.workspace_of(tab) == self.workspace_of(active)]
+        target = tabs[(tabs.index(active) + 1) % len(tabs)]
+        self._activate(target)
+        return {"tabId": target["id"]}
+
+    def evaluate(self, expression):
+        """Returns the Runtime.evaluate result for one of the client's expressions."""
+        switch_prefix = f"({devtools.SWITCH_WORKSPACE_JS})("
+        if expression.startswith(switch_prefix):
+            value = self._switch(json.loads(expression[len(switch_prefix):-1]))
+        elif expression == f"({devtools.NEXT_TAB_JS})()":
+            value = self._next_tab()
+        else:
+            return {"result": {"type": "undefined"},
+                    "exceptionDetails": {"text": "Uncaught", "exception": {"description": "fake DevTools: unknown expression"}}}
+        return {"result": {"type": "object", "value": value}}
+
+    # --- Protocol ---
+
+    def _targets(self):
+        return [{"id": UI_TARGET_ID, "type": "page", "title": "Vivaldi",
+                 "url": devtools.VIVALDI_UI_URL_PREFIX,
+                 "webSocketDebuggerUrl": f"ws://127.0.0.1:{self.port}/devtools/page/{UI_TARGET_ID}"}]
+
+    async def _handle(self, reader, writer):
+        try:
+            request = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1").split("\r\n")
+            path = request[0].split()[1]
+            headers = {name.strip().lower(): value.strip()
+                       for name, _, value in (line.partition(":") for line in request[1:] if line)}
+            if headers.get("upgrade", "").lower() == "websocket" and path == f"/devtools/page/{UI_TARGET_ID}":
+                await self._serve_websocket(reader, writer, headers["sec-websocket-key"])
+                return
+            if path == "/json/version":
+                body = {"Browser": "Vivaldi/fake", "Protocol-Version": "1.3"}
+            elif path in ("/json", "/json/list"):
+                body = self._targets()
+            else:
+                writer.write(b"HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\n\r\n")
+                return
+            data = json.dumps(body).encode()
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/json; charset=UTF-8\r\n"
+                         b"Content-Length: %d\r\n\r\n%s" % (len(data), data))
+            await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, IndexError, KeyError):
+            pass
+        finally:
+            writer.close()
+
+    async def _send(self, writer, opcode, payload):
+        length = len(payload)
+        if length < 126:
+            header = struct.pack("!BB", 0x80 | opcode, length)
+        elif length < 1 << 16:
+            header = struct.pack("!BBH", 0x80 | opcode, 126, length)
+        else:
+            header = struct.pack("!BBQ", 0x80 | opcode, 127, length)
+        writer.write(header + payload) # Server frames are not masked
+        await writer.drain()
+
+    async def _serve_websocket(self, reader, writer, key):
+        accept = base64.b64encode(hashlib.sha1((key + devtools.WS_GUID).encode()).digest())
+        writer.write(b"HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                     b"Sec-WebSocket-Accept: " + accept + b"\r\n\r\n")
+        await writer.drain()
+        self.connections += 1
+        while True:
+            head = await reader.readexactly(2)
+            opcode, length = head[0] & 0x0F, head[1] & 0x7F
+            if length == 126:
+                length = struct.unpack("!H", await reader.readexactly(2))[0]
+            elif length == 127:
+                length = struct.unpack("!Q", await reader.readexactly(8))[0]
+            mask = await reader.readexactly(4)
+            payload = devtools._mask(await reader.readexactly(length), mask)
+            if opcode == 0x8:
+                await self._send(writer, 0x8, payload[:2])
+                return
+            if opcode != 0x1:
+                continue
+            message = json.loads(payload)
+            self.calls += 1
+            if self.latency:
+                await asyncio.sleep(self.latency)
+            if message.get("method") == "Runtime.evaluate":
+                response = {"id": message["id"], "result": self.evaluate(message["params"]["expression"])}
+            else:
+                response = {"id": message["id"], "error": {"code": -32601, "message": f"'{message.get('method')}' wasn't found"}}
+            await self._send(writer, 0x1, json.dumps(response).encode())
+
+    # --- Running ---
+
+    async def serve(self, port=0):
+        server = await asyncio.start_server(self._handle, "127.0.0.1", port)
+        self.port = server.sockets[0].getsockname()[1]
+        return server
+
+    def start(self, port=0):
+        """Serves from a daemon thread; returns the port once listening."""
+        ready = threading.Event()
+
+        def run():
+            self._loop = asyncio.new_event_loop()
+            self._loop.run_until_complete(self.serve(port))
+            ready.set()
+            self._loop.run_forever()
+
+        threading.Thread(target=run, daemon=True).start()
+        ready.wait()
+        return self.port
+
+
+def workspace_ids_from_user_data_dir(user_data_dir):
+    """Workspace ids from the Default profile's Preferences (for fake_vivaldi.py)."""
+    from vv_wkspace import vivaldi_utils
+    records = vivaldi_utils._read_workspace_records(os.path.join(user_data_dir, "Default", "Preferences")) or []
+    return [record["id"] for record in records if record.get("id") is not None]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake Vivaldi DevTools endpoint.")
+    parser.add_argument("--port", type=int, default=devtools.DEFAULT_PORT)
+    parser.add_argument("--workspaces", default="1,2,3", help="Comma-separated workspace ids (default: 1,2,3)")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds to wait before each response.")
+    args = parser.parse_args()
+    fake = FakeDevTools([int(w) for w in args.workspaces.split(",")], args.latency)
+    loop = asyncio.new_event_loop()
+    loop.run_until_complete(fake.serve(args.port))
+    print(f"DevTools listening on ws://127.0.0.1:{fake.port}/devtools/page/{UI_TARGET_ID}", file=sys.stderr)
+    try:
+        loop.run_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# benchmarks/fake_vivaldi.py
+"""Stand-in Vivaldi executable for benchmarks and manual testing.
+
+Behaves like the parts of Vivaldi the CLI observes: after FAKE_VIVALDI_DELAY
+seconds it creates SingletonLock (symlink to 'hostname-pid'), SingletonSocket
+and lockfile in the user data dir, stays alive for FAKE_VIVALDI_LIFETIME
+seconds (or until SIGTERM), then removes them. If a live instance already
+holds the lock it exits 0 at once, like a real browser handing off.
+
+User data dir: --user-data-dir=..., else $FAKE_VIVALDI_USER_DATA_DIR, else the
+default Linux location (~/.config/vivaldi). Start/ready/exit events are
+appended as JSON lines to $FAKE_VIVALDI_LOG if set. With
+--remote-debugging-port=N it also serves a fake DevTools endpoint
+(fake_devtools.py) on that port, with the Default profile's workspaces.
+"""
+import json
+import os
+import signal
+import socket
+import sys
+import time
+
+SINGLETON_FILES = ("SingletonLock", "SingletonSocket", "lockfile")
+
+
+def log_event(event, **fields):
+    log_path = os.getenv("FAKE_VIVALDI_LOG")
+    if log_path:
+        with open(log_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(dict(event=event, pid=os.getpid(), t=time.monotonic(), **fields)) + "\n")
+
+
+def parse_user_data_dir(argv):
+    for arg in argv:
+        if arg.startswith("--user-data-dir="):
+            return os.path.expanduser(arg.split("=", 1)[1])
+    return os.getenv("FAKE_VIVALDI_USER_DATA_DIR") or os.path.join(os.path.expanduser("~"), ".config", "vivaldi")
+
+
+def running_pid(user_data_dir):
+    """Returns the PID holding the lock if that process is alive."""
+    try:
+        target = os.readlink(os.path.join(user_data_dir, "SingletonLock"))
+        pid = int(target.rsplit("-", 1)[1])
+        os.kill(pid, 0)
+        return pid
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def parse_debugging_port(argv):
+    for arg in argv:
+        if arg.startswith("--remote-debugging-port="):
+            return int(arg.split("=", 1)[1])
+    return None
+
+
+def remove_artifacts(user_data_dir):
+    for name in SINGLETON_FILES:
+        try:
+            os.remove(os.path.join(user_data_dir, name))
+        except OSError:
+            pass
+
+
+def main():
+    user_data_dir = parse_user_data_dir(sys.argv[1:])
+    delay = float(os.getenv("FAKE_VIVALDI_DELAY", "0.5"))
+    lifetime = float(os.getenv("FAKE_VIVALDI_LIFETIME", "30"))
+    log_event("start", argv=sys.argv[1:], user_data_dir=user_data_dir)
+
+    other = running_pid(user_data_dir)
+    if other:
+        log_event("handoff", to=other)
+        return 0
+
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    time.sleep(delay)
+    os.makedirs(user_data_dir, exist_ok=True)
+    remove_artifacts(user_data_dir) # Stale files from a killed instance
+    os.symlink(f"{socket.gethostname()}-{os.getpid()}", os.path.join(user_data_dir, "SingletonLock"))
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(os.path.join(user_data_dir, "SingletonSocket"))
+    open(os.path.join(user_data_dir, "lockfile"), 'w').close()
+    port = parse_debugging_port(sys.argv[1:])
+    if port is not None:
+        import fake_devtools
+        fake = fake_devtools.FakeDevTools(fake_devtools.workspace_ids_from_user_data_dir(user_data_dir))
+        fake.start(port)
+        log_event("devtools", port=port)
+    log_event("ready")
+    try:
+        time.sleep(lifetime)
+    finally:
+        server.close()
+        remove_artifacts(user_data_dir)
+        log_event("exit")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,102 @@
+# src/vivaldi_workspace_cli/actions.py
+import collections
+import sys
+
+from . import config
+from . import input_backends
+
+# One step of a batched run. `arg` is the workspace name, key tuple,
+# seconds to wait, or (condition, timeout) depending on `kind`.
+Action = collections.namedtuple("Action", ["kind", "arg", "source"])
+
+# Conditions understood by 'wait-for' and their default timeout in seconds
+WAIT_CONDITIONS = {"ready": 15.0, "window": 5.0}
+
+SCRIPT_HELP = """Action script format (one action per line, '#' starts a comment):
+  switch <workspace name>     send the workspace's shortcut from the config
+  next-tab                    send the 'Next Tab' shortcut (ctrl+tab)
+  shortcut <keys>             send any shortcut, e.g. 'ctrl+shift+t'
+  wait <seconds>              sleep
+  wait-for ready|window [s]   wait until Vivaldi runs / has a window (optional timeout)"""
+
+def actions_for_workspaces(workspace_names):
+    """Builds the classic 'switch then next tab' sequence for each workspace, in order."""
+    actions = []
+    for name in workspace_names:
+        actions.append(Action("switch", name, f"switch {name}"))
+        actions.append(Action("next-tab", None, "next-tab"))
+    return actions
+
+def parse_script(text, source_name="<script>", backend_name=None, settings=None):
+    """Parses an action script. Returns a list of Actions, or None if any line is invalid.
+
+    Shortcuts are checked against the key names of the backend that will send
+    them: `backend_name`, else the environment, else the config's `settings`.
+    """
+    key_names = input_backends.get_key_names(backend_name, settings)
+    actions = []
+    has_errors = False
+    for line_no, raw_line in enumerate(text.splitlines(), start=1):
+        line = raw_line.strip()
+        if not line or line.startswith('#'):
+            continue
+        kind, _, rest = line.partition(' ')
+        kind = kind.lower()
+        rest = rest.strip()
+        error = None
+
+        if kind == "switch":
+            if rest:
+                actions.append(Action("switch", rest, line))
+            else:
+                error = "'switch' needs a workspace name"
+        elif kind == "next-tab":
+            actions.append(Action("next-tab", None, line))
+        elif kind == "shortcut":
+            try:
+                # Validated now, like config shortcuts, rather than failing at send time
+                actions.append(Action("shortcut", config.parse_shortcut(rest, key_names), line))
+            except ValueError as e:
+                error = f"'shortcut' needs keys like 'ctrl+alt+1' ({e})"
+        elif kind == "wait":
+            try:
+                seconds = float(rest)
+                if seconds < 0:
+                    raise ValueError
+                actions.append(Action("wait", seconds, line))
+            except ValueError:
+                error = "'wait' needs a non-negative number of seconds"
+        elif kind == "wait-for":
+            parts = rest.split()
+            condition = parts[0].lower() if parts else ""
+            if condition not in WAIT_CONDITIONS or len(parts) > 2:
+                error = f"'wait-for' needs one of: {', '.join(WAIT_CONDITIONS)} (optionally a timeout)"
+            else:
+                try:
+                    timeout = float(parts[1]) if len(parts) == 2 else WAIT_CONDITIONS[condition]
+                    actions.append(Action("wait-for", (condition, timeout), line))
+                except ValueError:
+                    error = "'wait-for' timeout must be a number of seconds"
+        else:
+            error = f"unknown action '{kind}'"
+
+        if error:
+            print(f"ERROR: {source_name}:{line_no}: {error}", file=sys.stderr)
+            has_errors = True
+
+    return None if has_errors else actions
+
+def read_script(path, backend_name=None, settings=None):
+    """Reads and parses an action script file ('-' for stdin). Returns Actions or None."""
+    try:
+        if path == '-':
+            return parse_script(sys.stdin.read(), "<stdin>", backend_name, settings)
+        with open(path, 'r', encoding='utf-8') as f:
+            return parse_script(f.read(), path, backend_name, settings)
+    except OSError as e:
+        print(f"ERROR: Could not read action script '{path}': {e}", file=sys.stderr)
+        return None
+
+def format_script(actions):
+    """Turns Actions back into script text (e.g. to hand them to the daemon)."""
+    return "\n".join(action.source for action in actions) + "\n"
@@ -1,103 +1,254 @@
 # src/vivaldi_workspace_cli/automator.py
+import collections
+import concurrent.futures
 import subprocess
 import platform
 import os
+import queue
+import threading
 import time
 import sys
-try:
-    import pyautogui
-    # Configure PyAutoGUI pauses (optional but can help stability)
-    # pyautogui.PAUSE = 0.1 # Pause between all pyautogui calls
-    # pyautogui.FAILSAFE = True # Move mouse to corner to abort
-except ImportError:
-    print("ERROR: PyAutoGUI library not found.", file=sys.stderr)
-    print("Please install it: pip install PyAutoGUI", file=sys.stderr)
-    print("You might also need OS dependencies (see README/setup-info).", file=sys.stderr)
-    sys.exit(1)
-except Exception as e:
-     # Catch other potential pyautogui import errors (e.g., display issues on Linux)
-     print(f"ERROR: Failed to import or initialize PyAutoGUI: {e}", file=sys.stderr)
-     print("Ensure you have a graphical environment and necessary OS dependencies.", file=sys.stderr)
-     sys.exit(1)
-
-
-# Delay in seconds to wait for Vivaldi to launch before sending FIRST shortcut
-LAUNCH_DELAY = 2.5 # User might want this configurable later
+
+from . import actions
+from . import config
+from . import delay_stats
+from . import input_backends
+from . import tracing
+from . import vivaldi_utils
+from . import windows
+
+# Fixed wait after launching Vivaldi, only used when no readiness signal can be observed
+LAUNCH_DELAY = 2.5
+# Hard limit for waiting on a freshly started Vivaldi to become ready
+LAUNCH_TIMEOUT = 15.0
+# Readiness polling starts at READY_POLL_INITIAL seconds and doubles up to READY_POLL_MAX
+READY_POLL_INITIAL = 0.05
+READY_POLL_MAX = 0.5
+# Grace period after the profile lock appears when windows can't be enumerated to confirm the UI
+READY_SETTLE_DELAY = 0.5
+# How often launch() checks for the profile lock to time Vivaldi's boot (see _watch_profile_lock)
+LOCK_WATCH_INTERVAL = 0.01
 # Short delay between sending workspace switch and next tab shortcut
 SWITCH_DELAY = 0.3 # User might want this configurable later
+# Fixed wait after activating a window, only used when the backend can't report focus
+ACTIVATION_SETTLE_DELAY = 0.3
+# The three delays above are defaults: with enough observed timings (delay_stats.py)
+# the measured ones are used instead, unless the config sets "adaptive_delays": false
+# How often the active window title is checked while a workspace switch settles
+SWITCH_POLL_INTERVAL = 0.01
+# calibrate: workspaces cycled through, and how long one switch may take before it counts as missed
+CALIBRATE_WORKSPACES = 3
+CALIBRATE_TIMEOUT = 3.0
+# Switch verification: poll the window title with backoff for up to
+# VERIFY_TIMEOUT per attempt, and re-send at most SWITCH_RETRIES times
+VERIFY_TIMEOUT = 1.0
+VERIFY_POLL_INITIAL = 0.01
+VERIFY_POLL_MAX = 0.02
+SWITCH_RETRIES = 2
+
+# How actions reach Vivaldi: synthesized key presses, or the DevTools protocol (devtools.py)
+TRANSPORTS = ("keyboard", "devtools")
+DEFAULT_TRANSPORT = "keyboard"
+
+# Environment override for the Vivaldi executable path
+VIVALDI_EXE_ENV_VAR = "VV_WKSPACE_VIVALDI"
+# Last resolved executable, reused while PATH and the binary itself are unchanged
+EXE_CACHE_FILENAME = "vivaldi_exe.json"
+
+# What spawn_vivaldi() found or started. `process` is None when attached to a
+# running instance; `spawned_at` is the time.monotonic() of the spawn.
+VivaldiStart = collections.namedtuple("VivaldiStart", ["description", "pid", "process", "user_data_dir", "spawned_at",
+                                                     "locks_before"])
+
+# One window for launch_many(): a vivaldi_utils.Profile inside `user_data_dir`,
+# and the workspaces to switch to in it, in order
+LaunchEntry = collections.namedtuple("LaunchEntry", ["user_data_dir", "profile", "workspaces"])
 
 # --- Vivaldi Executable Finder ---
-def find_vivaldi_executable():
-    """Tries to find the Vivaldi executable path."""
+def _resolve_vivaldi_executable():
+    """Searches well-known install locations and PATH for Vivaldi, in-process."""
+    import shutil # Only needed on a cache miss; shutil.which scans PATH without a child process
     system = platform.system()
-    # Use platform-specific commands first if available
-    try:
-        if system == "Windows":
-             # 'where' is more reliable on Windows for finding executables in PATH
-             result = subprocess.run(['where', 'vivaldi'], capture_output=True, text=True, check=True, shell=True)
-             paths = result.stdout.strip().split('\n')
-             for path in paths:
-                 if path and os.path.exists(path.strip()) and path.strip().lower().endswith("vivaldi.exe"):
-                      return path.strip()
-        elif system == "Darwin":
-            # Check default path first
-             default_path = "/Applications/Vivaldi.app/Contents/MacOS/Vivaldi"
-             if os.path.exists(default_path): return default_path
-             # Fallback to 'which'
-             result = subprocess.run(['which', 'vivaldi'], capture_output=True, text=True, check=True)
-             path = result.stdout.strip()
-             if path and os.path.exists(path): return path
-        else: # Linux
-             # Check common paths first
-             common_paths = ["/usr/bin/vivaldi-stable", "/usr/bin/vivaldi", "/snap/bin/vivaldi", "/opt/vivaldi/vivaldi"]
-             for path in common_paths:
-                 if path and os.path.exists(path): return path
-             # Fallback to 'which'
-             result = subprocess.run(['which', 'vivaldi'], capture_output=True, text=True, check=True)
-             path = result.stdout.strip()
-             if path and os.path.exists(path): return path
-
-    except (FileNotFoundError, subprocess.CalledProcessError):
-        # which/where not found or vivaldi not found via them
-        pass # Proceed to checking hardcoded paths if needed
-
-    # If 'which'/'where' failed, check hardcoded paths (redundant for Linux/Mac if common_paths checked)
     if system == "Windows":
+        path = shutil.which('vivaldi')
+        if path and path.lower().endswith("vivaldi.exe"):
+            return path
         possible_paths = [
             os.path.join(os.getenv('LOCALAPPDATA', ''), 'Vivaldi\\Application\\vivaldi.exe'),
             os.path.join(os.getenv('ProgramFiles', ''), 'Vivaldi\\Application\\vivaldi.exe'),
             os.path.join(os.getenv('ProgramFiles(x86)', ''), 'Vivaldi\\Application\\vivaldi.exe')
         ]
-        for path in possible_paths:
-            if path and os.path.exists(path): return path
+    elif system == "Darwin":
+        # Check default path first, then PATH
+        possible_paths = ["/Applications/Vivaldi.app/Contents/MacOS/Vivaldi"]
+        possible_paths.append(shutil.which('vivaldi'))
+    else: # Linux
+        # Check common paths first, then PATH
+        possible_paths = ["/usr/bin/vivaldi-stable", "/usr/bin/vivaldi", "/snap/bin/vivaldi", "/opt/vivaldi/vivaldi"]
+        possible_paths += [shutil.which('vivaldi'), shutil.which('vivaldi-stable')]
 
-    # If still not found
+    for path in possible_paths:
+        if path and os.path.isfile(path):
+            return path
     return None
 
+def find_vivaldi_executable(override=None):
+    """Tries to find the Vivaldi executable path.
+
+    An explicit path ($VV_WKSPACE_VIVALDI, then `override` from the config's
+    'vivaldi_path') wins. Otherwise the last resolution is reused if PATH is
+    the same and one stat shows the binary unchanged; only then do we search.
+    """
+    explicit_path = os.getenv(VIVALDI_EXE_ENV_VAR) or override
+    if explicit_path:
+        explicit_path = os.path.expanduser(explicit_path)
+        if os.path.isfile(explicit_path):
+            return explicit_path
+        print(f"ERROR: Configured Vivaldi executable '{explicit_path}' does not exist.", file=sys.stderr)
+        return None
+
+    path_env = os.getenv('PATH', '')
+    cached = config.read_state_file(EXE_CACHE_FILENAME)
+    if isinstance(cached, dict) and cached.get("PATH") == path_env and isinstance(cached.get("path"), str) \
+            and config.file_identity(cached["path"]) == cached.get("identity"):
+        return cached["path"]
+
+    path = _resolve_vivaldi_executable()
+    if path:
+        config.write_state_file(EXE_CACHE_FILENAME,
+                                {"path": path, "PATH": path_env, "identity": config.file_identity(path)})
+    return path
+
+
+# One WindowLocator per backend, so a long-running process (serve) keeps the
+# last matched Vivaldi window instead of enumerating all windows every time.
+_window_locators = {}
+
+def get_window_locator(backend):
+    """Returns the (cached) WindowLocator for a backend."""
+    locator = _window_locators.get(id(backend))
+    if locator is None or locator.backend is not backend:
+        locator = _window_locators[id(backend)] = windows.WindowLocator(backend)
+    return locator
+
+
+def list_vivaldi_windows(backend):
+    """The Vivaldi windows open now (empty if the backend can't list windows)."""
+    if backend is None or not backend.supports_windows:
+        return []
+    try:
+        return [window for window in backend.get_all_windows() if windows.looks_like_vivaldi(window)]
+    except Exception:
+        return []
+
+
+def find_new_window(backend, pids, windows_before=()):
+    """The Vivaldi window owned by `pids` that isn't in `windows_before` (best match), or None.
+
+    Windows of other processes never match (another Vivaldi instance is not
+    the one we started); one whose owner the backend can't tell does. Scans
+    without the shared WindowLocator, so launch-many's start threads don't
+    replace the window the input thread is working with.
+    """
+    window, _ = windows.pick_vivaldi_window(backend.get_all_windows(), backend, pids, windows_before, owned_only=True)
+    return window
+
 
-def activate_vivaldi_window():
-    """Tries to find and activate a Vivaldi window using PyAutoGUI (best effort)."""
+def _profile_locked(user_data_dir, locks_before):
+    """Whether a live Vivaldi holds the profile lock (see wait_for_vivaldi_ready)."""
+    if vivaldi_utils.find_running_instance(user_data_dir):
+        return True
+    if os.path.islink(os.path.join(user_data_dir, "SingletonLock")):
+        return False # Names a process that is gone: left by a crash, not ours yet
+    # No symlink to read the owner from (Windows): trust only lock files created or changed since the spawn
+    state = vivaldi_utils.singleton_lock_state(user_data_dir)
+    if locks_before is None:
+        return any(identity is not None for identity in state)
+    return any(identity is not None and identity != before for identity, before in zip(state, locks_before))
+
+
+def wait_for_vivaldi_ready(process, user_data_dir, backend, timeout=LAUNCH_TIMEOUT, stats=None, locks_before=None,
+                           windows_before=()):
+    """Polls readiness signals with exponential backoff until Vivaldi is up or `timeout` passes.
+
+    Signals: the launched process is still alive (or exited 0 after handing off to
+    a running instance), a live Vivaldi holds the profile's singleton lock, and a
+    window matching the Vivaldi title heuristic is listed. The lock's owner is read
+    from the SingletonLock symlink; where there is none, lock files only count if
+    they differ from `locks_before` (vivaldi_utils.singleton_lock_state() taken
+    before spawning), so a stale lock never does. Windows in `windows_before`
+    don't count: when the launcher hands a profile to a running instance, only
+    the window it opens for it does. With no backend (DevTools transport,
+    which checks the UI itself) the lock alone counts. Returns True once ready.
+
+    With `stats` (a delay_stats.DelayStats), the observed lock-to-window time is
+    recorded, and the settle wait used when windows can't be listed comes from it.
+    """
+    start = time.monotonic()
+    deadline = start + timeout
+    interval = READY_POLL_INITIAL
+    lock_seen = False
+    lock_seen_at = None
+    can_list_windows = backend is not None and backend.supports_windows
+
+    if not user_data_dir:
+        print(f"  No profile directory to watch for lock files; waiting {LAUNCH_DELAY}s instead.")
+        time.sleep(LAUNCH_DELAY)
+        return True
+
+    while True:
+        exit_code = process.poll()
+        if exit_code is not None and exit_code != 0:
+            print(f"ERROR: Vivaldi exited with code {exit_code} during startup.", file=sys.stderr)
+            return False
+
+        if not lock_seen:
+            lock_seen = _profile_locked(user_data_dir, locks_before)
+            lock_seen_at = time.monotonic() if lock_seen else None
+        if lock_seen:
+            if backend is None:
+                print(f"  Vivaldi profile is locked after {time.monotonic() - start:.2f}s.")
+                return True
+            if can_list_windows:
+                try:
+                    # After a handoff the new window belongs to the instance holding the lock
+                    pids = {process.pid, vivaldi_utils.find_running_instance(user_data_dir)} - {None}
+                    if find_new_window(backend, pids, windows_before) is not None:
+                        now = time.monotonic()
+                        if stats is not None and now - lock_seen_at > 0.001:
+                            # Only when the lock showed up on an earlier poll; this is an upper bound
+                            stats.add("ready_settle", now - lock_seen_at)
+                        print(f"  Vivaldi window is up after {now - start:.2f}s.")
+                        return True
+                except Exception:
+                    can_list_windows = False # Fall back to the lock + settle signal
+            if not can_list_windows:
+                time.sleep(stats.delay("ready_settle", READY_SETTLE_DELAY) if stats is not None else READY_SETTLE_DELAY)
+                print(f"  Vivaldi profile is locked after {time.monotonic() - start:.2f}s.")
+                return True
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            print(f"Warning: Vivaldi did not report ready within {timeout}s.")
+            return False
+        time.sleep(min(interval, remaining))
+        interval = min(interval * 2, READY_POLL_MAX)
+
+
+def activate_vivaldi_window(backend, pid=None, stats=None):
+    """Tries to find and activate a Vivaldi window via the input backend (best effort).
+
+    Windows owned by `pid` (the process we launched or attached to) are preferred.
+    With `stats`, the time until the window reports focus is recorded, and the
+    fixed wait used when focus can't be observed comes from it.
+    """
     print("Attempting to activate Vivaldi window (best effort)...")
     system = platform.system()
     try:
-        # PyAutoGUI window finding is basic and OS-dependent title matching.
-        # Vivaldi's title might change based on active tab or profile.
-        # Try common patterns.
-        possible_titles = ["Vivaldi"]
-        # Add profile name if easily accessible? Hard to do reliably here.
-        # Maybe get active window title and check if 'Vivaldi' is in it?
-
-        target_window = None
-        all_windows = pyautogui.getAllWindows()
-        for window in all_windows:
-            # Case-insensitive check
-            if window.title and "vivaldi" in window.title.lower():
-                # Prioritize non-minimized windows if possible
-                if hasattr(window, 'isMinimized') and not window.isMinimized:
-                    target_window = window
-                    break
-                elif target_window is None: # Keep first match if all are minimized/unknown
-                    target_window = window
+        # The locator matches Vivaldi windows by title, narrowed to `pid` where
+        # the backend reports window owners, and caches the match.
+        locator = get_window_locator(backend)
+        target_window = locator.find({pid} if pid else None)
 
         if target_window:
             print(f"Found potential Vivaldi window: '{target_window.title}'. Activating...")
@@ -118,12 +269,22 @@ def activate_vivaldi_window():
                      print("  No standard activation method found for this window object.")
                      return False # Indicate failure
 
-                 time.sleep(0.3) # Wait a bit after trying to activate
-                 # Verify? Hard to do reliably. Assume it worked for now.
-                 print("  Activation attempted.")
-                 return True
+                 activated_at = time.monotonic()
+                 focused = locator.wait_for_focus(target_window)
+                 if focused is None:
+                     # Can't observe focus on this platform; wait a bit like before
+                     time.sleep(stats.delay("activation", ACTIVATION_SETTLE_DELAY) if stats is not None else ACTIVATION_SETTLE_DELAY)
+                     print("  Activation attempted.")
+                 elif focused:
+                     if stats is not None:
+                         stats.add("activation", time.monotonic() - activated_at)
+                     print("  Window is focused.")
+                 else:
+                     print(f"  Warning: Window did not report focus within {windows.FOCUS_TIMEOUT}s.")
+                 return focused is not False
 
             except Exception as activate_err:
+                 locator.forget()
                  print(f"  Warning: Error during window activation attempt: {activate_err}")
                  return False # Activation likely failed
         else:
@@ -134,86 +295,739 @@ def activate_vivaldi_window():
         return False
 
 
-def send_shortcut(shortcut_str):
-     """Sends a keyboard shortcut using pyautogui."""
-     # Expects format like "ctrl+alt+1" or "command+shift+k"
-     keys = [key.strip() for key in shortcut_str.lower().split('+')]
-     print(f"Sending shortcut via PyAutoGUI: {keys}")
+def send_shortcut(shortcut, backend):
+     """Sends a keyboard shortcut using the input backend.
+
+     `shortcut` is a pre-split key tuple from the compiled config, or a string
+     like "ctrl+alt+1" / "command+shift+k" that is split here.
+     """
+     keys = list(shortcut) if isinstance(shortcut, tuple) else [key.strip() for key in shortcut.lower().split('+')]
+     shortcut_str = "+".join(keys)
+     print(f"Sending shortcut via {backend.name}: {keys}")
      try:
          # Use press() for single keys, hotkey() for combinations
-         if len(keys) == 1:
-             pyautogui.press(keys[0])
-         else:
-             pyautogui.hotkey(*keys) # Unpack keys into hotkey arguments
+         with tracing.span("input.send_keys", keys=shortcut_str):
+             if len(keys) == 1:
+                 backend.press(keys[0])
+             else:
+                 backend.hotkey(*keys) # Unpack keys into hotkey arguments
          print("Shortcut sent.")
          return True
      except Exception as e:
-          print(f"ERROR sending shortcut '{shortcut_str}' via PyAutoGUI: {e}", file=sys.stderr)
+          print(f"ERROR sending shortcut '{shortcut_str}' via {backend.name}: {e}", file=sys.stderr)
           # Common issue: KeyNotFoundException if key name is wrong
           if "KeyNotFoundException" in str(e):
               print("      Check key names against PyAutoGUI documentation!", file=sys.stderr)
           return False
 
-# --- Main Automation Action ---
-def launch_switch_and_next_tab(workspace_name, shortcut_map):
-    """Launches Vivaldi and uses pyautogui to send shortcuts."""
-
-    vivaldi_exe = find_vivaldi_executable()
-    if not vivaldi_exe:
-        print("ERROR: Vivaldi executable not found.", file=sys.stderr)
-        return False
-
-    workspace_shortcut_str = shortcut_map.get(workspace_name)
-    if not workspace_shortcut_str:
-        print(f"ERROR: Shortcut for workspace '{workspace_name}' not found in config file.", file=sys.stderr)
-        return False
-
-    # Define Next Tab shortcut (PyAutoGUI uses lowercase key names)
+def _next_tab_shortcut():
+    """Returns the 'Next Tab' shortcut for this platform (PyAutoGUI key names)."""
     system = platform.system()
     if system == "Darwin":
         # macOS convention - 'command' might map to 'cmd' in pyautogui
         # Ctrl+Tab is often secondary binding
-        next_tab_shortcut_str = "ctrl+tab" # Test if this works, or try specific key code if needed
+        return "ctrl+tab" # Test if this works, or try specific key code if needed
     else: # Linux/Windows default
-        next_tab_shortcut_str = "ctrl+tab" # Or 'ctrl+pagedown'
+        return "ctrl+tab" # Or 'ctrl+pagedown'
+
+NEXT_TAB_KEYS = config.parse_shortcut(_next_tab_shortcut())
 
-    print(f"\nAttempting to launch Vivaldi and switch to '{workspace_name}'...")
+
+def _poll_until(check, timeout):
+    """Calls `check` with exponential backoff until it returns True or `timeout` passes."""
+    deadline = time.monotonic() + timeout
+    interval = READY_POLL_INITIAL
+    while True:
+        if check():
+            return True
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        time.sleep(min(interval, remaining))
+        interval = min(interval * 2, READY_POLL_MAX)
+
+
+def active_window_title(backend):
+    """Title of the active window, or None if the backend can't tell."""
+    if not backend.supports_focus_check:
+        return None
     try:
-        process = subprocess.Popen([vivaldi_exe])
-        print(f"Vivaldi process started. Waiting {LAUNCH_DELAY} seconds...")
+        return getattr(backend.get_active_window(), "title", None)
+    except Exception:
+        return None
+
+
+def wait_for_switch(backend, title_before, switched_at, timeout):
+    """Waits until the active window title differs from `title_before`, or until `timeout` after `switched_at`.
+
+    Vivaldi titles its window after the active tab, which a workspace switch
+    changes. Returns the seconds from `switched_at` to the change, or None if
+    it wasn't observed (no title to compare, or the deadline passed).
+    """
+    deadline = switched_at + timeout
+    while True:
+        now = time.monotonic()
+        if title_before is not None:
+            title = active_window_title(backend)
+            if title is not None and title != title_before:
+                return now - switched_at
+        if now >= deadline:
+            return None
+        time.sleep(min(SWITCH_POLL_INTERVAL, deadline - now))
+
+
+class _SessionTabs:
+    """Tab titles and counts per workspace, from one profile's newest session.
+
+    Read on first use (or by load() ahead of time), at most once per run: the
+    session file can be large.
+    """
+
+    def __init__(self, profile=None):
+        self.profile = profile
+        self._workspaces_by_title = None
+        self._counts = None
+
+    def load(self):
+        if self._counts is not None:
+            return
+        from . import sessions
+        workspaces_by_title = {}
+        counts = collections.Counter()
+        profile = self.profile
+        if profile is None: # Vivaldi was started without --profile-directory: its default profile
+            profile_path = vivaldi_utils.find_profile_path()
+            profile = vivaldi_utils.select_profile(os.path.basename(profile_path)) if profile_path else None
+        if profile is not None:
+            with tracing.span("session.read", profile=profile.directory):
+                for tab in sessions.workspace_tabs(profile):
+                    if tab.workspace is None:
+                        continue
+                    counts[tab.workspace] += 1
+                    if tab.title:
+                        workspaces_by_title.setdefault(tab.title, set()).add(tab.workspace)
+        self._workspaces_by_title, self._counts = workspaces_by_title, counts
+
+    def workspaces(self, window_title):
+        """Names of the workspaces with a tab titled like the window (empty if none is known)."""
+        self.load()
+        page_title = window_title.rsplit(" - ", 1)[0] if window_title.endswith("Vivaldi") else window_title
+        return self._workspaces_by_title.get(page_title, set())
+
+    def tab_count(self, workspace_name):
+        """Open tabs of the workspace, or None if the session doesn't tell (none, or no workspace data)."""
+        self.load()
+        return self._counts.get(workspace_name, 0) if self._counts else None
+
+
+def verify_switch(backend, workspace_name, title_before, switched_at, timeout=VERIFY_TIMEOUT, session_tabs=None):
+    """Checks that a switch shortcut took effect. Returns (how, seconds since `switched_at`).
+
+    `how` is one of:
+      "title"           the window title changed
+      "already-active"  it didn't, but it is the title of a tab of that workspace only
+      "ambiguous"       it didn't, and the session can't tell where that tab is
+                        (unknown title, or tabs of that title in several workspaces)
+      "unverifiable"    the backend can't read the active window
+      None              it didn't, and the tab belongs to another workspace: the switch was lost
+    """
+    if title_before is None:
+        return "unverifiable", 0.0
+    deadline = switched_at + timeout
+    interval = VERIFY_POLL_INITIAL
+    while True:
+        now = time.monotonic()
+        title = active_window_title(backend)
+        if title is not None and title != title_before:
+            return "title", now - switched_at
+        if now >= deadline:
+            break
+        time.sleep(min(interval, deadline - now))
+        interval = min(interval * 2, VERIFY_POLL_MAX)
+    workspaces = (session_tabs or _SessionTabs()).workspaces(title) if title is not None else set()
+    if workspaces == {workspace_name}:
+        how = "already-active"
+    elif workspaces and workspace_name not in workspaces:
+        how = None
+    else:
+        how = "ambiguous"
+    return how, time.monotonic() - switched_at
+
+
+def _send_verified_switch(workspace_name, shortcut_map, backend, vivaldi_pid, stats, mode, session_tabs):
+    """Sends a workspace's switch shortcut and verifies it, re-activating and re-sending on failure.
+
+    `mode` is the 'verify_switch' setting: True, False or "strict" (a switch
+    that can't be confirmed fails too). Only a switch shown to have been lost
+    is retried. Returns (ok, note for the summary, whether the switch is known
+    to be complete).
+    """
+    attempts = 1 + (SWITCH_RETRIES if mode else 0)
+    verify_seconds = 0.0
+    for attempt in range(1, attempts + 1):
+        if attempt > 1:
+            print(f"Switch to '{workspace_name}' didn't take effect; re-activating Vivaldi and retrying ({attempt}/{attempts})...")
+            activate_vivaldi_window(backend, vivaldi_pid, stats)
+        title_before = active_window_title(backend)
+        if not send_shortcut(shortcut_map.key_sequence(workspace_name), backend):
+            return False, "", False
+        if not mode:
+            return True, "", False
+        switched_at = time.monotonic()
+        with tracing.span("switch.verify", workspace=workspace_name, attempt=attempt) as trace:
+            how, seconds = verify_switch(backend, workspace_name, title_before, switched_at,
+                                         session_tabs=session_tabs)
+            trace.note(verified=how)
+        verify_seconds += seconds
+        if how == "title" and stats is not None:
+            stats.add("switch", seconds)
+        if how in ("title", "already-active"):
+            retried = f" after {attempt} attempts" if attempt > 1 else ""
+            note = "already active" if how == "already-active" else "verified"
+            return True, f" [{note} in {verify_seconds:.2f}s{retried}]", True
+        if how in ("unverifiable", "ambiguous"):
+            reason = "can't read the active window" if how == "unverifiable" else "window title doesn't tell"
+            if mode == "strict":
+                print(f"ERROR: Can't confirm the switch to '{workspace_name}' ({reason}).", file=sys.stderr)
+                return False, f" [unconfirmed: {reason}]", False
+            return True, f" [unverified: {reason}]", how == "ambiguous"
+    print(f"ERROR: The switch to '{workspace_name}' didn't take effect after {attempts} attempt(s).", file=sys.stderr)
+    return False, f" [not verified after {attempts} attempts, {verify_seconds:.2f}s]", False
+
+
+def spawn_vivaldi(vivaldi_path=None, profile=None, extra_args=()):
+    """Attaches to a running Vivaldi or spawns one, without waiting for it.
+
+    With `profile` (a vivaldi_utils.Profile), Vivaldi is started with that
+    --profile-directory; if it is already running, the launcher hands the
+    request to the running instance, which opens a window for the profile.
+    `extra_args` are added to the command line of a newly spawned Vivaldi.
+
+    Returns a VivaldiStart for wait_until_ready(), or None if Vivaldi couldn't
+    be started.
+    """
+    if profile is not None:
+        user_data_dir = os.path.dirname(profile.path)
+    else:
+        with tracing.span("profile.locate"):
+            profile_path = vivaldi_utils.find_profile_path()
+            user_data_dir = vivaldi_utils.get_user_data_dir(profile_path) if profile_path else None
+    with tracing.span("vivaldi.find_running") as trace:
+        running_pid = vivaldi_utils.find_running_instance(user_data_dir) if user_data_dir else None
+        trace.note(pid=running_pid)
+
+    if running_pid and profile is None:
+        # Common case: Vivaldi is already open, so skip spawning and waiting entirely
+        print(f"\nVivaldi is already running (pid {running_pid}).")
+        return VivaldiStart(f"attached to running Vivaldi (pid {running_pid})", running_pid, None, user_data_dir, None, None)
+
+    with tracing.span("vivaldi.find_executable"):
+        vivaldi_exe = find_vivaldi_executable(vivaldi_path)
+    if not vivaldi_exe:
+        print("ERROR: Vivaldi executable not found.", file=sys.stderr)
+        return None
+
+    command = [vivaldi_exe] + list(extra_args)
+    if profile is not None:
+        command.append(f"--profile-directory={profile.directory}")
+        print(f"\nUsing Vivaldi profile '{profile.name}' ({profile.directory}).")
+    print("\nAttempting to launch Vivaldi...")
+    # Lock files left by a crashed Vivaldi must not count as this one being up
+    locks_before = vivaldi_utils.singleton_lock_state(user_data_dir) if user_data_dir else None
+    try:
+        with tracing.span("vivaldi.spawn", command=command):
+            process = subprocess.Popen(command)
+            spawned_at = time.monotonic()
+        print(f"Vivaldi process started. Waiting for it to be ready (up to {LAUNCH_TIMEOUT}s)...")
     except Exception as e:
         print(f"ERROR launching Vivaldi: {e}", file=sys.stderr)
+        return None
+    return VivaldiStart("spawned new Vivaldi process", process.pid, process, user_data_dir, spawned_at, locks_before)
+
+
+def wait_until_ready(started, backend, stats=None, windows_before=()):
+    """Waits for a Vivaldi from spawn_vivaldi() to be ready (no-op if it was already running).
+
+    `windows_before` (list_vivaldi_windows() from before the spawn) are not
+    taken as the new window; see wait_for_vivaldi_ready().
+
+    Returns (description of the path taken, browser PID or None), or None if
+    Vivaldi died while starting.
+    """
+    process = started.process
+    if process is None:
+        return started.description, started.pid
+    with tracing.span("vivaldi.wait_ready") as trace:
+        ready = wait_for_vivaldi_ready(process, started.user_data_dir, backend,
+                                       max(0.0, started.spawned_at + LAUNCH_TIMEOUT - time.monotonic()), stats,
+                                       started.locks_before, windows_before)
+        trace.note(ready=ready)
+    if not ready:
+        if process.poll() not in (None, 0):
+            return None # Vivaldi died, nothing to send shortcuts to
+        print("Warning: Sending shortcuts anyway; they may be lost if Vivaldi isn't ready.")
+    if process.poll() == 0:
+        # The launcher handed off to another instance; that one owns the windows
+        user_data_dir = started.user_data_dir
+        return "handed off to running Vivaldi", vivaldi_utils.find_running_instance(user_data_dir) if user_data_dir else None
+    return started.description, process.pid
+
+
+def ensure_vivaldi_running(backend, vivaldi_path=None, profile=None, extra_args=(), stats=None):
+    """Attaches to a running Vivaldi or spawns one and waits until it is ready.
+
+    See spawn_vivaldi() for `profile` and `extra_args`; `stats` is passed on
+    to wait_for_vivaldi_ready().
+
+    Returns (description of the path taken, browser PID or None), or None if
+    Vivaldi couldn't be started.
+    """
+    started = spawn_vivaldi(vivaldi_path, profile, extra_args)
+    if started is None:
+        return None
+    return wait_until_ready(started, backend, stats)
+
+
+def _wait_for_condition(condition, timeout, backend):
+    """Implements the 'wait-for' action."""
+    if condition == "ready":
+        def check():
+            profile_path = vivaldi_utils.find_profile_path()
+            user_data_dir = vivaldi_utils.get_user_data_dir(profile_path) if profile_path else None
+            return bool(user_data_dir and vivaldi_utils.find_running_instance(user_data_dir))
+    else: # window
+        if not backend.supports_windows:
+            print(f"  Backend '{backend.name}' can't list windows; cannot wait for one.")
+            return False
+        def check():
+            get_window_locator(backend).forget() # Looking for a new window, not the remembered one
+            return get_window_locator(backend).find() is not None
+    return _poll_until(check, timeout)
+
+
+def describe_action(action):
+    """Human-readable step name for the summary."""
+    if action.kind == "switch":
+        return f"switch to '{action.arg}'"
+    if action.kind == "next-tab":
+        return "'Next Tab' shortcut"
+    if action.kind == "shortcut":
+        return f"shortcut '{'+'.join(action.arg)}'"
+    if action.kind == "wait":
+        return f"wait {action.arg}s"
+    return f"wait for {action.arg[0]} (up to {action.arg[1]}s)"
+
+
+# --- Main Automation Action ---
+def run_actions(action_list, shortcut_map, backend_name=None, vivaldi_path=None, profile=None, transport=None):
+    """Launches/attaches to Vivaldi once (in `profile`, if given), then runs all actions in this process.
+
+    `transport` (default: the config's "transport" setting, else "keyboard")
+    picks how actions reach Vivaldi; "devtools" is handled by devtools.run_actions.
+
+    After a workspace switch, the next keyboard action waits until the active
+    window title changes or the switch delay (SWITCH_DELAY, or the one derived
+    from observed switches) has passed. Stops at the first failed step. Prints
+    a per-step summary with timings and returns True if every step succeeded.
+    """
+    transport = transport or shortcut_map.settings.get("transport") or DEFAULT_TRANSPORT
+    if transport not in TRANSPORTS:
+        print(f"ERROR: Unknown transport '{transport}'. Choose from: {', '.join(TRANSPORTS)}", file=sys.stderr)
+        return False
+    if transport == "devtools":
+        with tracing.span("import.devtools"):
+            from . import devtools
+        return devtools.run_actions(action_list, shortcut_map, vivaldi_path, profile)
+
+    with tracing.span("backend.load", backend=input_backends.resolve_backend_name(backend_name, shortcut_map.settings)):
+        backend = input_backends.get_backend(backend_name, shortcut_map.settings)
+    if backend is None:
+        return False
+
+    # Validate everything up front so we don't stop halfway through a batch
+    if not _check_shortcuts(action_list, shortcut_map):
+        return False
+
+    stats = delay_stats.get_stats() if shortcut_map.settings.get("adaptive_delays", True) else None
+    start_time = time.monotonic()
+    running = ensure_vivaldi_running(backend, vivaldi_path, profile, stats=stats)
+    if running is None:
         return False
+    return _activate_and_run(action_list, shortcut_map, backend, running, start_time, stats, profile)
 
-    time.sleep(LAUNCH_DELAY)
+
+def _check_shortcuts(action_list, shortcut_map):
+    """Returns True if every 'switch' action has a shortcut in the config."""
+    for action in action_list:
+        if action.kind == "switch" and not shortcut_map.get(action.arg):
+            print(f"ERROR: Shortcut for workspace '{action.arg}' not found in config file.", file=sys.stderr)
+            return False
+    return True
+
+
+def _activate_and_run(action_list, shortcut_map, backend, running, start_time, stats, profile=None, session_tabs=None):
+    """Activates the Vivaldi window of `running` (path, PID), sends the actions and prints the summary.
+
+    `session_tabs` is the _SessionTabs of `profile`, if the caller read it ahead of time.
+    """
+    launch_path, vivaldi_pid = running
+    verify_mode = shortcut_map.settings.get("verify_switch", True)
+    session_tabs = session_tabs or _SessionTabs(profile)
+    for action, following in zip(action_list, action_list[1:]):
+        if action.kind == "switch" and following.kind == "next-tab":
+            check_next_tab(action.arg, profile, session_tabs)
 
     # --- Activate Window and Send Shortcuts ---
-    if not activate_vivaldi_window():
+    with tracing.span("window.activate") as trace:
+        activated = activate_vivaldi_window(backend, vivaldi_pid, stats)
+        trace.note(ok=activated)
+    if not activated:
         print("Warning: Failed to activate Vivaldi window. Shortcuts might go to the wrong place.")
         # Continue anyway, maybe it got focus automatically
 
-    print("\nSending Workspace Shortcut...")
-    success_switch = send_shortcut(workspace_shortcut_str)
+    ready_after = time.monotonic() - start_time
+    results = [] # (description, ok or None if skipped, seconds)
+    switch_delay = stats.delay("switch", SWITCH_DELAY) if stats is not None else SWITCH_DELAY
+    last_switch_at = None
+    title_before_switch = None
+    failed = False
+    for action in action_list:
+        description = describe_action(action)
+        if failed:
+            results.append((description, None, 0.0))
+            continue
 
-    if success_switch:
-        print(f"Waiting {SWITCH_DELAY}s before sending 'Next Tab'...")
-        time.sleep(SWITCH_DELAY)
-        print("Sending Next Tab Shortcut...")
-        success_next_tab = send_shortcut(next_tab_shortcut_str)
-    else:
-        success_next_tab = False # Can't send next tab if switch failed
+        if action.kind in ("switch", "next-tab", "shortcut") and last_switch_at is not None:
+            # Give Vivaldi time to finish switching before the next key event
+            if switch_delay - (time.monotonic() - last_switch_at) > 0:
+                print(f"Waiting up to {switch_delay:.2f}s for the workspace switch to settle...")
+            with tracing.span("switch.settle") as trace:
+                observed = wait_for_switch(backend, title_before_switch, last_switch_at, switch_delay)
+                trace.note(observed=observed is not None)
+            if observed is not None and stats is not None:
+                stats.add("switch", observed)
+            last_switch_at = None
+
+        step_start = time.monotonic()
+        if action.kind == "switch":
+            print(f"\nSending Workspace Shortcut for '{action.arg}'...")
+            title_before_switch = active_window_title(backend)
+            ok, note, complete = _send_verified_switch(action.arg, shortcut_map, backend, vivaldi_pid, stats,
+                                                       verify_mode, session_tabs)
+            description += note
+            # Verified: Vivaldi is done switching, no need to settle before the next key
+            last_switch_at = None if complete else time.monotonic()
+        elif action.kind == "next-tab":
+            print("Sending Next Tab Shortcut...")
+            ok = send_shortcut(NEXT_TAB_KEYS, backend)
+        elif action.kind == "shortcut":
+            ok = send_shortcut(action.arg, backend)
+        elif action.kind == "wait":
+            time.sleep(action.arg)
+            ok = True
+        else: # wait-for
+            print(f"Waiting for {action.arg[0]} (up to {action.arg[1]}s)...")
+            ok = _wait_for_condition(action.arg[0], action.arg[1], backend)
+        step_end = time.monotonic()
+        tracing.record(f"action.{action.kind}", step_start, step_end, step=description, ok=ok)
+        results.append((description, ok, step_end - step_start))
+        failed = not ok
+
+    if stats is not None:
+        stats.save()
+    return print_summary(launch_path, ready_after, results, start_time, failed)
+
+
+def _timed_task(name, function, *args):
+    """Runs one startup task in a pipeline worker, as a trace span. Returns (result, seconds)."""
+    start = time.monotonic()
+    with tracing.span(name):
+        result = function(*args)
+    return result, time.monotonic() - start
 
-    # --- Report Results ---
-    print("\n--- Process Summary ---")
-    if success_switch: print(f"[OK] Sent shortcut to switch to '{workspace_name}'.")
-    else: print(f"[FAIL] Failed to send shortcut for '{workspace_name}'.")
 
-    if success_next_tab: print(f"[OK] Sent 'Next Tab' shortcut.")
-    elif success_switch: print(f"[FAIL] Failed to send 'Next Tab' shortcut.")
+def _missing_workspaces(action_list, profile):
+    """Switch targets not found in the Preferences of `profile` (or of any profile if None)."""
+    known = {entry.name for entry in vivaldi_utils.build_workspace_index([profile] if profile is not None else None)}
+    return [action.arg for action in action_list if action.kind == "switch" and action.arg not in known]
+
+
+def _watch_profile_lock(started, stop):
+    """Polls until the Vivaldi from spawn_vivaldi() locks its profile (or `stop` is set).
+
+    Returns a list that gets the monotonic time the lock was first seen: when
+    Vivaldi finished booting far enough to own the profile, independent of
+    when anyone waits for it.
+    """
+    locked_at = []
+
+    def watch():
+        while not stop.is_set():
+            if _profile_locked(started.user_data_dir, started.locks_before):
+                locked_at.append(time.monotonic())
+                return
+            stop.wait(LOCK_WATCH_INTERVAL)
+
+    threading.Thread(target=watch, daemon=True).start()
+    return locked_at
+
+
+def launch(action_list, config_path=None, backend_name=None, profile=None, transport=None):
+    """The 'launch' command: starts Vivaldi first, then prepares the rest while it boots.
+
+    Only the settings needed to start Vivaldi ('vivaldi_path', 'transport')
+    are read before spawning. Compiling the config, checking the workspace
+    names against Preferences, loading the input backend and reading the last
+    session (for check_next_tab and switch verification) then run in a small
+    thread pool, overlapping Vivaldi's startup, and are joined before waiting
+    for readiness. The 'startup.pipeline' trace span reports how much of that
+    setup ran while Vivaldi was still booting (until it locked its profile),
+    i.e. was taken off the critical path. Returns True if every step succeeded.
+    """
+    start_time = time.monotonic()
+    with tracing.span("config.settings"):
+        settings = config.load_settings(config_path)
+    if settings is None:
+        return False
+    transport = transport or settings.get("transport") or DEFAULT_TRANSPORT
+    if transport != "keyboard":
+        # DevTools starts Vivaldi with its own flags and has no backend to load
+        shortcut_map = config.load_config(config_path, backend_name)
+        if not shortcut_map:
+            return False
+        for name in _missing_workspaces(action_list, profile):
+            print(f"Warning: Workspace '{name}' was not found in Vivaldi's Preferences.", file=sys.stderr)
+        return run_actions(action_list, shortcut_map, backend_name, settings.get("vivaldi_path"), profile, transport)
 
-    if success_switch and success_next_tab:
+    started = spawn_vivaldi(settings.get("vivaldi_path"), profile)
+    if started is None:
+        return False
+
+    with tracing.span("startup.pipeline") as trace:
+        pipeline_start = time.monotonic()
+        stop_watching = threading.Event()
+        locked_at = _watch_profile_lock(started, stop_watching) if started.process is not None and started.user_data_dir else []
+        session_tabs = _SessionTabs(profile) # The last session, before Vivaldi rewrites it
+        with concurrent.futures.ThreadPoolExecutor(max_workers=4) as pool:
+            config_task = pool.submit(_timed_task, "pipeline.config", config.load_config, config_path, backend_name)
+            names_task = pool.submit(_timed_task, "pipeline.workspaces", _missing_workspaces, action_list, profile)
+            backend_task = pool.submit(_timed_task, "pipeline.backend", input_backends.get_backend, backend_name, settings)
+            session_task = pool.submit(_timed_task, "pipeline.session", session_tabs.load)
+            (shortcut_map, config_seconds), (missing, names_seconds), (backend, backend_seconds), (_, session_seconds) = \
+                config_task.result(), names_task.result(), backend_task.result(), session_task.result()
+        joined_at = time.monotonic()
+        for name in missing:
+            where = f"profile '{profile.name}'" if profile is not None else "Vivaldi's Preferences"
+            print(f"Warning: Workspace '{name}' was not found in {where}.", file=sys.stderr)
+        if not shortcut_map or backend is None or not _check_shortcuts(action_list, shortcut_map):
+            stop_watching.set()
+            return False # Vivaldi keeps starting; there's just nothing to send
+        stats = delay_stats.get_stats() if shortcut_map.settings.get("adaptive_delays", True) else None
+        running = wait_until_ready(started, backend, stats)
+        ready_at = time.monotonic()
+        stop_watching.set()
+        serial = config_seconds + names_seconds + backend_seconds + session_seconds
+        # Setup done before Vivaldi owned its profile was hidden behind its boot; the rest wasn't
+        booted_at = locked_at[0] if locked_at else ready_at
+        overlap = max(0.0, min(joined_at, booted_at) - pipeline_start)
+        boot = booted_at - started.spawned_at if started.spawned_at is not None else 0.0
+        trace.note(tasks_ms=round(serial * 1000, 3), join_ms=round((joined_at - pipeline_start) * 1000, 3),
+                   boot_ms=round(boot * 1000, 3), overlap_ms=round(overlap * 1000, 3))
+
+    if running is None:
+        return False
+    if started.process is not None:
+        print(f"Startup: {(joined_at - pipeline_start) * 1000:.0f}ms of setup ({serial * 1000:.0f}ms of work), "
+              f"{overlap * 1000:.0f}ms of it while Vivaldi booted ({boot * 1000:.0f}ms).")
+    return _activate_and_run(action_list, shortcut_map, backend, running, start_time, stats, profile, session_tabs)
+
+
+def launch_many(entries, shortcut_map, backend_name=None, vivaldi_path=None):
+    """Starts several Vivaldi profiles at once, then switches workspaces in each window one at a time.
+
+    `entries` is a list of LaunchEntry. One thread per user data dir spawns
+    Vivaldi (--user-data-dir, --profile-directory) for its first profile and
+    waits for it; further profiles of that dir are then handed to the running
+    instance. Different user data dirs start concurrently. As each window is
+    ready its entry goes on a single input queue, which this thread works
+    through in order of readiness: key presses reach whichever window has
+    focus, so only this phase is serialized. Each entry's keys go to the
+    window that appeared for it (not one that was open before its spawn or
+    handoff); an entry without a window of its own fails. Returns True if
+    every entry succeeded.
+    """
+    with tracing.span("backend.load", backend=input_backends.resolve_backend_name(backend_name, shortcut_map.settings)):
+        backend = input_backends.get_backend(backend_name, shortcut_map.settings)
+    if backend is None:
+        return False
+    entry_actions = [actions.actions_for_workspaces(entry.workspaces) for entry in entries]
+    for action_list in entry_actions:
+        if not _check_shortcuts(action_list, shortcut_map):
+            return False
+
+    stats = delay_stats.get_stats() if shortcut_map.settings.get("adaptive_delays", True) else None
+    start_time = time.monotonic()
+    by_user_data_dir = {}
+    for number, entry in enumerate(entries):
+        by_user_data_dir.setdefault(os.path.normcase(os.path.abspath(entry.user_data_dir)), []).append(number)
+    input_queue = queue.Queue() # (entry number, (launch path, PID) or None, its window or None)
+
+    def start_instance(numbers):
+        for number in numbers:
+            entry = entries[number]
+            running = window = None
+            try:
+                with tracing.span("launch_many.start", profile=entry.profile.directory):
+                    # Later profiles of a user data dir open a window in the running instance: wait for that one
+                    windows_before = list_vivaldi_windows(backend)
+                    started = spawn_vivaldi(vivaldi_path, entry.profile, [f"--user-data-dir={entry.user_data_dir}"])
+                    running = wait_until_ready(started, backend, stats, windows_before) if started is not None else None
+                    if running is not None and running[1] is not None and backend.supports_windows:
+                        window = find_new_window(backend, {running[1]}, windows_before)
+            except Exception as e:
+                print(f"ERROR starting Vivaldi for profile '{entry.profile.name}': {e}", file=sys.stderr)
+            finally:
+                input_queue.put((number, running, window))
+
+    print(f"Starting {len(entries)} window(s) in {len(by_user_data_dir)} Vivaldi instance(s)...")
+    threads = [threading.Thread(target=start_instance, args=(numbers,), daemon=True)
+               for numbers in by_user_data_dir.values()]
+    for thread in threads:
+        thread.start()
+
+    outcomes = [None] * len(entries) # (ok, seconds from start until this entry finished)
+    targeted = [] # Windows already driven: each entry must get its own
+    for _ in entries:
+        number, running, window = input_queue.get()
+        entry = entries[number]
+        print(f"\n=== Profile '{entry.profile.name}': {', '.join(entry.workspaces)} ===")
+        if running is None:
+            print(f"ERROR: Vivaldi didn't start for profile '{entry.profile.name}'.", file=sys.stderr)
+            ok = False
+        elif backend.supports_windows and (window is None or window in targeted):
+            print(f"ERROR: No new window appeared for profile '{entry.profile.name}'; not sending its shortcuts "
+                  f"to another profile's window.", file=sys.stderr)
+            ok = False
+        else:
+            if window is not None:
+                targeted.append(window)
+                get_window_locator(backend).remember(window, running[1]) # Activation and retries target it
+            with tracing.span("launch_many.input", profile=entry.profile.directory):
+                ok = _activate_and_run(entry_actions[number], shortcut_map, backend, running, start_time, stats,
+                                       entry.profile)
+        outcomes[number] = (ok, time.monotonic() - start_time)
+    for thread in threads:
+        thread.join()
+
+    print("\n--- Launch-Many Summary ---")
+    for entry, (ok, finished_after) in zip(entries, outcomes):
+        print(f"{'[OK]' if ok else '[FAIL]'} '{entry.profile.name}' ({entry.user_data_dir}): "
+              f"{', '.join(entry.workspaces)} (done after {finished_after:.2f}s)")
+    print(f"Total: {time.monotonic() - start_time:.2f}s for {len(entries)} window(s).")
+    return all(ok for ok, _ in outcomes)
+
+
+def calibrate(shortcut_map, workspace_names=None, backend_name=None, vivaldi_path=None, profile=None, rounds=5):
+    """Measures switch and activation times by switching between workspaces, and records them.
+
+    Cycles through `workspace_names` (default: the first CALIBRATE_WORKSPACES
+    mapped in the config) `rounds` times, re-activating the window each round.
+    Needs a backend that can report the active window. Prints the derived
+    delays and returns True if at least one switch was observed.
+    """
+    names = list(workspace_names or list(shortcut_map)[:CALIBRATE_WORKSPACES])
+    if len(names) < 2:
+        print("ERROR: Calibration needs at least two workspaces with shortcuts in the config.", file=sys.stderr)
+        return False
+    for name in names:
+        if not shortcut_map.get(name):
+            print(f"ERROR: Shortcut for workspace '{name}' not found in config file.", file=sys.stderr)
+            return False
+    backend = input_backends.get_backend(backend_name, shortcut_map.settings)
+    if backend is None:
+        return False
+    if not backend.supports_focus_check:
+        print(f"ERROR: Backend '{backend.name}' can't report the active window on this platform, so switch times "
+              f"can't be measured. The fixed delays stay in use.", file=sys.stderr)
+        return False
+
+    stats = delay_stats.get_stats()
+    running = ensure_vivaldi_running(backend, vivaldi_path, profile, stats=stats)
+    if running is None:
+        return False
+    _, vivaldi_pid = running
+
+    missed = 0
+    for round_number in range(1, rounds + 1):
+        print(f"\n--- Calibration round {round_number}/{rounds} ---")
+        activate_vivaldi_window(backend, vivaldi_pid, stats)
+        for name in names:
+            title_before = active_window_title(backend)
+            if not send_shortcut(shortcut_map.key_sequence(name), backend):
+                return False
+            observed = wait_for_switch(backend, title_before, time.monotonic(), CALIBRATE_TIMEOUT)
+            if observed is None:
+                missed += 1
+                print(f"  No title change within {CALIBRATE_TIMEOUT}s after switching to '{name}'.")
+            else:
+                stats.add("switch", observed)
+                print(f"  Switched to '{name}' in {observed * 1000:.0f}ms.")
+    stats.save()
+
+    print("\n--- Calibration Summary ---")
+    if missed:
+        print(f"{missed} switch(es) not observed (same window title before and after?); they weren't recorded.")
+    defaults = {"switch": SWITCH_DELAY, "activation": ACTIVATION_SETTLE_DELAY, "ready_settle": READY_SETTLE_DELAY}
+    for metric, default in defaults.items():
+        history = stats.samples.get(metric, [])
+        if history:
+            print(f"{metric:<13} {len(history):3d} sample(s), p50 {delay_stats.percentile(history, 0.5) * 1000:.0f}ms, "
+                  f"p95 {delay_stats.percentile(history, delay_stats.PERCENTILE) * 1000:.0f}ms "
+                  f"-> delay {stats.delay(metric, default):.2f}s (default {default}s)")
+        else:
+            print(f"{metric:<13}   0 samples -> delay {default}s (default)")
+    print(f"Samples saved to '{delay_stats.get_stats_path()}'.")
+    return missed < rounds * len(names)
+
+
+def print_summary(launch_path, ready_after, results, start_time, failed):
+    """Prints the per-step summary of a run; returns True if no step failed.
+
+    `results` holds (description, ok or None if skipped, seconds) per action.
+    """
+    print("\n--- Process Summary ---")
+    print(f"Launch path: {launch_path}; first action after {ready_after:.2f}s.")
+    for description, ok, seconds in results:
+        status = "[SKIP]" if ok is None else ("[OK]" if ok else "[FAIL]")
+        print(f"{status} {description} ({seconds:.2f}s)")
+    print(f"Total: {time.monotonic() - start_time:.2f}s for {len(results)} step(s).")
+
+    if not failed:
         print("\nVivaldi should now be in the correct workspace and focused on a non-trigger tab.")
         return True
     else:
         print("\nSwitch may not have completed successfully.")
-        return False
\ No newline at end of file
+        return False
+
+
+def check_next_tab(workspace_name, profile=None, session_tabs=None):
+    """Warns if the last session shows `workspace_name` with fewer than two tabs ('Next Tab' can't move).
+
+    Run by _activate_and_run for every switch followed by 'Next Tab'. Returns
+    the open tab count found, or None if the session doesn't tell.
+    """
+    count = (session_tabs or _SessionTabs(profile)).tab_count(workspace_name)
+    if count is None:
+        return None
+    if count < 2:
+        print(f"Warning: The last session has {count} tab(s) in workspace '{workspace_name}'; "
+              f"'Next Tab' may not leave the trigger tab.", file=sys.stderr)
+    return count
+
+
+def launch_switch_and_next_tab(workspace_name, shortcut_map, backend_name=None, vivaldi_path=None, profile=None):
+    """Launches Vivaldi and uses the input backend to switch workspace and move to the next tab.
+
+    The 'Next Tab' step is checked against the last session first (check_next_tab).
+    """
+    return run_actions(actions.actions_for_workspaces([workspace_name]), shortcut_map, backend_name, vivaldi_path, profile)
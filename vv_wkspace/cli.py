@@ -1,14 +1,189 @@
 # src/vivaldi_workspace_cli/cli.py
-import argparse
+import os
 import sys
-import platform # Import platform here as well
 
-# Import functions from our other modules within the package
-from . import config
-from . import automator
-from . import vivaldi_utils
+# Import functions from our other modules within the package.
+# Only completion is imported up front: 'complete' runs on every Tab press and
+# must not pay for argparse, json or Preferences parsing. The rest is imported
+# in main(); automator (and the GUI input backend) only for 'launch', so the
+# other subcommands start fast and work on headless machines.
+from . import completion
+
+def list_workspaces(shortcut_map, profile=None):
+    """Prints workspaces found in Preferences and how they match the config's shortcut map.
+
+    All profiles are read (concurrently) unless `profile` selects one.
+    """
+    from . import config
+    from . import vivaldi_utils
+    profiles = [profile] if profile is not None else vivaldi_utils.list_profiles()
+    index = vivaldi_utils.build_workspace_index(profiles)
+    names_from_prefs = {entry.name for entry in index}
+
+    print("\nWorkspaces found in Vivaldi Preferences:")
+    if not profiles:
+        print("  (Could not find profile path to check Preferences)")
+    for p in profiles:
+        entries = [entry for entry in index if entry.profile == p.directory]
+        indent = "  "
+        if len(profiles) > 1:
+            print(f"  Profile '{p.name}' ({p.directory}):")
+            indent = "    "
+        if not entries:
+            print(f"{indent}(None found or error reading Preferences)")
+        for entry in entries:
+            print(f"{indent}- {entry.name}")
+
+    print("\nWorkspaces mapped in config file:")
+    if shortcut_map is None:
+         print("  (Error loading config file)")
+    elif not shortcut_map:
+        print(f"  (None defined in '{config.get_config_path()}')")
+    else:
+        for name, shortcut in shortcut_map.items():
+            status = "[OK]" if name in names_from_prefs else "[Name Mismatch?]"
+            if not profiles: status = "[Prefs unchecked]" # Adjust status if we couldn't read prefs
+            print(f"  - '{name}' -> Shortcut: '{shortcut}' {status}")
+
+    print("\nNOTE: Ensure names in config match Preferences & shortcuts are set in Vivaldi.")
+
+def list_tabs(workspace_names=None, profile=None, include_closed=False, as_json=False, counts_only=False):
+    """Prints the tabs of each workspace from Vivaldi's session files (all profiles unless `profile`).
+
+    With `as_json`, prints one JSON object per tab instead.
+    """
+    import json
+    from . import sessions
+    from . import vivaldi_utils
+    profiles = [profile] if profile is not None else vivaldi_utils.list_profiles()
+    wanted = set(workspace_names or ())
+    for p in profiles:
+        groups = {} # workspace name (None: no workspace) -> [SessionTab]
+        for tab in sessions.workspace_tabs(p, include_closed):
+            if wanted and tab.workspace not in wanted:
+                continue
+            if as_json:
+                print(json.dumps(tab._asdict(), ensure_ascii=False))
+            else:
+                groups.setdefault(tab.workspace, []).append(tab)
+        if as_json:
+            continue
+        print(f"\nProfile '{p.name}' ({p.directory}):")
+        if not groups:
+            print("  (No tabs found in the session files)")
+        for name, tabs in sorted(groups.items(), key=lambda item: (item[0] is None, item[0] or "")):
+            open_count = sum(1 for tab in tabs if not tab.closed)
+            closed_count = len(tabs) - open_count
+            label = f"'{name}'" if name is not None else "(no workspace)"
+            print(f"  {label}: {open_count} open tab(s)" + (f", {closed_count} recently closed" if closed_count else ""))
+            if not counts_only:
+                for tab in tabs:
+                    flags = " [closed]" if tab.closed else (" [pinned]" if tab.pinned else "")
+                    print(f"    - {tab.title or '(untitled)'} <{tab.url}>{flags}")
+
+def search_tabs(query, profile=None, limit=None):
+    """Prints the open tabs matching `query`, grouped by workspace, best first.
+
+    Returns (profile directory, workspace name) of the best match in a
+    workspace, or None.
+    """
+    import time
+    from . import search_index
+    from . import vivaldi_utils
+    start = time.perf_counter()
+    profiles = vivaldi_utils.list_profiles() # The index always covers all of them; `profile` only narrows the query
+    try:
+        db = search_index.open_index()
+    except search_index.SearchIndexError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return None
+    with db:
+        files_read = search_index.update_index(db, profiles)
+        hits = search_index.search(db, query, [profile] if profile is not None else None,
+                                   limit or search_index.DEFAULT_LIMIT)
+    db.close()
+    names = {p.directory: p.name for p in profiles}
+    groups = {} # (profile, workspace) -> [SearchHit], in order of each group's best hit
+    for hit in hits:
+        groups.setdefault((hit.profile, hit.workspace), []).append(hit)
+    if not hits:
+        print(f"No open tabs match '{query}'.")
+    for (directory, workspace), group in groups.items():
+        label = f"'{workspace}'" if workspace is not None else "(no workspace)"
+        print(f"{label} in profile '{names.get(directory, directory)}':")
+        for hit in group:
+            print(f"  - {hit.title or '(untitled)'} <{hit.url}>")
+    print(f"({len(hits)} match(es) in {(time.perf_counter() - start) * 1000:.1f} ms; "
+          f"{files_read} changed file(s) re-indexed)", file=sys.stderr)
+    return search_index.best_workspace(hits)
+
+def _select_profile(parser, selector):
+    """Resolves a --profile value to a vivaldi_utils.Profile, or exits with a usage error."""
+    if selector is None:
+        return None
+    from . import vivaldi_utils
+    profiles = vivaldi_utils.list_profiles()
+    profile = vivaldi_utils.select_profile(selector, profiles)
+    if profile is None:
+        available = ", ".join(f"'{p.directory}' ({p.name})" for p in profiles) or "none found"
+        parser.error(f"unknown Vivaldi profile '{selector}' (available: {available})")
+    return profile
+
+
+def _launch_entries(parser, specs, user_data_dir=None):
+    """Resolves launch-many entries to automator.LaunchEntry, or exits with a usage error.
+
+    Each spec is a dict with 'profile', 'workspace' (a name or a list of
+    names) and optionally 'user_data_dir' (default: `user_data_dir`, else
+    Vivaldi's). Specs for the same profile share one window.
+    """
+    from . import automator
+    from . import vivaldi_utils
+    entries = {} # (user data dir, profile directory) -> LaunchEntry
+    profiles_by_dir = {}
+    for spec in specs:
+        if not isinstance(spec, dict) or not isinstance(spec.get("profile"), str) or \
+                not isinstance(spec.get("workspace"), (str, list)):
+            parser.error(f"invalid launch entry {spec!r}: needs 'profile' and 'workspace'")
+        base = os.path.expanduser(spec.get("user_data_dir") or user_data_dir or vivaldi_utils.get_profile_base())
+        if base not in profiles_by_dir:
+            profiles_by_dir[base] = vivaldi_utils.list_profiles(base)
+        profile = vivaldi_utils.select_profile(spec["profile"], profiles_by_dir[base])
+        if profile is None:
+            available = ", ".join(f"'{p.directory}' ({p.name})" for p in profiles_by_dir[base]) or "none found"
+            parser.error(f"unknown Vivaldi profile '{spec['profile']}' in '{base}' (available: {available})")
+        workspaces = [spec["workspace"]] if isinstance(spec["workspace"], str) else list(spec["workspace"])
+        key = (base, profile.directory)
+        if key in entries:
+            entries[key].workspaces.extend(workspaces)
+        else:
+            entries[key] = automator.LaunchEntry(base, profile, workspaces)
+    return list(entries.values())
+
+
+def _add_timing_arguments(subparser):
+    """Adds --trace/--trace-format/--cprofile to a subcommand that runs in-process."""
+    from . import tracing
+    subparser.add_argument("--trace", metavar="FILE",
+                           help="Write per-phase timings of this run to FILE (in-process runs only).")
+    subparser.add_argument("--trace-format", choices=tracing.TRACE_FORMATS, default="json",
+                           help="Format for --trace: plain JSON or Chrome trace events (chrome://tracing, Perfetto).")
+    subparser.add_argument("--cprofile", metavar="FILE",
+                           help="Dump cProfile stats for the whole run to FILE (view with 'python -m pstats FILE').")
+
 
 def main():
+    if sys.argv[1:2] == ["complete"]:
+        # Fast path, handled before argparse and the config/Preferences modules are imported
+        sys.exit(completion.main(sys.argv[2:]))
+
+    import argparse
+    from . import actions
+    from . import config
+    from . import input_backends
+    from . import tracing
+    from . import vivaldi_utils
+
     parser = argparse.ArgumentParser(
         prog="vivaldi_workspace", # Set the program name for help messages
         description="CLI tool to launch Vivaldi and switch workspaces using assigned keyboard shortcuts via PyAutoGUI.",
@@ -18,17 +193,96 @@ def main():
     subparsers = parser.add_subparsers(dest="action", help="Action to perform", required=True)
 
     # --- Launch Action ---
-    parser_launch = subparsers.add_parser("launch", help="Launch Vivaldi and switch to the specified workspace.")
-    parser_launch.add_argument("workspace_name", help="Exact name of the workspace (must exist in config file).")
+    parser_launch = subparsers.add_parser("launch", help="Launch Vivaldi and switch to the specified workspace(s).",
+                                          epilog=actions.SCRIPT_HELP, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser_launch.add_argument("workspace_name", nargs="*",
+                               help="Exact name of the workspace (must exist in config file). Several run in order.")
+    parser_launch.add_argument("-s", "--script", metavar="FILE",
+                               help="Run actions from an action script ('-' reads stdin) after any workspace names.")
     # Optional flag to specify config file path (useful for testing or non-standard locations)
     parser_launch.add_argument("-c", "--config", default=config.get_config_path(),
                                help=f"Path to config file (default: {config.get_config_path()})")
+    parser_launch.add_argument("--backend", choices=sorted(input_backends.BACKENDS),
+                               help=f"Input backend for keys/windows (default: ${input_backends.BACKEND_ENV_VAR}, the config's '{input_backends.BACKEND_SETTING}', or '{input_backends.DEFAULT_BACKEND}')")
+    parser_launch.add_argument("-d", "--daemon", action="store_true",
+                               help="Send the request to a running 'vivaldi_workspace serve' daemon (falls back to in-process).")
+    parser_launch.add_argument("-p", "--profile",
+                               help="Vivaldi profile (directory like 'Profile 1' or display name) to open the workspace in.")
+    parser_launch.add_argument("-t", "--transport", choices=("keyboard", "devtools"),
+                               help="How to drive Vivaldi: key presses, or the DevTools protocol without keyboard/focus "
+                                    "(default: the config's 'transport' setting, else 'keyboard').")
+    _add_timing_arguments(parser_launch)
+
+    # --- Launch-Many Action ---
+    parser_many = subparsers.add_parser("launch-many", help="Start several Vivaldi profiles at once, then switch each window to its workspace(s).")
+    parser_many.add_argument("entry", nargs="*", metavar="PROFILE:WORKSPACE",
+                             help="Profile (directory or display name) and workspace to open in it; repeat for more windows.")
+    parser_many.add_argument("-s", "--set", metavar="NAME",
+                             help="Also launch the entries of this set from the config's 'launch_sets'.")
+    parser_many.add_argument("--user-data-dir", metavar="DIR",
+                             help="User data dir of the PROFILE:WORKSPACE entries (default: Vivaldi's).")
+    parser_many.add_argument("-c", "--config", default=config.get_config_path(),
+                             help=f"Path to config file (default: {config.get_config_path()})")
+    parser_many.add_argument("--backend", choices=sorted(input_backends.BACKENDS),
+                             help=f"Input backend for keys/windows (default: ${input_backends.BACKEND_ENV_VAR}, the config's '{input_backends.BACKEND_SETTING}', or '{input_backends.DEFAULT_BACKEND}')")
+    _add_timing_arguments(parser_many)
 
     # --- List Action ---
     parser_list = subparsers.add_parser("list", help="List workspaces found in Vivaldi Preferences and mapped in the config.")
     parser_list.add_argument("-c", "--config", default=config.get_config_path(),
                              help=f"Path to config file (default: {config.get_config_path()})")
-    # Add optional profile path argument? Maybe later if needed.
+    parser_list.add_argument("-d", "--daemon", action="store_true",
+                             help="Ask a running 'vivaldi_workspace serve' daemon (falls back to in-process).")
+    parser_list.add_argument("-p", "--profile",
+                             help="Only list this Vivaldi profile (directory or display name; default: all profiles).")
+    parser_list.add_argument("-w", "--watch", action="store_true",
+                             help="Keep running and print changes (added, removed, renamed, mapping-mismatch) as NDJSON.")
+    _add_timing_arguments(parser_list)
+
+    # --- Tabs Action ---
+    parser_tabs = subparsers.add_parser("tabs", help="Show the tabs of each workspace, read from Vivaldi's session files.")
+    parser_tabs.add_argument("workspace_name", nargs="*", help="Only these workspaces (default: all).")
+    parser_tabs.add_argument("-p", "--profile",
+                             help="Only this Vivaldi profile (directory or display name; default: all profiles).")
+    parser_tabs.add_argument("--closed", action="store_true", help="Include recently closed tabs.")
+    parser_tabs.add_argument("--counts", action="store_true", help="Only print the number of tabs per workspace.")
+    parser_tabs.add_argument("--json", action="store_true", help="Print one JSON object per tab (NDJSON).")
+
+    # --- Search Action ---
+    parser_search = subparsers.add_parser("search", help="Find which workspace holds a page, by words in tab titles, URLs or workspace names.")
+    parser_search.add_argument("query", nargs="+", help="Words to look for (each may be the start of a word).")
+    parser_search.add_argument("-p", "--profile",
+                               help="Only this Vivaldi profile (directory or display name; default: all profiles).")
+    parser_search.add_argument("-n", "--limit", type=int, default=20, help="Show at most this many tabs (default: 20).")
+    parser_search.add_argument("--launch", action="store_true",
+                               help="Switch Vivaldi to the workspace of the best match, as 'launch' does.")
+    parser_search.add_argument("-c", "--config", default=config.get_config_path(),
+                               help=f"Path to config file for --launch (default: {config.get_config_path()})")
+    parser_search.add_argument("--backend", choices=sorted(input_backends.BACKENDS),
+                               help=f"Input backend for --launch (default: ${input_backends.BACKEND_ENV_VAR}, the config's '{input_backends.BACKEND_SETTING}', or '{input_backends.DEFAULT_BACKEND}')")
+
+    # --- Calibrate Action ---
+    parser_calibrate = subparsers.add_parser("calibrate", help="Measure how fast Vivaldi switches workspaces here, to shorten the waits between shortcuts.")
+    parser_calibrate.add_argument("workspace_name", nargs="*",
+                                  help="Workspaces to switch between (default: the first few in the config).")
+    parser_calibrate.add_argument("-r", "--rounds", type=int, default=5, help="Times to cycle through the workspaces (default: 5).")
+    parser_calibrate.add_argument("-c", "--config", default=config.get_config_path(),
+                                  help=f"Path to config file (default: {config.get_config_path()})")
+    parser_calibrate.add_argument("--backend", choices=sorted(input_backends.BACKENDS),
+                                  help=f"Input backend for keys/windows (default: ${input_backends.BACKEND_ENV_VAR}, the config's '{input_backends.BACKEND_SETTING}', or '{input_backends.DEFAULT_BACKEND}')")
+    parser_calibrate.add_argument("-p", "--profile",
+                                  help="Vivaldi profile (directory like 'Profile 1' or display name) to calibrate in.")
+
+    # --- Serve Action ---
+    parser_serve = subparsers.add_parser("serve", help="Run a resident daemon that keeps the backend and config warm for fast launches.")
+    parser_serve.add_argument("--backend", choices=sorted(input_backends.BACKENDS),
+                              help=f"Input backend for keys/windows (default: ${input_backends.BACKEND_ENV_VAR}, the config's '{input_backends.BACKEND_SETTING}', or '{input_backends.DEFAULT_BACKEND}')")
+    parser_serve.add_argument("--socket", help="Unix socket path (default: $XDG_RUNTIME_DIR or the config dir).")
+
+    # --- Complete Action (handled above; declared here for --help) ---
+    parser_complete = subparsers.add_parser("complete", help="Print workspace names starting with a prefix, for shell completion.",
+                                            description=completion.USAGE)
+    parser_complete.add_argument("prefix", nargs="?", default="", help="Start of the workspace name.")
 
     # --- Config Action ---
     parser_config = subparsers.add_parser("config", help="Manage the configuration file.")
@@ -37,6 +291,8 @@ def main():
     parser_config_init = config_subparsers.add_parser("init", help="Create a sample config file if one doesn't exist.")
     parser_config_init.add_argument("-f", "--force", action="store_true",
                                    help="Force creation even if config exists (overwrites!). Use with caution.")
+    parser_config_init.add_argument("-p", "--profile",
+                                   help="Take workspace names from this Vivaldi profile only (default: all profiles).")
     # 'config path' command
     parser_config_path = config_subparsers.add_parser("path", help="Show the path to the configuration file.")
 
@@ -48,43 +304,127 @@ def main():
     args = parser.parse_args()
 
     # --- Execute Actions ---
+    action_list = None
     if args.action == "launch":
-        print(f"Attempting to launch workspace: {args.workspace_name}")
-        shortcut_map = config.load_config() # Load config using default path or specified one
-        if shortcut_map:
-            automator.launch_switch_and_next_tab(args.workspace_name, shortcut_map)
-        else:
-            sys.exit(1) # Exit if config loading failed
+        action_list = actions.actions_for_workspaces(args.workspace_name)
+        if args.script:
+            settings = config.load_settings(args.config) # Its 'input_backend' decides which key names are valid
+            if settings is None:
+                sys.exit(1)
+            script_actions = actions.read_script(args.script, args.backend, settings)
+            if script_actions is None:
+                sys.exit(1)
+            action_list += script_actions
+        if not action_list:
+            parser_launch.error("give at least one workspace name or --script with actions")
+
+    if getattr(args, "watch", False) and args.daemon:
+        parser_list.error("--watch runs in-process; it can't be combined with --daemon")
+
+    if getattr(args, "daemon", False):
+        # Thin client: the daemon does the work and sends back its output
+        from . import daemon
+        request = {"action": args.action}
+        if action_list is not None:
+            request["script"] = actions.format_script(action_list)
+        if args.profile:
+            request["profile"] = args.profile
+        if getattr(args, "transport", None):
+            request["transport"] = args.transport
+        # The daemon runs elsewhere: send what it can't see of this invocation
+        request["config"] = os.path.abspath(args.config)
+        backend_name = getattr(args, "backend", None) or os.getenv(input_backends.BACKEND_ENV_VAR)
+        if backend_name:
+            request["backend"] = backend_name
+        response = daemon.send_request(request)
+        if response is not None:
+            sys.stdout.write(response.get("output", ""))
+            sys.exit(response.get("exit_code", 1))
+        print(f"Warning: No daemon listening on '{daemon.get_socket_path()}'. Running in-process.", file=sys.stderr)
+
+    if args.action == "launch":
+        if args.workspace_name:
+            print(f"Attempting to launch workspace(s): {', '.join(args.workspace_name)}")
+        # Every in-process run is timed for the rolling timings log; --trace/--cprofile add outputs
+        with tracing.session("launch", args.trace, args.trace_format, args.cprofile):
+            profile = _select_profile(parser_launch, args.profile)
+            with tracing.span("import.automator"):
+                from . import automator
+            # Spawns Vivaldi first and loads the config, backend and Preferences while it starts
+            if not automator.launch(action_list, args.config, args.backend, profile, args.transport):
+                sys.exit(1)
+
+    elif args.action == "launch-many":
+        specs = []
+        for entry in args.entry:
+            profile_name, separator, workspace_name = entry.partition(":")
+            if not separator or not profile_name or not workspace_name:
+                parser_many.error(f"expected PROFILE:WORKSPACE, got '{entry}'")
+            specs.append({"profile": profile_name, "workspace": workspace_name})
+        with tracing.session("launch-many", args.trace, args.trace_format, args.cprofile):
+            shortcut_map = config.load_config(args.config, args.backend)
+            if not shortcut_map:
+                sys.exit(1)
+            if args.set:
+                launch_sets = shortcut_map.settings.get("launch_sets", {})
+                if not isinstance(launch_sets, dict) or not isinstance(launch_sets.get(args.set), list):
+                    available = ", ".join(launch_sets) if isinstance(launch_sets, dict) and launch_sets else "none"
+                    parser_many.error(f"no launch set '{args.set}' in the config (available: {available})")
+                specs = launch_sets[args.set] + specs
+            if not specs:
+                parser_many.error("give at least one PROFILE:WORKSPACE or --set")
+            entries = _launch_entries(parser_many, specs, args.user_data_dir)
+            with tracing.span("import.automator"):
+                from . import automator
+            if not automator.launch_many(entries, shortcut_map, args.backend, shortcut_map.settings.get("vivaldi_path")):
+                sys.exit(1)
+
+    elif args.action == "list" and args.watch:
+        from . import watch
+        sys.exit(watch.watch_workspaces(args.config, _select_profile(parser_list, args.profile)))
 
     elif args.action == "list":
         print("Listing workspaces...")
-        shortcut_map = config.load_config()
-        profile_path = vivaldi_utils.find_profile_path()
-        names_from_prefs = vivaldi_utils.get_workspaces_from_prefs(profile_path) if profile_path else []
-        names_from_prefs = names_from_prefs if names_from_prefs is not None else [] # Ensure it's a list
-
-        print("\nWorkspaces found in Vivaldi Preferences:")
-        if not profile_path:
-            print("  (Could not find profile path to check Preferences)")
-        elif not names_from_prefs:
-             print("  (None found or error reading Preferences)")
-        else:
-            for name in names_from_prefs:
-                 print(f"  - {name}")
-
-        print("\nWorkspaces mapped in config file:")
-        if shortcut_map is None:
-             print("  (Error loading config file)")
-        elif not shortcut_map:
-            print(f"  (None defined in '{config.get_config_path()}')")
-        else:
-            for name, shortcut in shortcut_map.items():
-                status = "[OK]" if name in names_from_prefs else "[Name Mismatch?]"
-                if not profile_path: status = "[Prefs unchecked]" # Adjust status if we couldn't read prefs
-                print(f"  - '{name}' -> Shortcut: '{shortcut}' {status}")
+        with tracing.session("list", args.trace, args.trace_format, args.cprofile):
+            profile = _select_profile(parser_list, args.profile)
+            list_workspaces(config.load_config(args.config), profile)
+
+    elif args.action == "tabs":
+        list_tabs(args.workspace_name, _select_profile(parser_tabs, args.profile), args.closed, args.json, args.counts)
+
+    elif args.action == "search":
+        if args.limit < 1:
+            parser_search.error("--limit must be at least 1")
+        profile = _select_profile(parser_search, args.profile)
+        best = search_tabs(" ".join(args.query), profile, args.limit)
+        if args.launch:
+            if best is None:
+                print("ERROR: No match in a workspace to launch.", file=sys.stderr)
+                sys.exit(1)
+            directory, workspace = best
+            print(f"\nLaunching best match: workspace '{workspace}'...")
+            from . import automator
+            if not automator.launch(actions.actions_for_workspaces([workspace]), args.config, args.backend,
+                                    vivaldi_utils.select_profile(directory)):
+                sys.exit(1)
+        elif best is None:
+            sys.exit(1)
 
-        print("\nNOTE: Ensure names in config match Preferences & shortcuts are set in Vivaldi.")
+    elif args.action == "calibrate":
+        if args.rounds < 1:
+            parser_calibrate.error("--rounds must be at least 1")
+        profile = _select_profile(parser_calibrate, args.profile)
+        shortcut_map = config.load_config(args.config, args.backend)
+        if not shortcut_map:
+            sys.exit(1)
+        from . import automator
+        if not automator.calibrate(shortcut_map, args.workspace_name, args.backend,
+                                   shortcut_map.settings.get("vivaldi_path"), profile, args.rounds):
+            sys.exit(1)
 
+    elif args.action == "serve":
+        from . import daemon
+        sys.exit(daemon.serve(args.backend, args.socket))
 
     elif args.action == "config":
         if args.config_action == "init":
@@ -93,11 +433,12 @@ def main():
                  print(f"Config file already exists at '{config.get_config_path()}'. Use --force to overwrite.")
                  sys.exit(1)
 
-            profile_path = vivaldi_utils.find_profile_path()
+            profile = _select_profile(parser_config_init, args.profile)
+            profiles = [profile] if profile is not None else None # None: every profile
             workspace_names = []
-            if profile_path:
-                 workspace_names = vivaldi_utils.get_workspaces_from_prefs(profile_path)
-                 workspace_names = workspace_names if workspace_names is not None else [] # Ensure list
+            for entry in vivaldi_utils.build_workspace_index(profiles):
+                 if entry.name not in workspace_names: # Same name in several profiles maps to one shortcut
+                     workspace_names.append(entry.name)
 
             if not config.init_config(workspace_names):
                  sys.exit(1) # Exit if init failed
@@ -120,6 +461,19 @@ def main():
         print("   - Linux: May require `sudo apt-get install scrot python3-tk python3-dev` (Debian/Ubuntu) or similar.")
         print("   - macOS: May require accessibility permissions for terminal/python.")
         print("   - Windows: Usually works out of the box after `pip install pyautogui`.")
+        print("4. Shell Completion of Workspace Names (optional):")
+        print("   - bash: add `eval \"$(vivaldi_workspace complete --shell bash)\"` to ~/.bashrc")
+        print("   - zsh:  add `eval \"$(vivaldi_workspace complete --shell zsh)\"` to ~/.zshrc (after compinit)")
+        print("   - fish: `vivaldi_workspace complete --shell fish > ~/.config/fish/completions/vivaldi_workspace.fish`")
+        print("5. Keyboard-free Switching (optional):")
+        print("   - Set \"transport\": \"devtools\" in the config (or pass --transport devtools) to switch over")
+        print("     Vivaldi's DevTools port (\"devtools_port\", default 9222) instead of key presses.")
+        print("   - Vivaldi must be started by this tool, or with --remote-debugging-port=<port> yourself.")
+        print("   - Note: while that port is open, any local program can control the browser.")
+        print("6. Faster Switching (optional):")
+        print("   - Run 'vivaldi_workspace calibrate' with Vivaldi open: it switches between a few workspaces,")
+        print("     measures how long Vivaldi takes on this machine and shortens the waits to match.")
+        print("   - Launches keep refining the measurements; set \"adaptive_delays\": false to use fixed waits.")
         print("-----------------------------")
 
     else:
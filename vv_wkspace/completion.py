@@ -0,0 +1,143 @@
+# src/vivaldi_workspace_cli/completion.py
+"""Shell completion of workspace names ('vivaldi_workspace complete <prefix>').
+
+Runs on every Tab press, so the common path only stats the source files and
+bisects a sorted name index loaded with marshal; it must not import json,
+argparse, config, vivaldi_utils or any input backend. The index is rebuilt
+(using those modules) only when the config file, 'Local State' or a
+profile's Preferences changed since it was written.
+"""
+import bisect
+import marshal
+import os
+import sys
+
+COMPLETION_INDEX_FILENAME = "completion_index"
+# Bump when the layout of the index file changes
+COMPLETION_INDEX_VERSION = 1
+SHELLS = ("bash", "zsh", "fish")
+USAGE = ("usage: vivaldi_workspace complete [--] PREFIX\n"
+         "       vivaldi_workspace complete --shell {bash,zsh,fish}\n"
+         "       vivaldi_workspace complete --rebuild")
+
+def _config_dir():
+    """Same location as config.get_config_dir(), without importing config (and json)."""
+    if sys.platform == "win32":
+        return os.path.join(os.getenv('APPDATA', ''), "vivaldi-workspace-cli")
+    elif sys.platform == "darwin":
+        return os.path.join(os.path.expanduser("~"), "Library", "Application Support", "vivaldi-workspace-cli")
+    xdg_config_home = os.getenv('XDG_CONFIG_HOME', os.path.join(os.path.expanduser("~"), ".config"))
+    return os.path.join(xdg_config_home, "vivaldi-workspace-cli")
+
+def get_index_path():
+    """Gets the path of the completion index file."""
+    return os.path.join(_config_dir(), COMPLETION_INDEX_FILENAME)
+
+def _identity(path):
+    """Same key as config.file_identity(); None for missing files, so creating one triggers a rebuild."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_ino, st.st_size, st.st_mtime_ns]
+
+def _load_index():
+    """Returns (sources, names, folded_keys, folded_names) if the index is current, else None."""
+    try:
+        with open(get_index_path(), 'rb') as f:
+            version, sources, names, folded_keys, folded_names = marshal.load(f)
+    except Exception:
+        return None # Missing, corrupt or from another Python version
+    if version != COMPLETION_INDEX_VERSION:
+        return None
+    for path, identity in sources:
+        if _identity(path) != identity:
+            return None
+    return sources, names, folded_keys, folded_names
+
+def rebuild_index():
+    """Collects names from the config and every profile's Preferences and writes the index."""
+    import contextlib
+    import io
+    from . import config
+    from . import vivaldi_utils
+
+    # Warnings about the config or Preferences would garble the shell's command line
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        # Stat before reading, so a write racing with the rebuild makes the index stale, not wrong
+        config_path = config.get_config_path()
+        local_state = os.path.join(vivaldi_utils.get_profile_base(), "Local State")
+        sources = [(config_path, _identity(config_path)), (local_state, _identity(local_state))]
+        profiles = vivaldi_utils.list_profiles()
+        for profile in profiles:
+            prefs_file = os.path.join(profile.path, 'Preferences')
+            sources.append((prefs_file, _identity(prefs_file)))
+
+        names = set(config.load_config(config_path) or ())
+        names.update(entry.name for entry in vivaldi_utils.build_workspace_index(profiles))
+
+    names = tuple(sorted(names))
+    folded = sorted((name.casefold(), name) for name in names)
+    data = (COMPLETION_INDEX_VERSION, tuple(sources), names,
+            tuple(key for key, _ in folded), tuple(name for _, name in folded))
+    index_path = get_index_path()
+    tmp_path = f"{index_path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(index_path), exist_ok=True)
+        with open(tmp_path, 'wb') as f:
+            marshal.dump(data, f)
+        os.replace(tmp_path, index_path)
+    except (OSError, ValueError):
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+    return data[1:]
+
+def _prefix_range(keys, prefix):
+    """Returns the slice bounds of sorted `keys` that start with `prefix`."""
+    start = bisect.bisect_left(keys, prefix)
+    end = start
+    while end < len(keys) and keys[end].startswith(prefix):
+        end += 1
+    return start, end
+
+def complete(prefix):
+    """Returns the workspace names starting with `prefix`.
+
+    Exact-case matches win; if there are none, the prefix is matched
+    case-insensitively (names are case-sensitive for 'launch', so the shell
+    replaces the word with the correctly cased name).
+    """
+    index = _load_index() or rebuild_index()
+    _, names, folded_keys, folded_names = index
+    start, end = _prefix_range(names, prefix)
+    if start < end:
+        return list(names[start:end])
+    start, end = _prefix_range(folded_keys, prefix.casefold())
+    return list(folded_names[start:end])
+
+def get_script(shell):
+    """Returns the completion script for `shell`, shipped next to this module."""
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "completions", f"vivaldi_workspace.{shell}"),
+              'r', encoding='utf-8') as f:
+        return f.read()
+
+def main(argv):
+    """Entry point for 'vivaldi_workspace complete'. Returns an exit code."""
+    if argv[:1] == ["--shell"] and len(argv) == 2 and argv[1] in SHELLS:
+        sys.stdout.write(get_script(argv[1]))
+        return 0
+    if argv == ["--rebuild"]:
+        print(f"Indexed {len(rebuild_index()[1])} workspace name(s) in '{get_index_path()}'.")
+        return 0
+    if argv[:1] == ["--"]:
+        argv = argv[1:]
+    elif argv and argv[0].startswith("-"):
+        argv = [None, None] # Unknown option
+    if len(argv) > 1:
+        print(USAGE, file=sys.stderr)
+        return 2
+    for name in complete(argv[0] if argv else ""):
+        print(name)
+    return 0
@@ -0,0 +1,35 @@
+# bash completion for vivaldi_workspace
+# Install: eval "$(vivaldi_workspace complete --shell bash)" in ~/.bashrc
+_vivaldi_workspace() {
+    local cur=${COMP_WORDS[COMP_CWORD]} prev=${COMP_WORDS[COMP_CWORD-1]} line
+    COMPREPLY=()
+    if [[ $COMP_CWORD -eq 1 ]]; then
+        COMPREPLY=($(compgen -W "launch launch-many list tabs search calibrate serve config setup-info complete" -- "$cur"))
+        return
+    fi
+    case ${COMP_WORDS[1]} in
+        launch|tabs|calibrate) ;; # Positional arguments are workspace names
+        launch-many|search)
+            case $prev in
+                -c|--config) COMPREPLY=($(compgen -f -- "$cur")) ;;
+                --user-data-dir) COMPREPLY=($(compgen -d -- "$cur")) ;;
+            esac
+            return ;;
+        *) return ;;
+    esac
+    case $prev in
+        -s|--script|-c|--config) COMPREPLY=($(compgen -f -- "$cur")); return ;;
+        -t|--transport) COMPREPLY=($(compgen -W "keyboard devtools" -- "$cur")); return ;;
+        -p|--profile|--backend|-r|--rounds) return ;;
+    esac
+    [[ $cur == -* ]] && return
+    # Workspace names may contain spaces: undo the shell quoting of the prefix,
+    # and let bash quote the results (the 'filenames' option does that)
+    local prefix=${cur//\\/}
+    prefix=${prefix#[\"\']}
+    compopt -o filenames 2>/dev/null
+    while IFS= read -r line; do
+        COMPREPLY+=("$line")
+    done < <(vivaldi_workspace complete -- "$prefix" 2>/dev/null)
+}
+complete -F _vivaldi_workspace vivaldi_workspace
@@ -0,0 +1,10 @@
+# fish completion for vivaldi_workspace
+# Install: vivaldi_workspace complete --shell fish > ~/.config/fish/completions/vivaldi_workspace.fish
+complete -c vivaldi_workspace -f
+complete -c vivaldi_workspace -n __fish_use_subcommand -a "launch launch-many list tabs search calibrate serve config setup-info complete"
+complete -c vivaldi_workspace -n '__fish_seen_subcommand_from launch' -s t -l transport -x -a "keyboard devtools"
+complete -c vivaldi_workspace -n '__fish_seen_subcommand_from launch-many search' -s c -l config -r -F
+complete -c vivaldi_workspace -n '__fish_seen_subcommand_from launch-many' -l user-data-dir -x -a '(__fish_complete_directories (commandline -ct))'
+complete -c vivaldi_workspace -n '__fish_seen_subcommand_from calibrate' -s r -l rounds -x
+complete -c vivaldi_workspace -n '__fish_seen_subcommand_from launch tabs calibrate; and not string match -q -- "-*" (commandline -ct)' \
+    -a '(vivaldi_workspace complete -- (commandline -ct) 2>/dev/null)'
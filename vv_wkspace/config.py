@@ -1,8 +1,15 @@
 # src/vivaldi_workspace_cli/config.py
+import collections.abc
 import json
+import marshal
 import os
 import platform
 import sys
+import threading
+import types
+
+from . import input_backends
+from . import tracing
 
 DEFAULT_CONFIG_FILENAME = "config.json"
 
@@ -23,41 +30,225 @@ def get_config_path():
     """Gets the full path to the config file."""
     return os.path.join(get_config_dir(), DEFAULT_CONFIG_FILENAME)
 
-def load_config():
-    """Loads the shortcut map from the config file."""
-    config_path = get_config_path()
-    if not os.path.exists(config_path):
+def file_identity(path):
+    """Returns the [inode, size, mtime_ns] key of a file, or None if it can't be stat'ed."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_ino, st.st_size, st.st_mtime_ns]
+
+def read_state_file(filename):
+    """Reads a JSON cache/state file from the config dir. Returns None if missing or corrupt."""
+    try:
+        with open(os.path.join(get_config_dir(), filename), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception:
+        # Missing, corrupt or half-written by someone else: caller rebuilds it
+        return None
+
+def write_state_file(filename, data):
+    """Atomically writes a JSON cache/state file in the config dir (best effort)."""
+    state_path = os.path.join(get_config_dir(), filename)
+    # Per process and thread, so concurrent writers don't collide
+    tmp_path = f"{state_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(get_config_dir(), exist_ok=True)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, state_path) # Atomic, so concurrent readers never see a partial file
+        return True
+    except (OSError, TypeError, ValueError):
+        # Caches are only an optimization; never fail a command because of them
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        return False
+
+# Bump when the layout of the compiled config cache changes
+COMPILED_CONFIG_VERSION = 1
+COMPILED_CONFIG_SUFFIX = ".compiled"
+
+
+class CompiledConfig(collections.abc.Mapping):
+    """Immutable, validated config: workspace name -> shortcut string.
+
+    Each shortcut is also kept pre-split into a tuple of key names that were
+    checked against the input backend's vocabulary at load time. Top-level
+    options other than 'workspace_shortcuts' are available as `settings`.
+    """
+
+    def __init__(self, key_sequences, settings):
+        self._key_sequences = types.MappingProxyType(dict(key_sequences))
+        self._shortcuts = types.MappingProxyType({name: "+".join(keys) for name, keys in key_sequences.items()})
+        self.settings = types.MappingProxyType(dict(settings))
+
+    def __getitem__(self, name):
+        return self._shortcuts[name]
+
+    def __iter__(self):
+        return iter(self._shortcuts)
+
+    def __len__(self):
+        return len(self._shortcuts)
+
+    def key_sequence(self, name):
+        """Returns the pre-split key tuple for a workspace, or None."""
+        return self._key_sequences.get(name)
+
+
+def parse_shortcut(shortcut_str, key_names=None):
+    """Splits 'ctrl+alt+1' into ('ctrl', 'alt', '1'), checking each key against `key_names`.
+
+    Raises ValueError naming the offending key.
+    """
+    keys = tuple(key.strip() for key in shortcut_str.strip().lower().split('+'))
+    if not all(keys):
+        raise ValueError(f"empty key in '{shortcut_str}'")
+    if key_names is not None:
+        for key in keys:
+            if key not in key_names:
+                raise ValueError(f"unknown key name '{key}'")
+    return keys
+
+def _compiled_cache_path(config_path):
+    return config_path + COMPILED_CONFIG_SUFFIX
+
+def _read_compiled(config_path, identity):
+    """Returns the cached (backend name, key sequences, settings) if it matches the config file's mtime and size."""
+    try:
+        with open(_compiled_cache_path(config_path), 'rb') as f:
+            version, cached_identity, cached_backend, key_sequences, settings = marshal.load(f)
+    except Exception:
+        return None # Missing, corrupt or from another Python version
+    if version != COMPILED_CONFIG_VERSION or cached_identity != identity:
+        return None
+    return cached_backend, key_sequences, settings
+
+def _load_compiled(config_path, identity, backend_name):
+    """Returns the cached CompiledConfig if it is current and was validated for `backend_name`."""
+    cached = _read_compiled(config_path, identity)
+    if cached is None or cached[0] != backend_name:
+        return None
+    return CompiledConfig(cached[1], cached[2])
+
+def _store_compiled(config_path, identity, backend_name, compiled):
+    """Writes the compiled form next to the config file (best effort, atomic)."""
+    cache_path = _compiled_cache_path(config_path)
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    data = (COMPILED_CONFIG_VERSION, identity, backend_name,
+            {name: compiled.key_sequence(name) for name in compiled}, dict(compiled.settings))
+    try:
+        with open(tmp_path, 'wb') as f:
+            marshal.dump(data, f)
+        os.replace(tmp_path, cache_path)
+    except (OSError, ValueError):
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+def _read_config_file(config_path):
+    with open(config_path, 'r', encoding='utf-8') as f:
+        # Allow comments starting with //
+        lines = [line for line in f if not line.strip().startswith('//')]
+    return json.loads("".join(lines))
+
+def load_settings(config_path=None):
+    """Reads only the top-level options (everything but 'workspace_shortcuts'). Returns a dict or None.
+
+    Cheap enough to run before Vivaldi is started: shortcuts are neither
+    validated nor compiled; load_config() does that. The settings don't depend
+    on the backend, so any current compiled cache has them and no JSON is parsed.
+    """
+    config_path = config_path or get_config_path()
+    try:
+        st = os.stat(config_path)
+    except OSError:
+        st = None # Reported below
+    if st is not None:
+        cached = _read_compiled(config_path, [st.st_mtime_ns, st.st_size])
+        if cached is not None:
+            return dict(cached[2])
+    try:
+        config_data = _read_config_file(config_path)
+    except FileNotFoundError:
         print(f"ERROR: Config file not found at '{config_path}'", file=sys.stderr)
         print(f"Please run 'vivaldi_workspace config init' to create a sample.", file=sys.stderr)
         return None
+    except json.JSONDecodeError as e:
+        print(f"ERROR: Config file '{config_path}' contains invalid JSON: {e}", file=sys.stderr)
+        return None
+    except Exception as e:
+        print(f"ERROR loading config file '{config_path}': {e}", file=sys.stderr)
+        return None
+    if not isinstance(config_data, dict):
+        print(f"ERROR: Config file '{config_path}' is missing or has invalid 'workspace_shortcuts' dictionary.", file=sys.stderr)
+        return None
+    return {key: value for key, value in config_data.items() if key not in ("workspace_shortcuts", "//")}
+
+def load_config(config_path=None, backend_name=None):
+    """Loads the config file as a CompiledConfig (a read-only name -> shortcut mapping).
+
+    Shortcuts are validated against the key names of `backend_name` (else the
+    config's 'input_backend', else the default) so typos are reported now
+    rather than at send time. The compiled result is cached next to the config
+    file, keyed by its mtime and size, so unchanged configs load without JSON
+    parsing.
+    """
+    config_path = config_path or get_config_path()
+    # Cache key: the backend asked for (None: up to the config, whose identity is checked anyway)
+    requested_backend = backend_name or os.getenv(input_backends.BACKEND_ENV_VAR)
+    try:
+        st = os.stat(config_path)
+    except OSError:
+        print(f"ERROR: Config file not found at '{config_path}'", file=sys.stderr)
+        print(f"Please run 'vivaldi_workspace config init' to create a sample.", file=sys.stderr)
+        return None
+    identity = [st.st_mtime_ns, st.st_size]
+
+    with tracing.span("config.compiled_lookup") as trace:
+        compiled = _load_compiled(config_path, identity, requested_backend)
+        trace.note(hit=compiled is not None)
+    if compiled is not None:
+        return compiled
 
     try:
-        with open(config_path, 'r', encoding='utf-8') as f:
-            # Allow comments starting with //
-            lines = [line for line in f if not line.strip().startswith('//')]
-            config_data = json.loads("".join(lines))
+        with tracing.span("config.parse"):
+            config_data = _read_config_file(config_path)
 
-        if "workspace_shortcuts" not in config_data or not isinstance(config_data["workspace_shortcuts"], dict):
+        if not isinstance(config_data, dict) or "workspace_shortcuts" not in config_data or not isinstance(config_data["workspace_shortcuts"], dict):
             print(f"ERROR: Config file '{config_path}' is missing or has invalid 'workspace_shortcuts' dictionary.", file=sys.stderr)
             return None
 
-        # Basic validation of shortcuts
-        valid_shortcuts = {}
+        settings = {key: value for key, value in config_data.items() if key not in ("workspace_shortcuts", "//")}
+        # Validate shortcuts once, here, instead of on every send
+        backend_name = input_backends.resolve_backend_name(backend_name, settings)
+        key_names = input_backends.get_key_names(backend_name)
+        key_sequences = {}
         has_errors = False
         for name, shortcut in config_data["workspace_shortcuts"].items():
-            if isinstance(shortcut, str) and shortcut.strip():
-                valid_shortcuts[name] = shortcut.strip().lower() # Store lowercase for pyautogui
-            else:
+            if not isinstance(shortcut, str) or not shortcut.strip():
                  print(f"Warning: Invalid or empty shortcut for workspace '{name}' in config. Skipping.", file=sys.stderr)
                  has_errors = True
+                 continue
+            try:
+                key_sequences[name] = parse_shortcut(shortcut, key_names)
+            except ValueError as e:
+                 print(f"Warning: Shortcut '{shortcut}' for workspace '{name}' has an {e} "
+                       f"(not known to the '{backend_name}' backend). Skipping.", file=sys.stderr)
+                 has_errors = True
 
+        compiled = CompiledConfig(key_sequences, settings)
         if has_errors:
              print("Please correct the errors in the config file.", file=sys.stderr)
-             # Decide if you want to return None or the partially valid map
-             # return None # Stricter
-             return valid_shortcuts # More lenient
+             # Lenient: return the valid part, but don't cache it so the errors show up every run
+             return compiled
 
-        return valid_shortcuts
+        with tracing.span("config.compiled_store"):
+            _store_compiled(config_path, identity, requested_backend, compiled)
+        return compiled
 
     except json.JSONDecodeError as e:
         print(f"ERROR: Config file '{config_path}' contains invalid JSON: {e}", file=sys.stderr)
@@ -90,6 +281,16 @@ def init_config(workspace_names=None):
     "//": "Use '+' to separate keys (e.g., 'ctrl+alt+1', 'command+shift+k').",
     "//": "Keys should be lowercase.",
     "//": "See pyautogui docs for key names: https://pyautogui.readthedocs.io/en/latest/keyboard.html#keyboard-keys",
+    "//": "Optional: set 'vivaldi_path' to the Vivaldi executable if it isn't found automatically.",
+    "//": "Optional: set 'transport' to 'devtools' to switch without keys over Vivaldi's DevTools port ('devtools_port', default 9222).",
+    "//": "Optional: set 'input_backend' to 'xtest' (Linux/X11) to send each shortcut's key events in one batch;",
+    "//": "  'input_event_spacing_ms' sets the gap between those events (default 0).",
+    "//": "Optional: 'verify_switch' checks that each switch took effect and retries one that was lost (default true);",
+    "//": "  false sends and moves on, 'strict' also fails a switch that can't be confirmed (e.g. no window titles).",
+    "//": "Optional: set 'adaptive_delays' to false to keep the fixed waits instead of ones measured on this machine.",
+    "//": "Optional: 'launch_sets' names lists of windows for 'launch-many --set NAME', e.g.",
+    "//": "  {'morning': [{'profile': 'Work', 'workspace': 'Mail'}, {'profile': 'Personal', 'workspace': ['News'], 'user_data_dir': '~/vivaldi-home'}]}",
+    "//": "  (written with double quotes, as everywhere else in this file).",
     "workspace_shortcuts": {
 """
     # Populate with names found in Preferences if available
@@ -113,6 +314,10 @@ def init_config(workspace_names=None):
     try:
         with open(config_path, 'w', encoding='utf-8') as f:
             f.write(sample_content)
+        # The sample must load as written, or every other command fails right after init
+        if load_config(config_path) is None:
+            print(f"ERROR: The sample config written to '{config_path}' doesn't load; please report this.", file=sys.stderr)
+            return False
 
         print("\nSample config file created successfully.")
         print(f"IMPORTANT: Edit '{config_path}' and replace placeholder shortcuts")
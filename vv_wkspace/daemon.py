@@ -0,0 +1,221 @@
+# src/vivaldi_workspace_cli/daemon.py
+import contextlib
+import io
+import json
+import os
+import socket
+import sys
+import time
+
+from . import actions
+from . import config
+from . import vivaldi_utils
+
+SOCKET_FILENAME = "daemon.sock"
+# Generous: a 'launch' request may have to start Vivaldi and wait for it
+CLIENT_TIMEOUT = 60.0
+# Requests and responses are single JSON lines; refuse anything larger
+MAX_MESSAGE_BYTES = 1024 * 1024
+# How long a connected client may take to send its request (and read the reply)
+CONNECTION_TIMEOUT = 5.0
+
+def get_socket_path():
+    """Gets the Unix socket path (under $XDG_RUNTIME_DIR when set, else the config dir)."""
+    runtime_dir = os.getenv('XDG_RUNTIME_DIR')
+    if runtime_dir and os.path.isdir(runtime_dir):
+        return os.path.join(runtime_dir, "vivaldi-workspace-cli.sock")
+    return os.path.join(config.get_config_dir(), SOCKET_FILENAME)
+
+def _read_line(conn):
+    """Reads one newline-terminated message from a socket."""
+    chunks = []
+    size = 0
+    while True:
+        chunk = conn.recv(65536)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        size += len(chunk)
+        if chunk.endswith(b"\n") or size > MAX_MESSAGE_BYTES:
+            break
+    return b"".join(chunks)
+
+def send_request(request, socket_path=None, timeout=CLIENT_TIMEOUT):
+    """Sends one request to the daemon. Returns the response dict, or None if it isn't running."""
+    socket_path = socket_path or get_socket_path()
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+            conn.settimeout(timeout)
+            conn.connect(socket_path)
+            conn.sendall(json.dumps(request).encode('utf-8') + b"\n")
+            return json.loads(_read_line(conn))
+    except (OSError, ValueError):
+        return None
+
+
+class _DaemonState:
+    """Warm state kept across requests: backends, parsed configs and executable path."""
+
+    def __init__(self, backend_name):
+        from . import automator # The whole point: pay the GUI import once
+        from . import input_backends
+        self.automator = automator
+        self.input_backends = input_backends
+        # 'serve --backend' (or the daemon's environment) beats a config's 'input_backend'
+        self.default_backend = backend_name or os.getenv(input_backends.BACKEND_ENV_VAR)
+        self.configs = {} # (config path, requested backend) -> (identity, CompiledConfig)
+        self.backends = {} # Name -> InputBackend (None if it failed to load)
+        self.shortcut_map = None # Of the last request
+        self.vivaldi_exe = None
+
+    @property
+    def backend_name(self):
+        """The backend used for requests that don't name one, given the default config."""
+        settings = self.shortcut_map.settings if self.shortcut_map is not None else None
+        return self.input_backends.resolve_backend_name(self.default_backend, settings)
+
+    def refresh_config(self, config_path=None, backend_name=None):
+        """Returns the config at `config_path` (default: the standard one), reloading it only when
+        the file's identity (mtime, size, inode) changed."""
+        config_path = config_path or config.get_config_path()
+        key = (config_path, backend_name or self.default_backend)
+        identity = config.file_identity(config_path)
+        cached = self.configs.get(key)
+        if cached is None or cached[0] != identity or cached[1] is None:
+            shortcut_map = config.load_config(config_path, key[1])
+            self.configs[key] = cached = (identity, shortcut_map)
+            print(f"Config (re)loaded: {len(shortcut_map or {})} workspace(s) from '{config_path}'.", file=sys.stderr)
+        self.shortcut_map = cached[1]
+        return self.shortcut_map
+
+    def get_backend(self, backend_name, shortcut_map):
+        """Returns (name, backend) for a request: each backend is loaded once, then configured per request."""
+        name = self.input_backends.resolve_backend_name(backend_name or self.default_backend, shortcut_map.settings)
+        if name not in self.backends:
+            self.backends[name] = self.input_backends.get_backend(name, shortcut_map.settings)
+        elif self.backends[name] is not None:
+            self.backends[name].configure(shortcut_map.settings)
+        return name, self.backends[name]
+
+    def resolve_executable(self):
+        """Returns the Vivaldi path, re-resolving only if the remembered one disappeared."""
+        if not self.vivaldi_exe or not os.path.isfile(self.vivaldi_exe):
+            settings = self.shortcut_map.settings if self.shortcut_map is not None else {}
+            self.vivaldi_exe = self.automator.find_vivaldi_executable(settings.get("vivaldi_path"))
+        return self.vivaldi_exe
+
+    def handle(self, request):
+        """Runs one request and returns (ok, exit_code)."""
+        action = request.get("action")
+        if action == "ping":
+            return True, 0
+        profile = None
+        if request.get("profile"):
+            profile = vivaldi_utils.select_profile(request["profile"])
+            if profile is None:
+                print(f"ERROR: Unknown Vivaldi profile '{request['profile']}'.", file=sys.stderr)
+                return False, 2
+        if action == "list":
+            from . import cli
+            cli.list_workspaces(self.refresh_config(request.get("config")), profile)
+            return True, 0
+        if action == "launch":
+            shortcut_map = self.refresh_config(request.get("config"), request.get("backend"))
+            if not shortcut_map:
+                return False, 1
+            backend_name, backend = self.get_backend(request.get("backend"), shortcut_map)
+            if backend is None:
+                print(f"ERROR: Input backend '{backend_name}' failed to load in the daemon.", file=sys.stderr)
+                return False, 1
+            action_list = actions.parse_script(request.get("script") or "", "<daemon request>", backend_name)
+            if not action_list:
+                print("ERROR: Launch request has no valid actions.", file=sys.stderr)
+                return False, 2
+            ok = self.automator.run_actions(action_list, shortcut_map, backend_name, self.resolve_executable(),
+                                            profile, request.get("transport"))
+            return ok, 0 if ok else 1
+        print(f"ERROR: Unknown daemon action '{action}'.", file=sys.stderr)
+        return False, 2
+
+
+def _bind_socket(socket_path):
+    """Binds the server socket, replacing a stale socket file but not a live daemon."""
+    if os.path.exists(socket_path):
+        if send_request({"action": "ping"}, socket_path, timeout=1.0) is not None:
+            print(f"ERROR: A daemon is already listening on '{socket_path}'.", file=sys.stderr)
+            return None
+        os.remove(socket_path) # Left behind by a daemon that was killed
+    os.makedirs(os.path.dirname(socket_path), exist_ok=True)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    # Only the owning user may drive their keyboard: the socket must be 0600 from the moment it exists
+    old_umask = os.umask(0o177)
+    try:
+        server.bind(socket_path)
+    finally:
+        os.umask(old_umask)
+    server.listen(8)
+    return server
+
+def serve(backend_name=None, socket_path=None):
+    """Runs the daemon until interrupted or sent a 'shutdown' request. Returns an exit code."""
+    if not hasattr(socket, "AF_UNIX"):
+        print("ERROR: 'serve' needs Unix domain sockets, which this platform lacks.", file=sys.stderr)
+        return 1
+    socket_path = socket_path or get_socket_path()
+    state = _DaemonState(backend_name)
+    shortcut_map = state.refresh_config()
+    if shortcut_map:
+        state.get_backend(None, shortcut_map) # Warm up the default backend
+    state.resolve_executable()
+    server = _bind_socket(socket_path)
+    if server is None:
+        return 1
+
+    print(f"vivaldi_workspace daemon listening on '{socket_path}' (backend: {state.backend_name or 'default'}).")
+    try:
+        while True:
+            conn, _ = server.accept()
+            with conn:
+                conn.settimeout(CONNECTION_TIMEOUT) # A stuck client must not block the daemon
+                start = time.monotonic()
+                try:
+                    request = json.loads(_read_line(conn))
+                except (OSError, ValueError):
+                    continue
+                if not isinstance(request, dict):
+                    response = {"ok": False, "exit_code": 2, "output": "ERROR: A daemon request must be a JSON object.\n"}
+                    try:
+                        conn.sendall(json.dumps(response).encode('utf-8') + b"\n")
+                    except OSError:
+                        pass
+                    continue
+                if request.get("action") == "shutdown":
+                    try:
+                        conn.sendall(json.dumps({"ok": True, "exit_code": 0, "output": ""}).encode('utf-8') + b"\n")
+                    except OSError:
+                        pass # Client went away; shut down anyway
+                    break
+                # Requests run one at a time: keyboard/window actions must not interleave
+                output = io.StringIO()
+                with contextlib.redirect_stdout(output), contextlib.redirect_stderr(output):
+                    try:
+                        ok, exit_code = state.handle(request)
+                    except Exception as e:
+                        print(f"ERROR handling daemon request: {e}")
+                        ok, exit_code = False, 1
+                response = {"ok": ok, "exit_code": exit_code, "output": output.getvalue(),
+                            "elapsed": time.monotonic() - start}
+                try:
+                    conn.sendall(json.dumps(response).encode('utf-8') + b"\n")
+                except OSError:
+                    pass # Client went away; nothing to report to
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+        try:
+            os.remove(socket_path)
+        except OSError:
+            pass
+    print("vivaldi_workspace daemon stopped.")
+    return 0
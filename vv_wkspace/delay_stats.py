@@ -0,0 +1,155 @@
+# src/vivaldi_workspace_cli/delay_stats.py
+"""Observed Vivaldi timings on this machine, and the waits derived from them.
+
+Where the automator can't see Vivaldi finish something (a workspace switch,
+a window taking focus, the UI coming up after the profile lock) it waits a
+fixed time. Whenever a run *can* observe the real duration -- the window
+title changing after a switch, the window reporting focus -- the sample is
+recorded here; 'vivaldi_workspace calibrate' records a batch on purpose.
+The blind waits then use a high percentile of the recent samples plus a
+margin, never below a safety floor.
+
+Samples live in the config dir, per host name, so a config dir shared
+between machines (roaming profiles, dotfile sync) doesn't mix them up.
+Several processes (the daemon, one-off runs) may save at once: each appends
+its new samples to what is on disk, under a lock file.
+"""
+import contextlib
+import os
+import socket
+
+from . import config
+
+DELAY_STATS_FILENAME = "delay_stats.json"
+DELAY_STATS_VERSION = 1
+# metric: (safety floor, ceiling) in seconds
+METRICS = {
+    "switch": (0.1, 2.0),        # Switch shortcut sent -> active window title changed
+    "activation": (0.05, 2.0),   # Window activated -> window reports focus
+    "ready_settle": (0.1, 3.0),  # Profile lock appeared -> Vivaldi window listed
+}
+# Newest samples kept per metric
+HISTORY_SIZE = 50
+# Fewer samples than this and the fixed default is used
+MIN_SAMPLES = 5
+PERCENTILE = 0.95
+SAFETY_MARGIN = 1.25
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of unsorted `values` (None if empty)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(fraction * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+class DelayStats:
+    """Sample history of this host; use get_stats() for the shared instance."""
+
+    def __init__(self, samples=None, identity=None):
+        self.samples = samples if samples is not None else {}
+        self.identity = identity # File identity when loaded, to notice other writers
+        self.pending = {} # metric -> samples added since the last save
+        self.dirty = False
+
+    def add(self, metric, seconds):
+        """Records one observed duration of `metric` (one of METRICS)."""
+        sample = round(seconds, 4)
+        history = self.samples.setdefault(metric, [])
+        history.append(sample)
+        del history[:-HISTORY_SIZE]
+        self.pending.setdefault(metric, []).append(sample)
+        self.dirty = True
+
+    def delay(self, metric, default):
+        """The wait to use for `metric`: p95 of recent samples plus margin, else `default`."""
+        history = self.samples.get(metric, [])
+        if len(history) < MIN_SAMPLES:
+            return default
+        floor, ceiling = METRICS[metric]
+        return min(ceiling, max(floor, percentile(history, PERCENTILE) * SAFETY_MARGIN))
+
+    def save(self):
+        """Adds the new samples to the file (best effort). Returns True if written.
+
+        The file is re-read under the lock and this run's samples appended to
+        each metric's history there, so samples other processes saved since
+        this one loaded are kept (and become part of `samples`).
+        """
+        if not self.dirty:
+            return False
+        with _locked():
+            data = config.read_state_file(DELAY_STATS_FILENAME)
+            if not isinstance(data, dict) or data.get("version") != DELAY_STATS_VERSION \
+                    or not isinstance(data.get("hosts"), dict):
+                data = {"version": DELAY_STATS_VERSION, "hosts": {}}
+            samples = _host_samples(data)
+            for metric, new_samples in self.pending.items():
+                samples[metric] = (samples.get(metric, []) + new_samples)[-HISTORY_SIZE:]
+            data["hosts"][_host()] = samples
+            written = config.write_state_file(DELAY_STATS_FILENAME, data)
+            self.identity = config.file_identity(get_stats_path())
+        self.samples = samples
+        self.pending = {}
+        self.dirty = False
+        return written
+
+
+def _host():
+    return socket.gethostname() or "localhost"
+
+def get_stats_path():
+    return os.path.join(config.get_config_dir(), DELAY_STATS_FILENAME)
+
+@contextlib.contextmanager
+def _locked():
+    """Holds an exclusive lock on the stats file's sidecar lock file while saving.
+
+    Without fcntl (Windows) or a writable config dir, saves go unlocked, as
+    before: a lost sample only costs a slightly older delay.
+    """
+    try:
+        import fcntl
+    except ImportError:
+        fcntl = None
+    fd = None
+    if fcntl is not None:
+        try:
+            os.makedirs(config.get_config_dir(), exist_ok=True)
+            fd = os.open(get_stats_path() + ".lock", os.O_RDWR | os.O_CREAT, 0o600)
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        except OSError:
+            if fd is not None:
+                os.close(fd)
+            fd = None
+    try:
+        yield
+    finally:
+        if fd is not None:
+            os.close(fd) # Releases the lock
+
+def _host_samples(data):
+    """This host's valid sample lists from the parsed stats file."""
+    host_samples = data.get("hosts", {}).get(_host())
+    if not isinstance(host_samples, dict):
+        return {}
+    return {metric: [float(s) for s in history if isinstance(s, (int, float))][-HISTORY_SIZE:]
+            for metric, history in host_samples.items()
+            if metric in METRICS and isinstance(history, list)}
+
+_stats = None
+
+def get_stats():
+    """Returns this host's DelayStats, re-read when another process has rewritten the file."""
+    global _stats
+    identity = config.file_identity(get_stats_path())
+    if _stats is not None and (_stats.dirty or _stats.identity == identity):
+        return _stats
+    samples = {}
+    data = config.read_state_file(DELAY_STATS_FILENAME)
+    if isinstance(data, dict) and data.get("version") == DELAY_STATS_VERSION and isinstance(data.get("hosts"), dict):
+        samples = _host_samples(data)
+    _stats = DelayStats(samples, identity)
+    return _stats
@@ -0,0 +1,402 @@
+# src/vivaldi_workspace_cli/devtools.py
+"""Keyboard-free switching over the Chrome DevTools protocol (transport "devtools").
+
+Vivaldi is started with --remote-debugging-port, or an instance already
+listening on that port is used. Actions run as Runtime.evaluate calls in
+Vivaldi's own UI page (browser.html), where chrome.tabs exposes each tab's
+vivExtData and with it the tab's workspaceId: activating a tab of another
+workspace switches to that workspace. No window focus or keyboard is needed,
+so there are no settle delays between actions. All calls of one run go over
+one pooled WebSocket connection.
+
+Only the standard library is used: a minimal HTTP client for the /json
+endpoints and a minimal RFC 6455 client (text frames, ping/pong, close).
+"""
+import asyncio
+import base64
+import hashlib
+import json
+import os
+import struct
+import sys
+import time
+import urllib.parse
+
+from . import tracing
+
+DEFAULT_PORT = 9222
+HOST = "127.0.0.1"
+CONNECT_TIMEOUT = 2.0
+CALL_TIMEOUT = 5.0
+# Upper bound for one incoming WebSocket message
+MAX_MESSAGE_BYTES = 16 * 1024 * 1024
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+# Vivaldi's UI runs as this built-in extension page, one per browser window
+VIVALDI_UI_URL_PREFIX = "chrome-extension://mpognobbkildjkofajifpdfhcoklimli/browser.html"
+
+# Tabs carry their workspace in vivExtData, a JSON string set by Vivaldi
+_WORKSPACE_OF_JS = "(tab) => { try { return JSON.parse(tab.vivExtData || '{}').workspaceId ?? null; } catch (e) { return null; } }"
+# Activates the most recently used tab of a workspace in this window, which switches to it
+SWITCH_WORKSPACE_JS = """async (workspaceId) => {
+  const workspaceOf = %s;
+  const tabs = (await chrome.tabs.query({currentWindow: true})).filter(tab => workspaceOf(tab) === workspaceId);
+  if (!tabs.length) return {error: "workspace has no tabs in this window"};
+  const target = tabs.reduce((best, tab) => (tab.lastAccessed || 0) > (best.lastAccessed || 0) ? tab : best);
+  await chrome.tabs.update(target.id, {active: true});
+  return {tabId: target.id};
+}""" % _WORKSPACE_OF_JS
+# Activates the next tab of the active tab's workspace, wrapping around
+NEXT_TAB_JS = """async () => {
+  const workspaceOf = %s;
+  const [active] = await chrome.tabs.query({active: true, currentWindow: true});
+  if (!active) return {error: "no active tab"};
+  const tabs = (await chrome.tabs.query({currentWindow: true}))
+    .filter(tab => workspaceOf(tab) === workspaceOf(active)).sort((a, b) => a.index - b.index);
+  const next = tabs[(tabs.findIndex(tab => tab.id === active.id) + 1) %% tabs.length];
+  await chrome.tabs.update(next.id, {active: true});
+  return {tabId: next.id};
+}""" % _WORKSPACE_OF_JS
+
+
+class DevToolsError(Exception):
+    """The DevTools endpoint answered, but not with what we asked for."""
+
+
+async def _read_http_head(reader):
+    """Reads an HTTP status line and headers; returns (status code, {lowercase name: value})."""
+    head = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1").split("\r\n")
+    try:
+        status = int(head[0].split()[1])
+    except (IndexError, ValueError):
+        raise DevToolsError(f"malformed HTTP response: {head[0]!r}")
+    headers = {}
+    for line in head[1:]:
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip()
+    return status, headers
+
+async def http_get_json(port, path, timeout=CONNECT_TIMEOUT):
+    """GETs one of the DevTools /json endpoints and decodes the body."""
+    reader, writer = await asyncio.wait_for(asyncio.open_connection(HOST, port), timeout)
+    try:
+        writer.write(f"GET {path} HTTP/1.1\r\nHost: {HOST}:{port}\r\nConnection: close\r\n\r\n".encode())
+        await writer.drain()
+        status, headers = await asyncio.wait_for(_read_http_head(reader), timeout)
+        if status != 200:
+            raise DevToolsError(f"GET {path} returned HTTP {status}")
+        length = headers.get("content-length")
+        body = await asyncio.wait_for(reader.readexactly(int(length)) if length else reader.read(), timeout)
+    finally:
+        writer.close()
+    return json.loads(body)
+
+
+def _mask(payload, mask):
+    """XORs `payload` with the repeated 4-byte `mask` (in one big-int operation)."""
+    if not payload:
+        return b""
+    repeated = (mask * (len(payload) // 4 + 1))[:len(payload)]
+    return (int.from_bytes(payload, "big") ^ int.from_bytes(repeated, "big")).to_bytes(len(payload), "big")
+
+
+class WebSocket:
+    """Client side of RFC 6455, enough for the DevTools protocol."""
+
+    def __init__(self, reader, writer):
+        self._reader = reader
+        self._writer = writer
+        self.closed = False
+
+    @classmethod
+    async def connect(cls, url, timeout=CONNECT_TIMEOUT):
+        parts = urllib.parse.urlsplit(url)
+        if parts.scheme != "ws":
+            raise DevToolsError(f"unsupported WebSocket URL '{url}'")
+        port = parts.port or 80
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(parts.hostname, port), timeout)
+        key = base64.b64encode(os.urandom(16)).decode()
+        path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        writer.write((f"GET {path} HTTP/1.1\r\nHost: {parts.hostname}:{port}\r\n"
+                      f"Upgrade: websocket\r\nConnection: Upgrade\r\n"
+                      f"Sec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n").encode())
+        await writer.drain()
+        try:
+            status, headers = await asyncio.wait_for(_read_http_head(reader), timeout)
+            expected = base64.b64encode(hashlib.sha1((key + WS_GUID).encode()).digest()).decode()
+            if status != 101 or headers.get("sec-websocket-accept") != expected:
+                raise DevToolsError(f"WebSocket handshake with '{url}' failed (HTTP {status})")
+        except BaseException:
+            writer.close()
+            raise
+        return cls(reader, writer)
+
+    async def _send_frame(self, opcode, payload):
+        header = bytearray([0x80 | opcode]) # FIN: we never fragment
+        length = len(payload)
+        if length < 126:
+            header.append(0x80 | length) # Client frames are always masked
+        elif length < 1 << 16:
+            header.append(0x80 | 126)
+            header += struct.pack("!H", length)
+        else:
+            header.append(0x80 | 127)
+            header += struct.pack("!Q", length)
+        mask = os.urandom(4)
+        self._writer.write(bytes(header) + mask + _mask(payload, mask))
+        await self._writer.drain()
+
+    async def send_text(self, text):
+        if self.closed:
+            raise ConnectionError("WebSocket is closed")
+        await self._send_frame(0x1, text.encode("utf-8"))
+
+    async def receive_text(self):
+        """Returns the next text message, answering pings; raises ConnectionError once closed."""
+        fragments = []
+        size = 0
+        while True:
+            head = await self._reader.readexactly(2)
+            fin, opcode = head[0] & 0x80, head[0] & 0x0F
+            length = head[1] & 0x7F
+            if length == 126:
+                length = struct.unpack("!H", await self._reader.readexactly(2))[0]
+            elif length == 127:
+                length = struct.unpack("!Q", await self._reader.readexactly(8))[0]
+            mask = await self._reader.readexactly(4) if head[1] & 0x80 else None
+            size += length
+            if size > MAX_MESSAGE_BYTES:
+                raise DevToolsError(f"WebSocket message larger than {MAX_MESSAGE_BYTES} bytes")
+            payload = await self._reader.readexactly(length)
+            if mask:
+                payload = _mask(payload, mask)
+            if opcode == 0x9: # Ping
+                await self._send_frame(0xA, payload)
+            elif opcode == 0x8: # Close
+                self.closed = True
+                raise ConnectionError("WebSocket closed by the browser")
+            elif opcode in (0x0, 0x1, 0x2): # Continuation, text, binary
+                fragments.append(payload)
+                if fin:
+                    return b"".join(fragments).decode("utf-8")
+
+    async def close(self):
+        if not self.closed:
+            self.closed = True
+            try:
+                await self._send_frame(0x8, struct.pack("!H", 1000))
+            except Exception:
+                pass
+        self._writer.close()
+
+
+class Connection:
+    """A DevTools session on one target: numbered calls matched to their responses."""
+
+    def __init__(self, websocket):
+        self._websocket = websocket
+        self._next_id = 0
+        self._pending = {}
+        self._reader_task = asyncio.ensure_future(self._read_responses())
+
+    @property
+    def closed(self):
+        return self._websocket.closed or self._reader_task.done()
+
+    async def _read_responses(self):
+        try:
+            while True:
+                message = json.loads(await self._websocket.receive_text())
+                future = self._pending.pop(message.get("id"), None)
+                if future is not None and not future.done():
+                    future.set_result(message) # Messages without an id are events; none are needed
+        except Exception as e:
+            self._websocket.closed = True
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError(f"DevTools connection lost: {e}"))
+            self._pending.clear()
+
+    async def call(self, method, params=None, timeout=CALL_TIMEOUT):
+        """Sends one protocol command and returns its result."""
+        if self.closed:
+            raise ConnectionError("DevTools connection is closed")
+        self._next_id += 1
+        call_id = self._next_id
+        future = asyncio.get_running_loop().create_future()
+        self._pending[call_id] = future
+        try:
+            with tracing.span("devtools.call", method=method):
+                await self._websocket.send_text(json.dumps({"id": call_id, "method": method, "params": params or {}}))
+                message = await asyncio.wait_for(future, timeout)
+        finally:
+            self._pending.pop(call_id, None)
+        if "error" in message:
+            raise DevToolsError(f"{method}: {message['error'].get('message', message['error'])}")
+        return message.get("result", {})
+
+    async def evaluate(self, expression):
+        """Evaluates JavaScript in the target (awaiting promises) and returns the value."""
+        result = await self.call("Runtime.evaluate", {"expression": expression, "awaitPromise": True, "returnByValue": True})
+        if "exceptionDetails" in result:
+            details = result["exceptionDetails"]
+            raise DevToolsError(details.get("exception", {}).get("description") or details.get("text", "script error"))
+        return result.get("result", {}).get("value")
+
+    async def close(self):
+        self._reader_task.cancel()
+        await self._websocket.close()
+
+
+class ConnectionPool:
+    """Keeps one open connection per target for the whole run, reconnecting if one drops."""
+
+    def __init__(self):
+        self._connections = {}
+        self.opened = 0
+
+    async def get(self, websocket_url):
+        connection = self._connections.get(websocket_url)
+        if connection is None or connection.closed:
+            with tracing.span("devtools.connect"):
+                connection = Connection(await WebSocket.connect(websocket_url))
+            self._connections[websocket_url] = connection
+            self.opened += 1
+        return connection
+
+    async def close(self):
+        for connection in self._connections.values():
+            await connection.close()
+        self._connections.clear()
+
+
+async def find_ui_target(port):
+    """Returns the /json/list entry of a Vivaldi UI page, or None."""
+    for target in await http_get_json(port, "/json/list"):
+        if target.get("url", "").startswith(VIVALDI_UI_URL_PREFIX) and target.get("webSocketDebuggerUrl"):
+            return target
+    return None
+
+async def _probe_ui_target(port):
+    try:
+        return await find_ui_target(port)
+    except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, DevToolsError, ValueError):
+        return None # Not listening (yet) or still starting up
+
+async def wait_for_ui_target(port, timeout):
+    """Polls /json/list with exponential backoff until a Vivaldi UI page is listed."""
+    from . import automator
+    deadline = time.monotonic() + timeout
+    interval = automator.READY_POLL_INITIAL
+    while True:
+        target = await _probe_ui_target(port)
+        remaining = deadline - time.monotonic()
+        if target is not None or remaining <= 0:
+            return target
+        await asyncio.sleep(min(interval, remaining))
+        interval = min(interval * 2, automator.READY_POLL_MAX)
+
+
+async def switch_workspace(connection, workspace_id):
+    outcome = await connection.evaluate(f"({SWITCH_WORKSPACE_JS})({json.dumps(workspace_id)})")
+    return _check_outcome(outcome)
+
+async def next_tab(connection):
+    return _check_outcome(await connection.evaluate(f"({NEXT_TAB_JS})()"))
+
+def _check_outcome(outcome):
+    if not isinstance(outcome, dict) or outcome.get("error"):
+        reason = outcome.get("error") if isinstance(outcome, dict) else f"unexpected result {outcome!r}"
+        print(f"ERROR: Vivaldi UI reported: {reason}", file=sys.stderr)
+        return False
+    return True
+
+
+def _workspace_ids(profile):
+    """Maps workspace names to ids from Preferences (the given profile, else all profiles)."""
+    from . import vivaldi_utils
+    ids = {}
+    for entry in vivaldi_utils.build_workspace_index([profile] if profile is not None else None):
+        if entry.id is not None:
+            ids.setdefault(entry.name, entry.id)
+    return ids
+
+async def _run(action_list, ids, port, vivaldi_path, profile):
+    from . import automator
+    start_time = time.monotonic()
+    with tracing.span("devtools.find_ui"):
+        target = await _probe_ui_target(port)
+    if target is not None:
+        launch_path = f"attached to DevTools on port {port}"
+    else:
+        running = automator.ensure_vivaldi_running(None, vivaldi_path, profile, [f"--remote-debugging-port={port}"])
+        if running is None:
+            return False
+        launch_path = running[0]
+        # A browser we didn't start won't open the port now; only a new one is worth waiting for
+        timeout = automator.LAUNCH_TIMEOUT if launch_path.startswith("spawned") else 0
+        with tracing.span("devtools.wait_ui"):
+            target = await wait_for_ui_target(port, timeout)
+        if target is None:
+            print(f"ERROR: No Vivaldi UI on DevTools port {port}. If Vivaldi was already running, restart it "
+                  f"with --remote-debugging-port={port}, or use the keyboard transport.", file=sys.stderr)
+            return False
+
+    pool = ConnectionPool()
+    results = []
+    failed = False
+    ready_after = time.monotonic() - start_time
+    try:
+        for action in action_list:
+            description = automator.describe_action(action)
+            if failed:
+                results.append((description, None, 0.0))
+                continue
+            step_start = time.monotonic()
+            try:
+                if action.kind == "wait":
+                    await asyncio.sleep(action.arg)
+                    ok = True
+                elif action.kind == "wait-for":
+                    condition, timeout = action.arg
+                    print(f"Waiting for {condition} (up to {timeout}s)...")
+                    ok = await wait_for_ui_target(port, timeout) is not None
+                else:
+                    # Same connection for every action unless the browser dropped it
+                    connection = await pool.get(target["webSocketDebuggerUrl"])
+                    if action.kind == "switch":
+                        print(f"Switching to workspace '{action.arg}' via DevTools...")
+                        ok = await switch_workspace(connection, ids[action.arg])
+                    else: # next-tab
+                        print("Activating the next tab via DevTools...")
+                        ok = await next_tab(connection)
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, DevToolsError) as e:
+                print(f"ERROR: DevTools {description} failed: {e or type(e).__name__}", file=sys.stderr)
+                ok = False
+            step_end = time.monotonic()
+            tracing.record(f"action.{action.kind}", step_start, step_end, step=description, ok=ok)
+            results.append((description, ok, step_end - step_start))
+            failed = not ok
+    finally:
+        await pool.close()
+    print(f"DevTools connections opened: {pool.opened}.")
+    return automator.print_summary(launch_path, ready_after, results, start_time, failed)
+
+def run_actions(action_list, shortcut_map, vivaldi_path=None, profile=None):
+    """Runs actions over DevTools; same contract as automator.run_actions. Returns True on success."""
+    settings = shortcut_map.settings if shortcut_map is not None else {}
+    try:
+        port = int(settings.get("devtools_port", DEFAULT_PORT))
+    except (TypeError, ValueError):
+        print("ERROR: 'devtools_port' in the config must be a port number.", file=sys.stderr)
+        return False
+
+    # Validate up front: switching needs the workspace id, and keys can't be sent without a keyboard
+    ids = _workspace_ids(profile) if any(action.kind == "switch" for action in action_list) else {}
+    for action in action_list:
+        if action.kind == "switch" and action.arg not in ids:
+            print(f"ERROR: Workspace '{action.arg}' (with an id) not found in Vivaldi Preferences.", file=sys.stderr)
+            return False
+        if action.kind == "shortcut":
+            print("ERROR: 'shortcut' actions need the keyboard transport.", file=sys.stderr)
+            return False
+    return asyncio.run(_run(action_list, ids, port, vivaldi_path, profile))
@@ -0,0 +1,426 @@
+# src/vivaldi_workspace_cli/input_backends.py
+import json
+import os
+import sys
+import time
+
+# Backend used for keyboard input and window lookup unless overridden
+DEFAULT_BACKEND = "pyautogui"
+# Environment override, e.g. VV_WKSPACE_BACKEND=recording for headless runs
+BACKEND_ENV_VAR = "VV_WKSPACE_BACKEND"
+# Config options: the backend (below --backend and the environment), and the
+# spacing between the key events of one shortcut for backends that batch them
+BACKEND_SETTING = "input_backend"
+EVENT_SPACING_SETTING = "input_event_spacing_ms"
+# Optional NDJSON file the recording backend appends its events to
+RECORD_FILE_ENV_VAR = "VV_WKSPACE_RECORD_FILE"
+
+# Key names understood in config shortcuts (PyAutoGUI's KEYBOARD_KEYS vocabulary),
+# kept here so configs can be validated without importing PyAutoGUI.
+KEY_NAMES = frozenset(
+    list("\t\n\r !\"#$%&'()*+,-./0123456789:;<=>?@[\\]^_`abcdefghijklmnopqrstuvwxyz{|}~")
+    + ['accept', 'add', 'alt', 'altleft', 'altright', 'apps', 'backspace',
+       'browserback', 'browserfavorites', 'browserforward', 'browserhome',
+       'browserrefresh', 'browsersearch', 'browserstop', 'capslock', 'clear',
+       'convert', 'ctrl', 'ctrlleft', 'ctrlright', 'decimal', 'del', 'delete',
+       'divide', 'down', 'end', 'enter', 'esc', 'escape', 'execute', 'final', 'fn',
+       'hanguel', 'hangul', 'hanja', 'help', 'home', 'insert', 'junja',
+       'kana', 'kanji', 'launchapp1', 'launchapp2', 'launchmail',
+       'launchmediaselect', 'left', 'modechange', 'multiply', 'nexttrack',
+       'nonconvert', 'numlock', 'pagedown', 'pageup', 'pause', 'pgdn',
+       'pgup', 'playpause', 'prevtrack', 'print', 'printscreen', 'prntscrn',
+       'prtsc', 'prtscr', 'return', 'right', 'scrolllock', 'select', 'separator',
+       'shift', 'shiftleft', 'shiftright', 'sleep', 'space', 'stop', 'subtract', 'tab',
+       'up', 'volumedown', 'volumemute', 'volumeup', 'win', 'winleft', 'winright', 'yen',
+       'command', 'option', 'optionleft', 'optionright']
+    + [f"f{i}" for i in range(1, 25)]
+    + [f"num{i}" for i in range(10)]
+)
+
+
+class InputBackend:
+    """Interface for the keyboard/window operations the automator needs."""
+    name = None
+    # Whether get_all_windows() can actually see windows on this platform
+    supports_windows = False
+    # Whether get_active_window() reports the focused window
+    supports_focus_check = False
+    # Key names this backend can send
+    key_names = KEY_NAMES
+
+    def press(self, key):
+        """Presses and releases a single key."""
+        raise NotImplementedError
+
+    def hotkey(self, *keys):
+        """Presses keys in order, then releases them in reverse order."""
+        raise NotImplementedError
+
+    def get_all_windows(self):
+        """Returns window objects (with at least a 'title' attribute)."""
+        return []
+
+    def get_active_window(self):
+        """Returns the focused window object, if the platform can tell."""
+        return None
+
+    def window_pid(self, window):
+        """Returns the PID owning `window`, or None if unknown."""
+        return None
+
+    def configure(self, settings):
+        """Applies config options (CompiledConfig.settings) that concern this backend."""
+        pass
+
+
+class PyAutoGUIBackend(InputBackend):
+    """Sends real key events through PyAutoGUI (imported on first use only)."""
+    name = "pyautogui"
+
+    def __init__(self):
+        import pyautogui # Heavy (pulls in Xlib/Quartz/win32), so only import when needed
+        # Configure PyAutoGUI pauses (optional but can help stability)
+        # pyautogui.PAUSE = 0.1 # Pause between all pyautogui calls
+        # pyautogui.FAILSAFE = True # Move mouse to corner to abort
+        self._pyautogui = pyautogui
+        # Window helpers (PyGetWindow) only exist on Windows/macOS
+        self.supports_windows = hasattr(pyautogui, "getAllWindows")
+        self.supports_focus_check = hasattr(pyautogui, "getActiveWindow")
+        self._user32 = None
+        if sys.platform == "win32":
+            import ctypes
+            self._user32 = ctypes.windll.user32
+
+    def press(self, key):
+        self._pyautogui.press(key)
+
+    def hotkey(self, *keys):
+        self._pyautogui.hotkey(*keys)
+
+    def get_all_windows(self):
+        return self._pyautogui.getAllWindows()
+
+    def get_active_window(self):
+        return self._pyautogui.getActiveWindow()
+
+    def window_pid(self, window):
+        hwnd = getattr(window, '_hWnd', None)
+        if self._user32 is None or hwnd is None:
+            return None # PyGetWindow exposes no owner PID on macOS
+        import ctypes
+        pid = ctypes.c_ulong()
+        self._user32.GetWindowThreadProcessId(hwnd, ctypes.byref(pid))
+        return pid.value or None
+
+
+# X keysym names for the KEY_NAMES that aren't a single character (whose
+# keysym is its code point); names without an entry can't be sent over XTEST
+X_KEYSYM_NAMES = {
+    'alt': 'Alt_L', 'altleft': 'Alt_L', 'altright': 'Alt_R',
+    'option': 'Alt_L', 'optionleft': 'Alt_L', 'optionright': 'Alt_R',
+    'ctrl': 'Control_L', 'ctrlleft': 'Control_L', 'ctrlright': 'Control_R',
+    'shift': 'Shift_L', 'shiftleft': 'Shift_L', 'shiftright': 'Shift_R',
+    'win': 'Super_L', 'winleft': 'Super_L', 'winright': 'Super_R', 'command': 'Super_L',
+    'apps': 'Menu', 'backspace': 'BackSpace', 'capslock': 'Caps_Lock', 'clear': 'Clear',
+    'del': 'Delete', 'delete': 'Delete', 'insert': 'Insert', 'home': 'Home', 'end': 'End',
+    'pageup': 'Prior', 'pgup': 'Prior', 'pagedown': 'Next', 'pgdn': 'Next',
+    'up': 'Up', 'down': 'Down', 'left': 'Left', 'right': 'Right',
+    'enter': 'Return', 'return': 'Return', 'esc': 'Escape', 'escape': 'Escape',
+    'space': 'space', 'tab': 'Tab', '\t': 'Tab', '\n': 'Return', '\r': 'Return',
+    'execute': 'Execute', 'help': 'Help', 'pause': 'Pause', 'select': 'Select',
+    'print': 'Print', 'printscreen': 'Print', 'prntscrn': 'Print', 'prtsc': 'Print', 'prtscr': 'Print',
+    'numlock': 'Num_Lock', 'scrolllock': 'Scroll_Lock', 'modechange': 'Mode_switch',
+    'add': 'KP_Add', 'subtract': 'KP_Subtract', 'multiply': 'KP_Multiply', 'divide': 'KP_Divide',
+    'decimal': 'KP_Decimal', 'separator': 'KP_Separator',
+    'convert': 'Henkan', 'nonconvert': 'Muhenkan', 'kana': 'Katakana', 'kanji': 'Kanji',
+    'hangul': 'Hangul', 'hanguel': 'Hangul', 'hanja': 'Hangul_Hanja', 'yen': 'yen',
+    'volumeup': 'XF86AudioRaiseVolume', 'volumedown': 'XF86AudioLowerVolume', 'volumemute': 'XF86AudioMute',
+    'playpause': 'XF86AudioPlay', 'stop': 'XF86AudioStop', 'nexttrack': 'XF86AudioNext', 'prevtrack': 'XF86AudioPrev',
+    'browserback': 'XF86Back', 'browserforward': 'XF86Forward', 'browserrefresh': 'XF86Refresh',
+    'browserstop': 'XF86Stop', 'browsersearch': 'XF86Search', 'browserfavorites': 'XF86Favorites',
+    'browserhome': 'XF86HomePage', 'launchmail': 'XF86Mail', 'launchmediaselect': 'XF86AudioMedia',
+    'launchapp1': 'XF86Launch0', 'launchapp2': 'XF86Launch1', 'sleep': 'XF86Sleep',
+    **{f"f{i}": f"F{i}" for i in range(1, 25)},
+    **{f"num{i}": f"KP_{i}" for i in range(10)},
+}
+
+
+class X11Window:
+    """A top-level X window as XTestBackend reports it; the title is read from the server on each access."""
+
+    def __init__(self, backend, window_id):
+        self.backend = backend
+        self.id = window_id
+
+    @property
+    def title(self):
+        return self.backend._window_title(self.id)
+
+    def __eq__(self, other):
+        return isinstance(other, X11Window) and other.id == self.id
+
+    def __hash__(self):
+        return hash(self.id)
+
+    def __repr__(self):
+        return f"X11Window(0x{self.id:x})"
+
+
+class XTestBackend(InputBackend):
+    """Sends key events straight to the X server through the XTEST extension (libX11/libXtst via ctypes).
+
+    A shortcut's presses and releases are queued and sent in one flush, with
+    'input_event_spacing_ms' between them (applied by the server; default 0),
+    instead of one PyAutoGUI call with its PAUSE per event. Linux/X11 only.
+    The active window (and its title and PID) comes from the window manager's
+    _NET_ACTIVE_WINDOW; like PyAutoGUI there, it can't list or activate windows.
+    """
+    name = "xtest"
+    supports_focus_check = True
+    key_names = frozenset(key for key in KEY_NAMES if len(key) == 1 or key in X_KEYSYM_NAMES)
+
+    def __init__(self):
+        import ctypes
+        import ctypes.util
+        libraries = {}
+        for library, package in (("X11", "libx11-6"), ("Xtst", "libxtst6")):
+            path = ctypes.util.find_library(library)
+            if path is None:
+                raise RuntimeError(f"lib{library} not found (install {package} or your distribution's equivalent)")
+            libraries[library] = ctypes.CDLL(path)
+        self._x11, self._xtst = libraries["X11"], libraries["Xtst"]
+        self._x11.XOpenDisplay.restype = ctypes.c_void_p
+        self._x11.XOpenDisplay.argtypes = [ctypes.c_char_p]
+        self._x11.XStringToKeysym.restype = ctypes.c_ulong
+        self._x11.XStringToKeysym.argtypes = [ctypes.c_char_p]
+        self._x11.XKeysymToKeycode.restype = ctypes.c_ubyte
+        self._x11.XKeysymToKeycode.argtypes = [ctypes.c_void_p, ctypes.c_ulong]
+        self._x11.XkbKeycodeToKeysym.restype = ctypes.c_ulong
+        self._x11.XkbKeycodeToKeysym.argtypes = [ctypes.c_void_p, ctypes.c_ubyte, ctypes.c_int, ctypes.c_int]
+        self._x11.XFlush.argtypes = [ctypes.c_void_p]
+        self._xtst.XTestQueryExtension.argtypes = [ctypes.c_void_p] + [ctypes.POINTER(ctypes.c_int)] * 4
+        self._xtst.XTestFakeKeyEvent.argtypes = [ctypes.c_void_p, ctypes.c_uint, ctypes.c_int, ctypes.c_ulong]
+        self._x11.XDefaultRootWindow.restype = ctypes.c_ulong
+        self._x11.XDefaultRootWindow.argtypes = [ctypes.c_void_p]
+        self._x11.XInternAtom.restype = ctypes.c_ulong
+        self._x11.XInternAtom.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_int]
+        self._x11.XGetWindowProperty.argtypes = [
+            ctypes.c_void_p, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_long, ctypes.c_long, ctypes.c_int, ctypes.c_ulong,
+            ctypes.POINTER(ctypes.c_ulong), ctypes.POINTER(ctypes.c_int), ctypes.POINTER(ctypes.c_ulong),
+            ctypes.POINTER(ctypes.c_ulong), ctypes.POINTER(ctypes.POINTER(ctypes.c_ubyte))]
+        self._x11.XFree.argtypes = [ctypes.c_void_p]
+        # Xlib's default error handler exits the process, e.g. on a BadWindow for
+        # a window closed between two calls; errors make the call return no data instead
+        error_handler_type = ctypes.CFUNCTYPE(ctypes.c_int, ctypes.c_void_p, ctypes.c_void_p)
+        self._error_handler = error_handler_type(lambda display, event: 0) # Kept alive with the backend
+        self._x11.XSetErrorHandler.restype = ctypes.c_void_p
+        self._x11.XSetErrorHandler.argtypes = [error_handler_type]
+        self._x11.XSetErrorHandler(self._error_handler)
+        self._ctypes = ctypes
+
+        self._display = self._x11.XOpenDisplay(None)
+        if not self._display:
+            raise RuntimeError(f"can't open X display '{os.getenv('DISPLAY', '')}'")
+        dummy = [ctypes.c_int() for _ in range(4)]
+        if not self._xtst.XTestQueryExtension(self._display, *[ctypes.byref(value) for value in dummy]):
+            raise RuntimeError("the X server doesn't support the XTEST extension")
+        self.event_spacing_ms = 0
+        self._keycodes = {} # key name -> [keycode, ...] to hold down for it (Shift first if needed)
+        self._root = self._x11.XDefaultRootWindow(self._display)
+        self._atoms = {}
+
+    def _atom(self, name):
+        atom = self._atoms.get(name)
+        if atom is None:
+            atom = self._atoms[name] = self._x11.XInternAtom(self._display, name.encode(), False)
+        return atom
+
+    def _property(self, window_id, name):
+        """A window property: bytes for 8-bit data, a list of ints for 32-bit data, None if unset."""
+        ctypes = self._ctypes
+        actual_type, actual_format = ctypes.c_ulong(), ctypes.c_int()
+        count, bytes_after = ctypes.c_ulong(), ctypes.c_ulong()
+        data = ctypes.POINTER(ctypes.c_ubyte)()
+        status = self._x11.XGetWindowProperty(
+            self._display, window_id, self._atom(name), 0, 4096, False, 0, # 0: AnyPropertyType
+            ctypes.byref(actual_type), ctypes.byref(actual_format), ctypes.byref(count),
+            ctypes.byref(bytes_after), ctypes.byref(data))
+        if status != 0 or not data:
+            return None
+        try:
+            if actual_format.value == 32: # Xlib hands 32-bit items over as C longs
+                return list(ctypes.cast(data, ctypes.POINTER(ctypes.c_ulong))[:count.value])
+            return bytes(data[:count.value])
+        finally:
+            self._x11.XFree(data)
+
+    def _window_title(self, window_id):
+        title = self._property(window_id, "_NET_WM_NAME") or self._property(window_id, "WM_NAME")
+        return title.decode("utf-8", errors="replace") if isinstance(title, bytes) else None
+
+    def get_active_window(self):
+        active = self._property(self._root, "_NET_ACTIVE_WINDOW")
+        return X11Window(self, active[0]) if isinstance(active, list) and active and active[0] else None
+
+    def window_pid(self, window):
+        pid = self._property(window.id, "_NET_WM_PID") if isinstance(window, X11Window) else None
+        return pid[0] if isinstance(pid, list) and pid else None
+
+    def configure(self, settings):
+        spacing = settings.get(EVENT_SPACING_SETTING, 0)
+        if isinstance(spacing, (int, float)) and not isinstance(spacing, bool) and spacing >= 0:
+            self.event_spacing_ms = int(spacing)
+        else:
+            print(f"Warning: Ignoring '{EVENT_SPACING_SETTING}': {spacing!r} (expected milliseconds >= 0).", file=sys.stderr)
+
+    def _keysym(self, key):
+        if key in X_KEYSYM_NAMES:
+            return self._x11.XStringToKeysym(X_KEYSYM_NAMES[key].encode())
+        if len(key) == 1 and " " <= key <= "~":
+            return ord(key) # Latin-1 keysyms are the code points
+        return 0
+
+    def _keycodes_for(self, key):
+        """Keycodes that type `key` in the current keymap (with Shift for shifted symbols)."""
+        keycodes = self._keycodes.get(key)
+        if keycodes is None:
+            keysym = self._keysym(key)
+            keycode = self._x11.XKeysymToKeycode(self._display, keysym) if keysym else 0
+            if not keycode:
+                raise ValueError(f"no key for '{key}' in the X keyboard map")
+            keycodes = [keycode]
+            if self._x11.XkbKeycodeToKeysym(self._display, keycode, 0, 0) != keysym and \
+                    self._x11.XkbKeycodeToKeysym(self._display, keycode, 0, 1) == keysym:
+                keycodes.insert(0, self._keycodes_for("shift")[0])
+            self._keycodes[key] = keycodes
+        return keycodes
+
+    def _send(self, keys):
+        """Presses `keys` in order, releases them in reverse, and flushes the whole chord at once."""
+        pressed = [keycode for key in keys for keycode in self._keycodes_for(key)]
+        events = [(keycode, True) for keycode in pressed] + [(keycode, False) for keycode in reversed(pressed)]
+        for index, (keycode, is_press) in enumerate(events):
+            self._xtst.XTestFakeKeyEvent(self._display, keycode, is_press, self.event_spacing_ms if index else 0)
+        self._x11.XFlush(self._display)
+
+    def press(self, key):
+        self._send([key])
+
+    def hotkey(self, *keys):
+        self._send(keys)
+
+
+class FakeWindow:
+    """Stand-in for a PyGetWindow window, for the recording backend."""
+
+    def __init__(self, title, pid=None, isMinimized=False, backend=None):
+        self.title = title
+        self.pid = pid
+        self.isMinimized = isMinimized
+        self.backend = backend
+
+    def activate(self):
+        if self.backend is not None:
+            self.backend._record("activate", self.title)
+            self.backend.active_window = self
+
+    focus = activate
+
+    def __repr__(self):
+        return f"FakeWindow({self.title!r}, pid={self.pid})"
+
+
+class RecordingBackend(InputBackend):
+    """No-op backend that only records what would have been sent.
+
+    Useful on headless machines and for benchmarks. Events are kept in
+    `events` and, if VV_WKSPACE_RECORD_FILE is set, appended to that file.
+    """
+    name = "recording"
+
+    def __init__(self, windows=None):
+        self.events = []
+        # Fake window objects; without them this backend behaves like a windowless platform
+        self.windows = list(windows) if windows is not None else []
+        self.supports_windows = self.supports_focus_check = windows is not None
+        self.active_window = None
+        for window in self.windows:
+            if isinstance(window, FakeWindow):
+                window.backend = self
+        self._record_file = os.getenv(RECORD_FILE_ENV_VAR)
+
+    def _record(self, action, *args):
+        event = {"t": time.monotonic(), "action": action, "args": list(args)}
+        self.events.append(event)
+        if self._record_file:
+            with open(self._record_file, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(event) + "\n")
+
+    def press(self, key):
+        self._record("press", key)
+
+    def hotkey(self, *keys):
+        self._record("hotkey", *keys)
+
+    def get_all_windows(self):
+        return list(self.windows)
+
+    def get_active_window(self):
+        return self.active_window
+
+    def window_pid(self, window):
+        return getattr(window, 'pid', None)
+
+
+BACKENDS = {
+    PyAutoGUIBackend.name: PyAutoGUIBackend,
+    XTestBackend.name: XTestBackend,
+    RecordingBackend.name: RecordingBackend,
+    "noop": RecordingBackend,
+}
+
+_loaded_backends = {}
+
+def resolve_backend_name(name=None, settings=None):
+    """Applies the defaults: explicit name, then $VV_WKSPACE_BACKEND, then the config's 'input_backend', then DEFAULT_BACKEND."""
+    return name or os.getenv(BACKEND_ENV_VAR) or (settings or {}).get(BACKEND_SETTING) or DEFAULT_BACKEND
+
+def get_key_names(name=None, settings=None):
+    """Returns the key-name vocabulary of a backend without loading it (chosen as in resolve_backend_name())."""
+    backend_class = BACKENDS.get(resolve_backend_name(name, settings))
+    return backend_class.key_names if backend_class else KEY_NAMES
+
+def get_backend(name=None, settings=None):
+    """Returns the (cached) backend instance for `name`, or None if it can't be loaded.
+
+    `settings` (the config's options) pick the backend if `name` and the
+    environment don't, and are passed to its configure().
+    """
+    name = resolve_backend_name(name, settings)
+    if name in _loaded_backends:
+        backend = _loaded_backends[name]
+        if settings is not None:
+            backend.configure(settings)
+        return backend
+    if name not in BACKENDS:
+        print(f"ERROR: Unknown input backend '{name}'. Choose from: {', '.join(BACKENDS)}", file=sys.stderr)
+        return None
+
+    try:
+        backend = BACKENDS[name]()
+    except ImportError as e:
+        print(f"ERROR: Input backend '{name}' needs a module that isn't installed: {e}", file=sys.stderr)
+        if name == "pyautogui":
+            print("Please install it: pip install PyAutoGUI", file=sys.stderr)
+        print("You might also need OS dependencies (see README/setup-info).", file=sys.stderr)
+        return None
+    except Exception as e:
+        # Catch other potential backend init errors (e.g., display issues on Linux)
+        print(f"ERROR: Failed to import or initialize input backend '{name}': {e}", file=sys.stderr)
+        print("Ensure you have a graphical environment and necessary OS dependencies.", file=sys.stderr)
+        return None
+
+    if settings is not None:
+        backend.configure(settings)
+    _loaded_backends[name] = backend
+    return backend
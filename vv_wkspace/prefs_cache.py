@@ -0,0 +1,83 @@
+# src/vivaldi_workspace_cli/prefs_cache.py
+import json
+import os
+import threading
+
+from . import config
+
+PREFS_CACHE_FILENAME = "prefs_cache.json"
+PREFS_CACHE_VERSION = 1
+# Upper bound for the cache file; least recently used profiles are evicted first.
+PREFS_CACHE_MAX_BYTES = 256 * 1024
+
+# Serializes read-modify-write of the cache file between threads (e.g. the multi-profile index)
+_cache_lock = threading.Lock()
+
+def get_cache_path():
+    """Gets the path of the parsed-Preferences cache file."""
+    return os.path.join(config.get_config_dir(), PREFS_CACHE_FILENAME)
+
+def _valid_records(records):
+    """Checks that cached workspace records look like what we store."""
+    return isinstance(records, list) and all(
+        isinstance(r, dict) and isinstance(r.get("name"), str) for r in records)
+
+def _read_entries():
+    """Reads cache entries (oldest first). Any problem yields an empty cache."""
+    data = config.read_state_file(PREFS_CACHE_FILENAME)
+    if not isinstance(data, dict) or data.get("version") != PREFS_CACHE_VERSION \
+            or not isinstance(data.get("profiles"), dict):
+        return {} # Missing, corrupt or from another version: just parse again
+    return data["profiles"]
+
+def _write_entries(entries):
+    """Writes entries atomically, evicting least recently used ones over the size bound."""
+    sizes = {path: len(json.dumps(entry)) for path, entry in entries.items()}
+    total = sum(sizes.values())
+    for path in list(entries)[:-1]: # Always keep the most recent entry
+        if total <= PREFS_CACHE_MAX_BYTES:
+            break
+        total -= sizes[path]
+        del entries[path]
+    config.write_state_file(PREFS_CACHE_FILENAME, {"version": PREFS_CACHE_VERSION, "profiles": entries})
+
+def lookup_many(identities):
+    """Returns {prefs_file: records} for every file in `identities` whose cached identity still matches.
+
+    `identities` maps Preferences paths to their current file identity. The
+    cache file is read once (and rewritten at most once to update LRU order).
+    """
+    with _cache_lock:
+        entries = _read_entries()
+        found = {}
+        for prefs_file, identity in identities.items():
+            key = os.path.abspath(prefs_file)
+            entry = entries.get(key)
+            if isinstance(entry, dict) and entry.get("key") == identity and _valid_records(entry.get("records")):
+                found[prefs_file] = entry["records"]
+        keys = [os.path.abspath(prefs_file) for prefs_file in found]
+        if keys and list(entries)[-len(keys):] != keys: # Mark as most recently used
+            for key in keys:
+                entries[key] = entries.pop(key)
+            _write_entries(entries)
+        return found
+
+def store_many(items):
+    """Stores {prefs_file: (identity, records)} in one cache write."""
+    if not items:
+        return
+    with _cache_lock:
+        entries = _read_entries()
+        for prefs_file, (identity, records) in items.items():
+            key = os.path.abspath(prefs_file)
+            entries.pop(key, None)
+            entries[key] = {"key": identity, "records": records}
+        _write_entries(entries)
+
+def lookup(prefs_file, identity):
+    """Returns cached workspace records for `prefs_file` if its identity still matches."""
+    return lookup_many({prefs_file: identity}).get(prefs_file)
+
+def store(prefs_file, identity, records):
+    """Stores workspace records for `prefs_file` under its current identity."""
+    store_many({prefs_file: (identity, records)})
@@ -0,0 +1,168 @@
+# src/vivaldi_workspace_cli/search_index.py
+"""'search': finds the workspace holding a page, from a SQLite FTS5 index of open tabs.
+
+The index (search_index.sqlite3 in the config dir) holds the title, URL and
+workspace name of every tab in each profile's newest session file
+(sessions.read_tabs), with names from Preferences. Before each query it is
+brought up to date incrementally: every source file's identity (inode,
+size, mtime) is recorded, and only the files that changed are read again.
+A new or changed session file replaces that profile's tabs; a changed
+Preferences file only renames workspaces in place. An unchanged index costs
+a few stat() calls, so queries take milliseconds.
+"""
+import collections
+import json
+import os
+import re
+import sqlite3
+import sys
+
+from . import config
+from . import sessions
+from . import vivaldi_utils
+
+SEARCH_INDEX_FILENAME = "search_index.sqlite3"
+# Bump when the schema changes; an index of another version is rebuilt
+SEARCH_INDEX_VERSION = 1
+# Column weights for bm25(): a hit in the title counts most, then the workspace name, then the URL
+RANK_WEIGHTS = (10.0, 2.0, 5.0)
+DEFAULT_LIMIT = 20
+
+SearchHit = collections.namedtuple("SearchHit", ["profile", "workspace", "workspace_id", "title", "url", "rank"])
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sources (
+    path TEXT PRIMARY KEY, profile TEXT NOT NULL, kind TEXT NOT NULL, identity TEXT NOT NULL);
+CREATE VIRTUAL TABLE IF NOT EXISTS tabs USING fts5(
+    title, url, workspace, profile UNINDEXED, workspace_id UNINDEXED, source UNINDEXED,
+    tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3');
+"""
+
+
+class SearchIndexError(Exception):
+    """The index can't be opened (e.g. SQLite without FTS5)."""
+
+
+def get_index_path():
+    return os.path.join(config.get_config_dir(), SEARCH_INDEX_FILENAME)
+
+
+def open_index(path=None):
+    """Opens (creating or rebuilding as needed) the index database."""
+    path = path or get_index_path()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    try:
+        db = sqlite3.connect(path)
+        if db.execute("PRAGMA user_version").fetchone()[0] != SEARCH_INDEX_VERSION:
+            db.executescript("DROP TABLE IF EXISTS sources; DROP TABLE IF EXISTS tabs;")
+        db.executescript(_SCHEMA)
+        db.execute(f"PRAGMA user_version = {SEARCH_INDEX_VERSION}")
+        db.commit()
+    except sqlite3.DatabaseError as e:
+        raise SearchIndexError(f"can't open search index '{path}': {e}")
+    return db
+
+
+def _workspace_names(profile):
+    records = vivaldi_utils.get_workspace_records_from_prefs(profile.path) or []
+    return {sessions._workspace_key(record["id"]): record["name"] for record in records if record.get("id") is not None}
+
+
+def _index_session(db, profile, path, names):
+    """Replaces the profile's tabs with those of session file `path`. Returns False if it can't be read."""
+    db.execute("DELETE FROM tabs WHERE profile = ?", (profile.directory,))
+    try:
+        tabs = list(sessions.read_tabs(path, profile.directory, names))
+    except (OSError, sessions.SessionFileError) as e:
+        print(f"Warning: Could not read session file '{path}': {e}", file=sys.stderr)
+        return False
+    db.executemany("INSERT INTO tabs (title, url, workspace, profile, workspace_id, source) VALUES (?, ?, ?, ?, ?, ?)",
+                   [(tab.title or "", tab.url or "", tab.workspace or "", profile.directory,
+                     tab.workspace_id, path) for tab in tabs])
+    return True
+
+
+def _rename_workspaces(db, profile, names):
+    """Brings the workspace names of a profile's indexed tabs in line with `names`."""
+    rows = db.execute("SELECT DISTINCT workspace_id, workspace FROM tabs WHERE profile = ? AND workspace_id IS NOT NULL",
+                      (profile.directory,)).fetchall()
+    for workspace_id, indexed_name in rows:
+        name = names.get(workspace_id, "")
+        if name != indexed_name:
+            db.execute("UPDATE tabs SET workspace = ? WHERE profile = ? AND workspace_id = ?",
+                       (name, profile.directory, workspace_id))
+
+
+def update_index(db, profiles):
+    """Re-reads the changed source files of `profiles` (all of the user data dir's). Returns how many were read.
+
+    Profiles not in `profiles` are dropped from the index, so pass all of
+    them and narrow a query with search() instead.
+    """
+    indexed = {path: (profile, kind, identity)
+               for path, profile, kind, identity in db.execute("SELECT path, profile, kind, identity FROM sources")}
+    current = {profile.directory for profile in profiles}
+    read = 0
+    with db: # One transaction: readers never see a half-updated profile
+        for path, (directory, _, _) in indexed.items():
+            if directory not in current:
+                db.execute("DELETE FROM tabs WHERE profile = ?", (directory,))
+                db.execute("DELETE FROM sources WHERE path = ?", (path,))
+        for profile in profiles:
+            prefs_path = os.path.join(profile.path, "Preferences")
+            session_path = next(iter(sessions.find_session_files(profile.path)), None)
+            prefs_identity = json.dumps(config.file_identity(prefs_path))
+            session_identity = json.dumps(config.file_identity(session_path)) if session_path else None
+            old = {kind: (path, identity) for path, (directory, kind, identity) in indexed.items()
+                   if directory == profile.directory}
+            session_changed = old.get("session") != ((session_path, session_identity) if session_path else None)
+            prefs_changed = old.get("prefs") != (prefs_path, prefs_identity)
+            if not session_changed and not prefs_changed:
+                continue
+            names = _workspace_names(profile)
+            if session_changed:
+                db.execute("DELETE FROM sources WHERE profile = ? AND kind = 'session'", (profile.directory,))
+                if session_path and _index_session(db, profile, session_path, names):
+                    db.execute("INSERT INTO sources VALUES (?, ?, 'session', ?)",
+                               (session_path, profile.directory, session_identity))
+                    read += 1 # Not recorded if unreadable, so the next update tries again
+                elif not session_path:
+                    db.execute("DELETE FROM tabs WHERE profile = ?", (profile.directory,))
+            elif prefs_changed:
+                _rename_workspaces(db, profile, names)
+            if prefs_changed:
+                db.execute("INSERT OR REPLACE INTO sources VALUES (?, ?, 'prefs', ?)",
+                           (prefs_path, profile.directory, prefs_identity))
+                read += 1
+    return read
+
+
+def build_query(text):
+    """Turns free text into an FTS5 query: every word must match, as a prefix."""
+    words = re.findall(r"\w+", text)
+    return " ".join('"' + word.replace('"', '""') + '"*' for word in words)
+
+
+def search(db, text, profiles=None, limit=DEFAULT_LIMIT):
+    """Returns the best SearchHits for `text`, best first (only `profiles` if given)."""
+    query = build_query(text)
+    if not query:
+        return []
+    sql = (f"SELECT profile, workspace, workspace_id, title, url, bm25(tabs, {', '.join(map(str, RANK_WEIGHTS))}) AS score "
+           "FROM tabs WHERE tabs MATCH ?")
+    params = [query]
+    if profiles is not None:
+        sql += f" AND profile IN ({', '.join('?' for _ in profiles)})"
+        params += [profile.directory for profile in profiles]
+    sql += " ORDER BY score LIMIT ?" # bm25() is lower for better matches
+    params.append(limit)
+    return [SearchHit(profile, workspace or None, workspace_id, title, url, rank)
+            for profile, workspace, workspace_id, title, url, rank in db.execute(sql, params)]
+
+
+def best_workspace(hits):
+    """The (profile directory, workspace name) of the best hit that is in a workspace, or None."""
+    for hit in hits:
+        if hit.workspace is not None:
+            return hit.profile, hit.workspace
+    return None
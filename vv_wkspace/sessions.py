@@ -0,0 +1,306 @@
+# src/vivaldi_workspace_cli/sessions.py
+"""Tabs per workspace, from Vivaldi's session files (Chromium's SNSS format).
+
+<profile>/Sessions/Session_<time> logs the open windows and tabs as a stream
+of commands; Tabs_<time> logs recently closed tabs the same way. A file is
+b"SNSS", an int32 version, then commands of [uint16 size][uint8 id][payload
+of size - 1 bytes]. Payloads are plain structs or base::Pickles (uint32
+payload size, then fields aligned to 4 bytes).
+
+The file is memory-mapped and walked by command headers; only the payloads
+of the few command types needed are decoded, in place, so session files of
+hundreds of MB are never read whole or copied. Replaying the log keeps just
+the URL and title of each tab's navigations.
+
+Vivaldi keeps a tab's workspace in its 'ext data', a JSON string in a
+Vivaldi-specific command whose id isn't part of Chromium's. It's found
+heuristically: a command of an id not decoded otherwise whose payload
+mentions "workspaceId" is read as a pickle of (tab id, string).
+"""
+import collections
+import json
+import mmap
+import os
+import stat
+import struct
+import sys
+
+from . import vivaldi_utils
+
+SNSS_MAGIC = b"SNSS"
+# 1 and 3 (3 adds a marker command); 2 and 4 are their encrypted variants
+SUPPORTED_VERSIONS = (1, 3)
+SESSION_PREFIX = "Session_"
+TABS_PREFIX = "Tabs_"
+WORKSPACE_ID_KEY = b"workspaceId"
+
+# Session_* command ids (components/sessions/core/session_service_commands.cc)
+CMD_SET_TAB_WINDOW = 0
+CMD_SET_TAB_INDEX_IN_WINDOW = 2
+CMD_TAB_NAVIGATION_PATH_PRUNED_FROM_BACK = 5
+CMD_UPDATE_TAB_NAVIGATION = 6
+CMD_SET_SELECTED_NAVIGATION_INDEX = 7
+CMD_TAB_NAVIGATION_PATH_PRUNED_FROM_FRONT = 11
+CMD_SET_PINNED_STATE = 12
+CMD_TAB_CLOSED = 16
+CMD_WINDOW_CLOSED = 17
+CMD_TAB_NAVIGATION_PATH_PRUNED = 24
+# Tabs_* command ids (tab_restore_service_impl.cc)
+RESTORE_CMD_UPDATE_TAB_NAVIGATION = 1
+RESTORE_CMD_RESTORED_ENTRY = 2
+RESTORE_CMD_SELECTED_NAVIGATION_IN_TAB = 4
+RESTORE_CMD_PINNED_STATE = 5
+
+_HEADER = struct.Struct("<4si")
+_COMMAND_SIZE = struct.Struct("<H")
+_INT32 = struct.Struct("<i")
+_TWO_INT32 = struct.Struct("<ii")
+
+# One tab in its current state. `workspace` is the name from Preferences, or
+# None if the tab isn't in a workspace (or the workspace is gone).
+SessionTab = collections.namedtuple("SessionTab", ["profile", "tab_id", "window_id", "index", "url", "title",
+                                                   "pinned", "workspace_id", "workspace", "closed"])
+
+
+class SessionFileError(Exception):
+    """The file isn't a readable SNSS session file."""
+
+
+class _Pickle:
+    """Reads base::Pickle fields straight from the mapped file."""
+    __slots__ = ("buf", "pos", "end")
+
+    def __init__(self, buf, start, end):
+        if end - start < 4:
+            raise ValueError("truncated pickle")
+        self.buf = buf
+        self.pos = start + 4
+        self.end = min(end, self.pos + _INT32.unpack_from(buf, start)[0])
+
+    def int32(self):
+        if self.pos + 4 > self.end:
+            raise ValueError("truncated pickle")
+        value = _INT32.unpack_from(self.buf, self.pos)[0]
+        self.pos += 4
+        return value
+
+    def _bytes(self, length):
+        if length < 0 or self.pos + length > self.end:
+            raise ValueError("bad pickle string length")
+        data = self.buf[self.pos:self.pos + length]
+        self.pos += (length + 3) & ~3
+        return data
+
+    def string(self):
+        return self._bytes(self.int32()).decode("utf-8", errors="replace")
+
+    def string16(self):
+        return self._bytes(self.int32() * 2).decode("utf-16-le", errors="replace")
+
+
+class _Tab:
+    __slots__ = ("window_id", "index", "navigations", "selected", "pinned", "workspace_id")
+
+    def __init__(self):
+        self.window_id = None
+        self.index = None
+        self.navigations = {} # navigation index -> (url, title)
+        self.selected = None
+        self.pinned = False
+        self.workspace_id = None
+
+    def current_navigation(self):
+        if not self.navigations:
+            return None
+        if self.selected in self.navigations:
+            return self.navigations[self.selected]
+        return self.navigations[max(self.navigations)]
+
+
+def iter_commands(buf):
+    """Yields (command id, payload start, payload end) for each command of a mapped SNSS file."""
+    if len(buf) < _HEADER.size:
+        raise SessionFileError("file too short")
+    magic, version = _HEADER.unpack_from(buf, 0)
+    if magic != SNSS_MAGIC:
+        raise SessionFileError("not an SNSS file")
+    if version not in SUPPORTED_VERSIONS:
+        raise SessionFileError(f"unsupported SNSS version {version} (encrypted?)")
+    pos = _HEADER.size
+    length = len(buf)
+    while pos + 3 <= length:
+        size = _COMMAND_SIZE.unpack_from(buf, pos)[0]
+        end = pos + 2 + size
+        if size == 0 or end > length:
+            break # Truncated: Vivaldi was writing this command as we mapped the file
+        yield buf[pos + 2], pos + 3, end
+        pos = end
+
+
+def _workspace_key(value):
+    """Workspace ids are stored as JSON numbers (often floats); compare them as ints."""
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return value
+
+
+def _read_ext_data(buf, start, end):
+    """(tab id, workspace id) from a Vivaldi ext data command, or None."""
+    try:
+        pickle = _Pickle(buf, start, end)
+        tab_id = pickle.int32()
+        data = json.loads(pickle.string())
+    except ValueError:
+        return None
+    if isinstance(data, dict) and data.get("workspaceId") is not None:
+        return tab_id, _workspace_key(data["workspaceId"])
+    return None
+
+
+def _replay(buf, closed_tabs):
+    """Replays the commands into {tab id: _Tab}. `closed_tabs`: the file is a Tabs_* (tab restore) log."""
+    if closed_tabs:
+        update_navigation, selected_navigation, pinned_state = (RESTORE_CMD_UPDATE_TAB_NAVIGATION,
+                                                                RESTORE_CMD_SELECTED_NAVIGATION_IN_TAB,
+                                                                RESTORE_CMD_PINNED_STATE)
+        decoded = {update_navigation, selected_navigation, pinned_state, RESTORE_CMD_RESTORED_ENTRY}
+    else:
+        update_navigation, selected_navigation, pinned_state = (CMD_UPDATE_TAB_NAVIGATION,
+                                                                CMD_SET_SELECTED_NAVIGATION_INDEX,
+                                                                CMD_SET_PINNED_STATE)
+        decoded = {update_navigation, selected_navigation, pinned_state, CMD_SET_TAB_WINDOW,
+                   CMD_SET_TAB_INDEX_IN_WINDOW, CMD_TAB_CLOSED, CMD_WINDOW_CLOSED,
+                   CMD_TAB_NAVIGATION_PATH_PRUNED_FROM_BACK, CMD_TAB_NAVIGATION_PATH_PRUNED_FROM_FRONT,
+                   CMD_TAB_NAVIGATION_PATH_PRUNED}
+    tabs = {}
+
+    def tab(tab_id):
+        state = tabs.get(tab_id)
+        if state is None:
+            state = tabs[tab_id] = _Tab()
+        return state
+
+    for command, start, end in iter_commands(buf):
+        try:
+            if command == update_navigation:
+                pickle = _Pickle(buf, start, end)
+                tab_id, index = pickle.int32(), pickle.int32()
+                url = pickle.string()
+                tab(tab_id).navigations[index] = (url, pickle.string16())
+            elif command not in decoded:
+                # Cheap test first: find() scans the mapped bytes without copying them
+                if buf.find(WORKSPACE_ID_KEY, start, end) != -1:
+                    found = _read_ext_data(buf, start, end)
+                    if found is not None:
+                        tab(found[0]).workspace_id = found[1]
+            elif command == selected_navigation:
+                tab_id, index = _TWO_INT32.unpack_from(buf, start)
+                tab(tab_id).selected = index
+            elif command == pinned_state:
+                tab_id = _INT32.unpack_from(buf, start)[0]
+                tab(tab_id).pinned = buf[start + 4] != 0
+            elif closed_tabs: # RESTORE_CMD_RESTORED_ENTRY: the entry was reopened
+                tabs.pop(_INT32.unpack_from(buf, start)[0], None)
+            elif command == CMD_SET_TAB_WINDOW:
+                window_id, tab_id = _TWO_INT32.unpack_from(buf, start)
+                tab(tab_id).window_id = window_id
+            elif command == CMD_SET_TAB_INDEX_IN_WINDOW:
+                tab_id, index = _TWO_INT32.unpack_from(buf, start)
+                tab(tab_id).index = index
+            elif command == CMD_TAB_CLOSED:
+                tabs.pop(_INT32.unpack_from(buf, start)[0], None)
+            elif command == CMD_WINDOW_CLOSED:
+                window_id = _INT32.unpack_from(buf, start)[0]
+                for tab_id in [t for t, state in tabs.items() if state.window_id == window_id]:
+                    del tabs[tab_id]
+            elif command == CMD_TAB_NAVIGATION_PATH_PRUNED_FROM_BACK:
+                tab_id, index = _TWO_INT32.unpack_from(buf, start) # Entries from `index` on were dropped
+                state = tab(tab_id)
+                state.navigations = {i: nav for i, nav in state.navigations.items() if i < index}
+            elif command == CMD_TAB_NAVIGATION_PATH_PRUNED_FROM_FRONT:
+                tab_id, count = _TWO_INT32.unpack_from(buf, start)
+                state = tab(tab_id)
+                state.navigations = {i - count: nav for i, nav in state.navigations.items() if i >= count}
+            elif command == CMD_TAB_NAVIGATION_PATH_PRUNED:
+                tab_id, index = _TWO_INT32.unpack_from(buf, start)
+                count = _INT32.unpack_from(buf, start + 8)[0]
+                state = tab(tab_id)
+                state.navigations = {(i if i < index else i - count): nav for i, nav in state.navigations.items()
+                                     if not index <= i < index + count}
+        except (ValueError, struct.error, IndexError):
+            continue # A short or malformed command doesn't spoil the rest of the log
+    return tabs
+
+
+def read_tabs(path, profile=None, workspace_names=None):
+    """Yields a SessionTab for each tab in a Session_* (open) or Tabs_* (recently closed) file.
+
+    `workspace_names` maps workspace ids (as ints) to names, for the
+    `workspace` field. Tabs come ordered by window, then position.
+    """
+    closed = os.path.basename(path).startswith(TABS_PREFIX)
+    workspace_names = workspace_names or {}
+    with open(path, 'rb') as f:
+        try:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            raise SessionFileError("empty file")
+    try:
+        tabs = _replay(buf, closed)
+    finally:
+        buf.close()
+    order = sorted(tabs.items(), key=lambda item: (item[1].window_id is None, item[1].window_id or 0,
+                                                    item[1].index if item[1].index is not None else sys.maxsize,
+                                                    item[0]))
+    for tab_id, state in order:
+        navigation = state.current_navigation()
+        if navigation is None:
+            continue # Only ext data or a stray command; no page to report
+        yield SessionTab(profile, tab_id, state.window_id, state.index, navigation[0], navigation[1],
+                         state.pinned, state.workspace_id, workspace_names.get(state.workspace_id), closed)
+
+
+def find_session_files(profile_path, prefix=SESSION_PREFIX):
+    """Session files with `prefix` in a profile's Sessions dir, newest first."""
+    sessions_dir = os.path.join(profile_path, "Sessions")
+    try:
+        entries = [os.path.join(sessions_dir, name) for name in os.listdir(sessions_dir) if name.startswith(prefix)]
+    except OSError:
+        return []
+    files = []
+    for path in entries:
+        try:
+            status = os.stat(path)
+        except OSError:
+            continue # Rotated away since listdir()
+        if stat.S_ISREG(status.st_mode):
+            files.append((path, status.st_mtime_ns))
+    return [path for path, _ in sorted(files, key=lambda entry: entry[1], reverse=True)]
+
+
+def workspace_tabs(profile, include_closed=False):
+    """Yields the SessionTabs of a vivaldi_utils.Profile's newest session, with workspace names.
+
+    With `include_closed`, recently closed tabs (newest Tabs_* file) follow.
+    Unreadable session files are reported and skipped.
+    """
+    records = vivaldi_utils.get_workspace_records_from_prefs(profile.path) or []
+    names = {_workspace_key(record["id"]): record["name"] for record in records if record.get("id") is not None}
+    paths = find_session_files(profile.path)[:1]
+    if include_closed:
+        paths += find_session_files(profile.path, TABS_PREFIX)[:1]
+    for path in paths:
+        try:
+            yield from read_tabs(path, profile.directory, names)
+        except (OSError, SessionFileError) as e:
+            print(f"Warning: Could not read session file '{path}': {e}", file=sys.stderr)
+
+
+def tab_counts(profile):
+    """Number of open tabs per workspace name in a profile's newest session."""
+    counts = collections.Counter()
+    for tab in workspace_tabs(profile):
+        if tab.workspace is not None:
+            counts[tab.workspace] += 1
+    return counts
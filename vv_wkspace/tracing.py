@@ -0,0 +1,187 @@
+# src/vivaldi_workspace_cli/tracing.py
+"""Per-phase timing of a run: spans, trace export and the rolling timings log.
+
+Code marks phases with `with tracing.span("name"):`. Until enable() is called
+(the CLI does so for 'launch' and 'list') a span is a shared no-op object, so
+instrumented code costs next to nothing in the daemon or when imported as a
+library. Timestamps come from time.monotonic().
+"""
+import contextlib
+import json
+import os
+import sys
+import threading
+import time
+
+TRACE_FORMATS = ("json", "chrome")
+TIMINGS_LOG_FILENAME = "timings.log"
+# The log keeps the newest half of its lines once it grows past this
+TIMINGS_LOG_MAX_BYTES = 1024 * 1024
+
+_events = None # (name, start, end, thread id, args) tuples while enabled
+_origin = None
+_wall_origin = None
+
+
+class _Span:
+    __slots__ = ("name", "args", "start")
+
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.monotonic()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        _events.append((self.name, self.start, time.monotonic(), threading.get_ident(), self.args))
+        return False
+
+    def note(self, **args):
+        """Attaches details (cache hit, PID, ...) to the span."""
+        self.args.update(args)
+
+
+class _NoSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def note(self, **args):
+        pass
+
+_NO_SPAN = _NoSpan()
+
+
+def enable():
+    """Starts recording spans (and discards earlier ones)."""
+    global _events, _origin, _wall_origin
+    _events = []
+    _origin = time.monotonic()
+    _wall_origin = time.time()
+
+def enabled():
+    return _events is not None
+
+def span(name, **args):
+    """Returns a context manager timing the phase `name` (a no-op unless enabled)."""
+    if _events is None:
+        return _NO_SPAN
+    return _Span(name, args)
+
+def record(name, start, end, **args):
+    """Records a phase already timed by the caller with time.monotonic()."""
+    if _events is not None:
+        _events.append((name, start, end, threading.get_ident(), args))
+
+def phases():
+    """Returns the recorded spans as dicts, ordered by start time."""
+    if not _events:
+        return []
+    threads = {}
+    result = []
+    for name, start, end, thread, args in sorted(list(_events), key=lambda event: event[1]):
+        result.append({"name": name,
+                       "start_ms": round((start - _origin) * 1000, 3),
+                       "duration_ms": round((end - start) * 1000, 3),
+                       "thread": threads.setdefault(thread, len(threads)),
+                       "args": args})
+    return result
+
+def to_json(command, total_ms):
+    """The trace as a plain JSON document."""
+    return {"version": 1, "command": command, "started_at": _wall_origin,
+            "total_ms": round(total_ms, 3), "pid": os.getpid(), "phases": phases()}
+
+def to_chrome(command):
+    """The trace in Chrome trace-event format (chrome://tracing, Perfetto)."""
+    pid = os.getpid()
+    events = [{"name": "process_name", "ph": "M", "pid": pid, "tid": 0,
+               "args": {"name": f"vivaldi_workspace {command}"}}]
+    for phase in phases():
+        events.append({"name": phase["name"], "cat": phase["name"].split(".")[0], "ph": "X",
+                       "ts": round(phase["start_ms"] * 1000), "dur": round(phase["duration_ms"] * 1000),
+                       "pid": pid, "tid": phase["thread"], "args": phase["args"]})
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+def write_trace(path, command, total_ms, trace_format="json"):
+    """Writes the trace to `path` in one of TRACE_FORMATS. Returns True on success."""
+    data = to_chrome(command) if trace_format == "chrome" else to_json(command, total_ms)
+    try:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=1)
+            f.write("\n")
+        return True
+    except (OSError, TypeError, ValueError) as e:
+        print(f"Warning: Could not write trace to '{path}': {e}", file=sys.stderr)
+        return False
+
+def get_timings_log_path():
+    from . import config
+    return os.path.join(config.get_config_dir(), TIMINGS_LOG_FILENAME)
+
+def append_to_log(command, ok, total_ms):
+    """Appends one NDJSON line (total and per-phase milliseconds) to the rolling timings log.
+
+    Best effort: like the caches, the log never fails a command.
+    """
+    totals = {}
+    for phase in phases():
+        totals[phase["name"]] = round(totals.get(phase["name"], 0.0) + phase["duration_ms"], 3)
+    line = json.dumps({"time": round(_wall_origin, 3), "command": command, "ok": ok,
+                       "total_ms": round(total_ms, 3), "phases": totals}) + "\n"
+    log_path = get_timings_log_path()
+    try:
+        os.makedirs(os.path.dirname(log_path), exist_ok=True)
+        with open(log_path, 'a', encoding='utf-8') as f:
+            f.write(line)
+            size = f.tell()
+        if size > TIMINGS_LOG_MAX_BYTES:
+            with open(log_path, 'r', encoding='utf-8') as f:
+                lines = f.readlines()
+            tmp_path = f"{log_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.writelines(lines[len(lines) // 2:])
+            os.replace(tmp_path, log_path)
+    except OSError:
+        pass
+
+@contextlib.contextmanager
+def session(command, trace_path=None, trace_format="json", cprofile_path=None):
+    """Times a whole CLI run: enables spans, optionally runs cProfile, then writes the outputs.
+
+    The run counts as successful unless it raises, or exits with a non-zero status.
+    """
+    enable()
+    profiler = None
+    if cprofile_path:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+    ok = False
+    try:
+        yield
+        ok = True
+    except SystemExit as e:
+        ok = e.code in (None, 0)
+        raise
+    finally:
+        total_ms = (time.monotonic() - _origin) * 1000
+        if profiler is not None:
+            profiler.disable()
+            try:
+                profiler.dump_stats(cprofile_path)
+                print(f"cProfile stats written to '{cprofile_path}' (view with: python -m pstats {cprofile_path}).",
+                      file=sys.stderr)
+            except OSError as e:
+                print(f"Warning: Could not write cProfile stats to '{cprofile_path}': {e}", file=sys.stderr)
+        if trace_path and write_trace(trace_path, command, total_ms, trace_format):
+            print(f"Trace ({trace_format}) written to '{trace_path}'.", file=sys.stderr)
+        append_to_log(command, ok, total_ms)
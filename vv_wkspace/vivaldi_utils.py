@@ -1,23 +1,42 @@
 # src/vivaldi_workspace_cli/vivaldi_utils.py
+import collections
+import concurrent.futures
 import os
 import platform
 import json
 import re
+import socket
 import sys
 
+from . import config
+from . import prefs_cache
+from . import tracing
+
+# One browser profile: its directory name ('Default', 'Profile 3'), display name and full path
+Profile = collections.namedtuple("Profile", ["directory", "name", "path"])
+# One row of the aggregated workspace index
+WorkspaceEntry = collections.namedtuple("WorkspaceEntry", ["profile", "name", "id"])
+
+# Upper bound on threads parsing the Preferences files of several profiles
+MAX_INDEX_WORKERS = 16
+
+def get_profile_base():
+    """Gets the platform-specific Vivaldi user data dir (which holds the profile dirs)."""
+    system = platform.system()
+    home = os.path.expanduser("~")
+    if system == "Windows":
+        return os.path.join(os.getenv('LOCALAPPDATA', ''), 'Vivaldi', 'User Data')
+    elif system == "Darwin":
+        return os.path.join(home, 'Library', 'Application Support', 'Vivaldi')
+    else: # Linux
+        return os.path.join(home, '.config', 'vivaldi')
+
 def find_profile_path():
     """Finds the default Vivaldi profile path."""
     system = platform.system()
-    home = os.path.expanduser("~")
     profile_dir = "Default"
     try:
-        if system == "Windows":
-            profile_base = os.path.join(os.getenv('LOCALAPPDATA', ''), 'Vivaldi', 'User Data')
-        elif system == "Darwin":
-            profile_base = os.path.join(home, 'Library', 'Application Support', 'Vivaldi')
-        else: # Linux
-            profile_base = os.path.join(home, '.config', 'vivaldi')
-
+        profile_base = get_profile_base()
         path = os.path.join(profile_base, profile_dir)
         if os.path.exists(path):
             return path
@@ -34,35 +53,307 @@ def find_profile_path():
         print(f"Error determining profile path: {e}", file=sys.stderr)
         return None
 
-def get_workspaces_from_prefs(profile_path):
-    """Reads Preferences file and extracts workspace names only."""
-    if not profile_path:
+# Files Chromium-based browsers create in the user data dir while a profile is in use
+SINGLETON_FILES = ("SingletonLock", "SingletonSocket", "lockfile")
+
+def get_user_data_dir(profile_path):
+    """Returns the user data dir (holding 'Local State' and lock files) for a profile path."""
+    if os.path.exists(os.path.join(profile_path, "Local State")):
+        return profile_path # find_profile_path fell back to the base dir
+    return os.path.dirname(os.path.normpath(profile_path))
+
+def singleton_lock_state(user_data_dir):
+    """Identities (inode, size, mtime) of the lock files; None where missing.
+
+    lstat: SingletonLock is a symlink to 'hostname-pid', not a real file.
+    """
+    state = []
+    for name in SINGLETON_FILES:
+        try:
+            st = os.lstat(os.path.join(user_data_dir, name))
+        except OSError:
+            state.append(None)
+        else:
+            state.append((st.st_ino, st.st_size, st.st_mtime_ns))
+    return state
+
+def find_running_instance(user_data_dir):
+    """Returns the PID of a live Vivaldi holding the profile lock, or None.
+
+    Chromium's SingletonLock is a symlink to 'hostname-pid'. The PID is only
+    trusted if it belongs to this host and (where /proc exists) is a Vivaldi
+    process, so a stale lock from a crash or a reused PID is ignored.
+    """
+    try:
+        target = os.readlink(os.path.join(user_data_dir, "SingletonLock"))
+        hostname, pid = target.rsplit("-", 1)
+        pid = int(pid)
+    except (OSError, ValueError):
+        return None # No lock (or Windows, which uses a mutex instead)
+    if hostname != socket.gethostname():
         return None
 
-    prefs_file = os.path.join(profile_path, 'Preferences')
-    if not os.path.exists(prefs_file):
-        print(f"Warning: Preferences file not found at '{prefs_file}'. Cannot list names from Vivaldi.", file=sys.stderr)
+    proc_dir = f"/proc/{pid}"
+    if os.path.isdir("/proc"):
+        try:
+            with open(os.path.join(proc_dir, "cmdline"), 'rb') as f:
+                cmdline = f.read()
+        except OSError:
+            return None # Process is gone
+        return pid if b"vivaldi" in cmdline.lower() else None
+    try:
+        os.kill(pid, 0) # Signal 0 only checks that the process exists
+    except PermissionError:
+        return pid # Exists, owned by someone else
+    except OSError:
         return None
+    return pid
+
+# Preferences can be several MB; read it in chunks of this size when scanning.
+PREFS_CHUNK_SIZE = 64 * 1024
+# Object keys longer than this are never part of a path we look for, don't keep them.
+_MAX_TRACKED_KEY_LEN = 64
+
+# Next structural token while tracking object keys: a complete string, a bracket,
+# a colon, or a lone quote (a string that continues past the end of the buffer).
+_JSON_TOKEN_RE = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"|[{}\[\]:]|"', re.DOTALL)
+# Skips everything (including whole strings) up to the next bracket outside a
+# string. Group 1 is the bracket, a lone quote, or empty at the end of the buffer.
+_JSON_NEXT_BRACKET_RE = re.compile(
+    rb'[^"{}\[\]]*(?:"[^"\\]*(?:\\.[^"\\]*)*"[^"{}\[\]]*)*([{}\[\]]|"|\Z)', re.DOTALL)
+_BRACKET_DEPTH = {b'{': 1, b'[': 1, b'}': -1, b']': -1}
+_TRAILING_COMMA_RE = re.compile(r',\s*([\}\]])')
+
+def _extract_json_subtree(stream, path, chunk_size=PREFS_CHUNK_SIZE):
+    """Scans a binary JSON stream and returns the raw bytes of the object/array at `path`.
+
+    Keys are only tracked inside the objects along `path`; every other subtree
+    is skipped bracket-to-bracket by a regex, so junk bytes and trailing commas
+    there don't matter. Returns None if the path is not found. Memory use is
+    bounded by the chunk size plus the size of the returned subtree.
+    """
+    path = [key.encode('utf-8') for key in path]
+    buf = stream.read(chunk_size)
+    eof = not buf
+
+    def refill(keep_from):
+        """Drops the consumed part of the buffer and appends the next chunk."""
+        nonlocal buf, eof
+        if eof:
+            return False
+        chunk = stream.read(chunk_size)
+        eof = not chunk
+        buf = buf[keep_from:] + chunk
+        return True
+
+    def skip_container(start, parts):
+        """Skips the container opening at buf[start]; returns the position after it.
+
+        Skipped bytes are appended to `parts` unless it is None. Returns None at EOF.
+        """
+        depth = 0
+        pos = segment_start = start
+        while True:
+            for match in _JSON_NEXT_BRACKET_RE.finditer(buf, pos):
+                delta = _BRACKET_DEPTH.get(match.group(1))
+                if delta is None: # Lone quote or end of buffer
+                    keep_from = match.start(1)
+                    break
+                depth += delta
+                if depth == 0:
+                    if parts is not None:
+                        parts.append(buf[segment_start:match.end()])
+                    return match.end()
+            if parts is not None:
+                parts.append(buf[segment_start:keep_from])
+            if not refill(keep_from):
+                return None
+            pos = segment_start = 0
+
+    keys = [] # Current key of each open object along the path
+    last_string = None
+    pos = 0
+    while True:
+        match = _JSON_TOKEN_RE.search(buf, pos)
+        if match is None or match.group() == b'"': # Need more data
+            if not refill(match.start() if match else len(buf)):
+                return None
+            pos = 0
+            continue
+
+        token = match.group()
+        pos = match.end()
+        first = token[:1]
+        if first == b'"':
+            last_string = token[1:-1] if len(token) <= _MAX_TRACKED_KEY_LEN + 2 else None
+        elif first == b':':
+            if keys:
+                keys[-1] = last_string
+        elif first in (b'{', b'['):
+            depth = len(keys)
+            on_path = depth == 0 or keys[-1] == path[depth - 1]
+            if on_path and depth == len(path):
+                parts = []
+                if skip_container(match.start(), parts) is None:
+                    return None
+                return b''.join(parts)
+            if on_path and first == b'{':
+                keys.append(None)
+            else:
+                pos = skip_container(match.start(), None)
+                if pos is None:
+                    return None
+        elif keys:
+            return None # An object along the path closed without the rest of the path
+
+def _decode_json_fragment(raw):
+    """Decodes a JSON fragment with the same junk/trailing-comma tolerance as before."""
+    content = raw.decode('utf-8', errors='ignore')
+    content = ''.join(c for c in content if c.isprintable() or c.isspace())
+    content = _TRAILING_COMMA_RE.sub(r'\1', content) # Fix trailing commas
+    return json.loads(content)
+
+def _read_workspace_records(prefs_file):
+    """Parses a Preferences file into [{"name": ..., "id": ...}] workspace records."""
     try:
-        with open(prefs_file, 'r', encoding='utf-8') as f:
-            content = f.read()
-            # Robust cleaning attempt
-            content = ''.join(c for c in content if c.isprintable() or c.isspace())
-            content = re.sub(r',\s*([\}\]])', r'\1', content) # Fix trailing commas
-            prefs_data = json.loads(content)
+        # Only decode the vivaldi.workspaces subtree, not the whole file
+        with open(prefs_file, 'rb') as f:
+            raw = _extract_json_subtree(f, ("vivaldi", "workspaces"))
+        workspaces_data = _decode_json_fragment(raw) if raw is not None else {}
 
         # Safely navigate the dictionary
-        workspaces = prefs_data.get("vivaldi", {}).get("workspaces", {}).get("list", [])
+        workspaces = workspaces_data.get("list", []) if isinstance(workspaces_data, dict) else []
         if not isinstance(workspaces, list):
             print(f"Warning: Workspace data in Preferences is not a list.", file=sys.stderr)
             return [] # Return empty list
 
-        names = [ws.get("name") for ws in workspaces if ws.get("name")]
-        return names
+        return [{"name": ws["name"], "id": ws.get("id")}
+                for ws in workspaces if isinstance(ws, dict) and isinstance(ws.get("name"), str) and ws["name"]]
 
     except json.JSONDecodeError as e:
          print(f"Warning: Could not decode Preferences JSON: {e}. Ensure Vivaldi is closed?", file=sys.stderr)
          return None
     except Exception as e:
         print(f"Warning: Error reading Preferences for workspace names: {e}", file=sys.stderr)
-        return None
\ No newline at end of file
+        return None
+
+def get_workspace_records_from_prefs(profile_path):
+    """Returns workspace records from Preferences, served from the on-disk cache when unchanged."""
+    if not profile_path:
+        return None
+
+    prefs_file = os.path.join(profile_path, 'Preferences')
+    identity = config.file_identity(prefs_file)
+    if identity is None:
+        print(f"Warning: Preferences file not found at '{prefs_file}'. Cannot list names from Vivaldi.", file=sys.stderr)
+        return None
+
+    with tracing.span("prefs.cache_lookup") as trace:
+        records = prefs_cache.lookup(prefs_file, identity)
+        trace.note(hit=records is not None)
+    if records is not None:
+        return records
+
+    with tracing.span("prefs.parse", file=prefs_file):
+        records = _read_workspace_records(prefs_file)
+    # Don't cache if Vivaldi rewrote the file while we were reading it
+    if records is not None and config.file_identity(prefs_file) == identity:
+        with tracing.span("prefs.cache_store"):
+            prefs_cache.store(prefs_file, identity, records)
+    return records
+
+def list_profiles(profile_base=None):
+    """Lists the profiles in a user data dir, in the order Vivaldi's 'Local State' gives them.
+
+    Only the 'profile.info_cache' subtree of 'Local State' is decoded. If that
+    file is missing or unreadable, directories that contain a Preferences file
+    are used instead.
+    """
+    profile_base = profile_base or get_profile_base()
+    info_cache = None
+    try:
+        with tracing.span("profiles.local_state"), open(os.path.join(profile_base, "Local State"), 'rb') as f:
+            raw = _extract_json_subtree(f, ("profile", "info_cache"))
+            info_cache = _decode_json_fragment(raw) if raw is not None else None
+    except (OSError, ValueError):
+        pass
+
+    profiles = []
+    if isinstance(info_cache, dict):
+        for directory, info in info_cache.items():
+            path = os.path.join(profile_base, directory)
+            if os.path.isdir(path):
+                name = info.get("name") if isinstance(info, dict) else None
+                profiles.append(Profile(directory, name or directory, path))
+    if not profiles:
+        try:
+            entries = sorted(os.listdir(profile_base))
+        except OSError:
+            return []
+        for directory in entries:
+            path = os.path.join(profile_base, directory)
+            if os.path.isfile(os.path.join(path, 'Preferences')):
+                profiles.append(Profile(directory, directory, path))
+    return profiles
+
+def select_profile(selector, profiles=None):
+    """Finds a profile by directory name or display name (case-insensitive), or None."""
+    profiles = list_profiles() if profiles is None else profiles
+    for attribute in ("directory", "name"):
+        for profile in profiles:
+            if getattr(profile, attribute).lower() == selector.lower():
+                return profile
+    return None
+
+def _read_uncached_records(prefs_file, identity):
+    """Parses one Preferences file; returns (records, identity still unchanged after the read)."""
+    with tracing.span("prefs.parse", file=prefs_file):
+        records = _read_workspace_records(prefs_file)
+    return records, config.file_identity(prefs_file) == identity
+
+def build_workspace_index(profiles=None, max_workers=None):
+    """Reads every profile's workspaces into one list of WorkspaceEntry.
+
+    The parsed-Preferences cache is consulted and updated once for all
+    profiles; files that changed are parsed concurrently in a thread pool.
+    Entries keep the profile order, then Vivaldi's workspace order.
+    """
+    profiles = list_profiles() if profiles is None else profiles
+    prefs_files = {profile.directory: os.path.join(profile.path, 'Preferences') for profile in profiles}
+    identities = {}
+    for profile in profiles:
+        identity = config.file_identity(prefs_files[profile.directory])
+        if identity is None:
+            print(f"Warning: Preferences file not found for profile '{profile.name}'. Skipping it.", file=sys.stderr)
+        else:
+            identities[prefs_files[profile.directory]] = identity
+
+    with tracing.span("prefs.cache_lookup", profiles=len(identities)) as trace:
+        records_by_file = prefs_cache.lookup_many(identities)
+        trace.note(hits=len(records_by_file))
+    misses = [prefs_file for prefs_file in identities if prefs_file not in records_by_file]
+    if misses:
+        workers = max(1, min(max_workers or MAX_INDEX_WORKERS, len(misses)))
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(lambda prefs_file: _read_uncached_records(prefs_file, identities[prefs_file]), misses))
+        to_store = {}
+        for prefs_file, (records, unchanged) in zip(misses, results):
+            records_by_file[prefs_file] = records
+            # Don't cache if Vivaldi rewrote the file while we were reading it
+            if records is not None and unchanged:
+                to_store[prefs_file] = (identities[prefs_file], records)
+        with tracing.span("prefs.cache_store"):
+            prefs_cache.store_many(to_store)
+
+    index = []
+    for profile in profiles:
+        for record in records_by_file.get(prefs_files[profile.directory]) or []:
+            index.append(WorkspaceEntry(profile.directory, record["name"], record.get("id")))
+    return index
+
+def get_workspaces_from_prefs(profile_path):
+    """Reads Preferences file and extracts workspace names only."""
+    records = get_workspace_records_from_prefs(profile_path)
+    if records is None:
+        return None
+    return [record["name"] for record in records]
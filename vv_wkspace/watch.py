@@ -0,0 +1,292 @@
+# src/vivaldi_workspace_cli/watch.py
+"""'list --watch': streams workspace changes as NDJSON instead of re-listing.
+
+The profile directories, the user data dir ('Local State', for profiles
+coming and going) and the config dir are watched with inotify on Linux
+(through ctypes; no extra dependency), or by comparing file identities
+every POLL_INTERVAL seconds elsewhere. Directories are watched rather than
+files, because Vivaldi replaces Preferences atomically (write a temporary
+file, rename it over the old one), which a watch on the file itself would
+lose. Preferences are only re-read after such a replace, once a burst of
+events has been quiet for DEBOUNCE_DELAY.
+
+Each change is one JSON object per line:
+  {"event": "added"|"removed", "profile", "profile_name", "workspace", "id", "time"}
+  {"event": "renamed", ..., "old_name"}
+  {"event": "mapping-mismatch", "workspace", "problem": "no-shortcut"|"not-in-vivaldi", "resolved", "time"}
+The first events describe the state at start-up (everything is "added").
+"""
+import ctypes
+import json
+import os
+import select
+import struct
+import sys
+import time
+
+from . import config
+from . import vivaldi_utils
+
+# Wait for this long without new events before re-reading, but never longer than DEBOUNCE_MAX
+DEBOUNCE_DELAY = 0.2
+DEBOUNCE_MAX = 2.0
+# Polling fallback: seconds between identity checks
+POLL_INTERVAL = 1.0
+
+# From <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+_EVENT_HEADER = struct.Struct("iIII") # wd, mask, cookie, name length
+_READ_SIZE = 64 * 1024
+
+# What counts as a change, per file name. Vivaldi's files only on a rename
+# into place; the config also on an in-place save, as many editors do that.
+VIVALDI_FILE_EVENTS = IN_MOVED_TO | IN_DELETE
+CONFIG_FILE_EVENTS = IN_MOVED_TO | IN_CLOSE_WRITE | IN_DELETE
+
+
+class InotifyWatcher:
+    """Directory watches through the Linux inotify syscalls."""
+
+    def __init__(self):
+        libc = ctypes.CDLL(None, use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        self._dirs = {} # wd -> (directory, {file name: event mask})
+        self._wds = {} # directory -> wd
+
+    def watch(self, directory, names):
+        """Reports changes to `names` ({file name: IN_* mask}) in `directory`. Returns False if it can't."""
+        mask = IN_ONLYDIR | IN_DELETE_SELF
+        for name_mask in names.values():
+            mask |= name_mask
+        wd = self._add_watch(self.fd, os.fsencode(directory), mask)
+        if wd < 0:
+            return False
+        self._wds[directory] = wd
+        watched = self._dirs.setdefault(wd, (directory, {}))[1]
+        watched.update(names)
+        return True
+
+    def watched(self, directory):
+        return directory in self._wds
+
+    def wait(self, timeout=None):
+        """Blocks up to `timeout` seconds (None: forever). Returns the set of changed paths."""
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return set()
+        try:
+            data = os.read(self.fd, _READ_SIZE)
+        except BlockingIOError:
+            return set()
+        changed = set()
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            name = data[offset + _EVENT_HEADER.size:offset + _EVENT_HEADER.size + length].rstrip(b"\0")
+            offset += _EVENT_HEADER.size + length
+            directory, names = self._dirs.get(wd, (None, {}))
+            if directory is None:
+                continue
+            if mask & (IN_DELETE_SELF | IN_IGNORED):
+                # The directory is gone (e.g. a deleted profile): report all its files
+                changed.update(os.path.join(directory, n) for n in names)
+                self._dirs.pop(wd, None)
+                self._wds.pop(directory, None)
+                continue
+            name = os.fsdecode(name)
+            if mask & names.get(name, 0):
+                changed.add(os.path.join(directory, name))
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """Fallback for platforms without inotify: compares file identities every POLL_INTERVAL."""
+
+    def __init__(self, interval=POLL_INTERVAL):
+        self.interval = interval
+        self._identities = {} # path -> identity
+        self._dirs = set()
+
+    def watch(self, directory, names):
+        self._dirs.add(directory)
+        for name in names:
+            path = os.path.join(directory, name)
+            self._identities[path] = config.file_identity(path)
+        return True
+
+    def watched(self, directory):
+        return directory in self._dirs
+
+    def wait(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            changed = set()
+            for path, identity in self._identities.items():
+                current = config.file_identity(path)
+                if current != identity:
+                    self._identities[path] = current
+                    changed.add(path)
+            if changed:
+                return changed
+            if deadline is not None and time.monotonic() >= deadline:
+                return changed
+            time.sleep(self.interval if deadline is None else max(0.0, min(self.interval, deadline - time.monotonic())))
+
+    def close(self):
+        pass
+
+
+def make_watcher():
+    """An InotifyWatcher where the kernel offers one, else a PollingWatcher."""
+    if sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher()
+        except (OSError, AttributeError):
+            pass # AttributeError: libc without inotify symbols
+    return PollingWatcher()
+
+
+class WorkspaceWatch:
+    """The last seen workspaces and mappings, and the events that lead from one state to the next."""
+
+    def __init__(self, config_path, profile=None, out=None):
+        self.config_path = config_path
+        self.selected = profile # Only this profile, if given
+        self.out = out or sys.stdout
+        self.profile_base = vivaldi_utils.get_profile_base() if profile is None else os.path.dirname(profile.path)
+        self.profiles = {} # directory -> Profile
+        self.workspaces = {} # directory -> {key: (name, id)}
+        self.mapped = set()
+        self.mismatches = set()
+
+    def emit(self, event, **fields):
+        fields = dict(event=event, **fields, time=round(time.time(), 3))
+        self.out.write(json.dumps(fields, ensure_ascii=False) + "\n")
+        self.out.flush()
+
+    def _list_profiles(self):
+        if self.selected is not None:
+            return [self.selected] if os.path.isdir(self.selected.path) else []
+        return vivaldi_utils.list_profiles(self.profile_base)
+
+    def refresh_profiles(self):
+        """Re-lists the profiles; returns the directories of new ones. Forgets removed ones."""
+        current = {profile.directory: profile for profile in self._list_profiles()}
+        for directory in [d for d in self.profiles if d not in current]:
+            self.update_workspaces(self.profiles[directory], [])
+            del self.workspaces[directory]
+        added = [d for d in current if d not in self.profiles]
+        self.profiles = current
+        return added
+
+    def update_workspaces(self, profile, entries):
+        """Emits added/removed/renamed for one profile's new list of WorkspaceEntry."""
+        old = self.workspaces.get(profile.directory, {})
+        # Workspaces are matched by id; name only if Vivaldi didn't store one
+        new = {entry.id if entry.id is not None else ("name", entry.name): (entry.name, entry.id) for entry in entries}
+        base = {"profile": profile.directory, "profile_name": profile.name}
+        for key, (name, workspace_id) in new.items():
+            if key not in old:
+                self.emit("added", **base, workspace=name, id=workspace_id)
+            elif old[key][0] != name:
+                self.emit("renamed", **base, workspace=name, id=workspace_id, old_name=old[key][0])
+        for key, (name, workspace_id) in old.items():
+            if key not in new:
+                self.emit("removed", **base, workspace=name, id=workspace_id)
+        self.workspaces[profile.directory] = new
+
+    def reload_profiles(self, directories):
+        index = vivaldi_utils.build_workspace_index([self.profiles[d] for d in directories])
+        for directory in directories:
+            self.update_workspaces(self.profiles[directory], [entry for entry in index if entry.profile == directory])
+
+    def reload_config(self):
+        shortcut_map = config.load_config(self.config_path)
+        if shortcut_map is None:
+            print("Warning: Keeping the previous workspace mapping until the config loads again.", file=sys.stderr)
+            return
+        self.mapped = set(shortcut_map)
+
+    def update_mismatches(self):
+        """Emits mapping-mismatch events for mismatches that appeared or were resolved."""
+        existing = {name for workspaces in self.workspaces.values() for name, _ in workspaces.values()}
+        current = {(name, "no-shortcut") for name in existing - self.mapped}
+        current |= {(name, "not-in-vivaldi") for name in self.mapped - existing}
+        for name, problem in sorted(current - self.mismatches):
+            self.emit("mapping-mismatch", workspace=name, problem=problem, resolved=False)
+        for name, problem in sorted(self.mismatches - current):
+            self.emit("mapping-mismatch", workspace=name, problem=problem, resolved=True)
+        self.mismatches = current
+
+    def add_watches(self, watcher):
+        config_dir = os.path.dirname(os.path.abspath(self.config_path))
+        if not watcher.watched(config_dir):
+            watcher.watch(config_dir, {os.path.basename(self.config_path): CONFIG_FILE_EVENTS})
+        if self.selected is None and not watcher.watched(self.profile_base):
+            watcher.watch(self.profile_base, {"Local State": VIVALDI_FILE_EVENTS})
+        for profile in self.profiles.values():
+            if not watcher.watched(profile.path):
+                watcher.watch(profile.path, {"Preferences": VIVALDI_FILE_EVENTS})
+
+    def handle(self, changed):
+        """Re-reads what the changed paths affect and emits the differences."""
+        reload = set()
+        if os.path.join(self.profile_base, "Local State") in changed or \
+                any(not os.path.isdir(p.path) for p in self.profiles.values()):
+            reload.update(self.refresh_profiles())
+        for directory, profile in self.profiles.items():
+            if os.path.join(profile.path, "Preferences") in changed:
+                reload.add(directory)
+        if reload:
+            self.reload_profiles([d for d in self.profiles if d in reload])
+        if os.path.abspath(self.config_path) in {os.path.abspath(path) for path in changed}:
+            self.reload_config()
+        self.update_mismatches()
+
+
+def watch_workspaces(config_path=None, profile=None, out=None):
+    """Emits the current workspaces, then every change, until interrupted. Returns an exit code."""
+    state = WorkspaceWatch(config_path or config.get_config_path(), profile, out)
+    watcher = make_watcher()
+    print(f"Watching workspaces ({type(watcher).__name__}); press Ctrl+C to stop.", file=sys.stderr)
+    try:
+        # Watch first, so nothing written while we read the initial state is missed
+        state.refresh_profiles()
+        state.add_watches(watcher)
+        state.reload_profiles(list(state.profiles))
+        state.reload_config()
+        state.update_mismatches()
+        while True:
+            changed = watcher.wait()
+            deadline = time.monotonic() + DEBOUNCE_MAX
+            while True: # Debounce: Vivaldi often writes several times in quick succession
+                remaining = deadline - time.monotonic()
+                more = watcher.wait(min(DEBOUNCE_DELAY, remaining)) if remaining > 0 else set()
+                if not more:
+                    break
+                changed |= more
+            state.handle(changed)
+            state.add_watches(watcher) # New profiles, or a re-created directory
+    except KeyboardInterrupt:
+        return 0
+    except BrokenPipeError:
+        # The reader went away; point stdout at devnull so the exit-time flush doesn't fail too
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 0
+    finally:
+        watcher.close()
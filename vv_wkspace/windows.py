@@ -0,0 +1,96 @@
+# src/vivaldi_workspace_cli/windows.py
+import time
+
+# After activating, poll for focus every FOCUS_POLL_INTERVAL seconds, up to FOCUS_TIMEOUT
+FOCUS_TIMEOUT = 0.5
+FOCUS_POLL_INTERVAL = 0.02
+
+def looks_like_vivaldi(window):
+    """Title heuristic for Vivaldi windows; False for closed/stale handles."""
+    try:
+        title = window.title if window is not None else None # One read: may be an OS call
+        return bool(title and "vivaldi" in title.lower())
+    except Exception:
+        return False
+
+def _is_minimized(window):
+    try:
+        return bool(getattr(window, 'isMinimized', False))
+    except Exception:
+        return False
+
+def pick_vivaldi_window(all_windows, backend, pids=None, exclude=(), owned_only=False):
+    """Picks the best Vivaldi window from a window list. Returns (window, pid) or (None, None).
+
+    Title matches owned by one of `pids` win over title-only matches (another
+    Vivaldi instance or a page title mentioning Vivaldi); non-minimized windows
+    win over minimized ones. Windows in `exclude` (e.g. those that existed
+    before a new one was asked for) are skipped. With `owned_only`, so are
+    windows known to belong to another process; a title-only match is then
+    only accepted when the backend can't tell the owner. PIDs are only looked
+    up for title matches.
+    """
+    best, best_pid, best_rank = None, None, None
+    for window in all_windows:
+        # Case-insensitive check
+        if not looks_like_vivaldi(window) or window in exclude:
+            continue
+        pid = backend.window_pid(window) if pids else None
+        owned = pid is not None and pid in pids
+        if owned_only and pid is not None and not owned:
+            continue # Another Vivaldi instance's window
+        rank = (0 if owned else 1, 1 if _is_minimized(window) else 0)
+        if best_rank is None or rank < best_rank:
+            best, best_pid, best_rank = window, pid, rank
+            if rank == (0, 0) or (not pids and rank[1] == 0):
+                break # Can't do better than this
+    return best, best_pid
+
+
+class WindowLocator:
+    """Finds the Vivaldi window, remembering the last match between lookups.
+
+    A remembered window is revalidated with a single title read; the full
+    (expensive) window enumeration only runs when it is gone or stale.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.cached_window = None
+        self.cached_pid = None
+        self.full_scans = 0
+
+    def find(self, pids=None):
+        """Returns the Vivaldi window (preferring ones owned by `pids`), or None."""
+        window = self.cached_window
+        if window is not None and looks_like_vivaldi(window):
+            if not pids or self.cached_pid in pids:
+                return window
+        self.full_scans += 1
+        self.cached_window, self.cached_pid = pick_vivaldi_window(self.backend.get_all_windows(), self.backend, pids)
+        return self.cached_window
+
+    def forget(self):
+        """Drops the remembered window (e.g. after activating it failed)."""
+        self.cached_window = None
+        self.cached_pid = None
+
+    def remember(self, window, pid):
+        """Makes `window` (owned by `pid`) the one find() returns while it is open."""
+        self.cached_window = window
+        self.cached_pid = pid
+
+    def wait_for_focus(self, window, timeout=FOCUS_TIMEOUT):
+        """Polls until `window` is the active window. Returns None if focus can't be observed."""
+        if not self.backend.supports_focus_check:
+            return None
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                if self.backend.get_active_window() == window:
+                    return True
+            except Exception:
+                return None
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(FOCUS_POLL_INTERVAL)